@@ -4,5 +4,6 @@ hotel_api = HotelAPI()
 
 from .routers import hotel
 from .routers import hotels
+from .routers import batch
 
 
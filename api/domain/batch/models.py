@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+
+@dataclass
+class EncodedHotelBatchResponse:
+    """
+    The hotels found for a batch of IDs, as lazily produced response fragments,
+    and the requested IDs that are not in the database.
+    """
+    hotels: Iterable[bytes]
+    missing: List[str] = field(default_factory=list)
+    etag: Optional[str] = None
+    # Set when the client already has the current version, so nothing is encoded
+    not_modified: bool = False
@@ -0,0 +1,22 @@
+from . import models, schemas
+from ..etag import list_etag, etag_matches
+from services.database import BaseDB
+from models.hotel import hotel_response
+from utils.logger import logger
+
+def get_hotels_batch(db: BaseDB, batch_filter: schemas.HotelBatchFilter):
+    try:
+        data = db.find_many(batch_filter.hotel_ids)
+        hotels = [hotel for hotel in data if hotel]
+        missing = [hotel_id for hotel_id, hotel in zip(batch_filter.hotel_ids, data) if not hotel]
+        etag = list_etag((db.version(hotel) for hotel in hotels), batch_filter.format, batch_filter.fields,
+                         *missing)
+        if etag_matches(batch_filter.if_none_match, etag):
+            return models.EncodedHotelBatchResponse(hotels = [], missing = missing, etag = etag, not_modified = True)
+        field_set = hotel_response.select(batch_filter.fields)
+        return models.EncodedHotelBatchResponse(hotels = (db.encoded(hotel, field_set) for hotel in hotels),
+                                                missing = missing,
+                                                etag = etag)
+    except Exception as e:
+        logger.log(f"Failed to get hotel batch: {e}", "error")
+        return None
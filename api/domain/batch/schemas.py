@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional
+from configs.config import api_config
+from models.hotel import hotel_response
+
+class HotelBatchFilter(BaseModel):
+    # Hotels to return, in order; repeated IDs are returned once
+    hotel_ids: List[str] = Field(min_length=1, max_length=api_config['max_batch_size'])
+    # Output encoding: compact 'json', streamed 'ndjson', or indented 'pretty' for debugging
+    format: Literal["json", "ndjson", "pretty"] = "json"
+    # Fields to return, as top-level names or dotted paths such as 'location.city'
+    fields: Optional[List[str]] = None
+    # Value of the If-None-Match request header, for conditional requests
+    if_none_match: Optional[str] = None
+
+    @field_validator("hotel_ids")
+    def deduplicate_hotel_ids(cls, v):
+        return list(dict.fromkeys(v))
+
+    @field_validator("fields")
+    def validate_fields(cls, v):
+        hotel_response.select(v)
+        return v
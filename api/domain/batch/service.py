@@ -0,0 +1,5 @@
+from . import schemas, repository
+
+
+def get_hotels_batch(db, batch_filter: schemas.HotelBatchFilter):
+    return repository.get_hotels_batch(db, batch_filter)
@@ -0,0 +1,70 @@
+import hashlib
+from typing import Iterable, List, Optional
+
+
+def _representation(output_format: str, fields: Optional[List[str]]) -> bytes:
+    """
+    Identify the representation a version is served in, so different formats
+    and field selections of the same content get different strong ETags.
+    """
+    return f"{output_format}|{','.join(fields or [])}".encode()
+
+
+def hotel_etag(version: str, output_format: str, fields: Optional[List[str]]) -> str:
+    """
+    Build a strong ETag for a single hotel from its content version.
+    """
+    digest = hashlib.blake2b(version.encode(), digest_size=12)
+    digest.update(b"|" + _representation(output_format, fields))
+    return f'"{digest.hexdigest()}"'
+
+
+def list_etag(versions: Iterable[str], output_format: str, fields: Optional[List[str]], *extra) -> str:
+    """
+    Build a strong ETag for a list of hotels from the versions of its members, in order.
+    Extra values (such as pagination fields) that are part of the body are mixed in too.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for version in versions:
+        digest.update(version.encode())
+        digest.update(b",")
+    digest.update(b"|" + _representation(output_format, fields))
+    for value in extra:
+        digest.update(b"|" + str(value).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """
+    Get the strong ETag of a representation sent with a content coding such as gzip.
+    Compressed bytes differ from the identity body, so each coding needs its own validator.
+    """
+    return f'{etag[:-1]}-{coding}"'
+
+
+def _identity_etag(tag: str) -> str:
+    """
+    Strip the content coding from an ETag built by `coded_etag`.
+    """
+    base, separator, coding = tag[:-1].rpartition("-")
+    if separator and tag.endswith('"') and coding.isalnum():
+        return base + '"'
+    return tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header value against an ETag, using weak comparison as RFC 9110 requires.
+    The ETags of compressed variants match too, since they validate the same content.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag or _identity_etag(tag) == etag:
+            return True
+    return False
@@ -1,45 +1,13 @@
-from typing import List, Optional, Dict
-from pydantic import BaseModel, field_validator, Field, HttpUrl
-
-
-class Image(BaseModel):
-    link: HttpUrl
-    description: Optional[str] = None
-
-
-class Amenities(BaseModel):
-    general: Optional[List[str]] = None
-    room: Optional[List[str]] = None
-
-
-class Location(BaseModel):
-    address: Optional[str] = None
-    city: Optional[str] = None
-    country: Optional[str] = None
-    postal_code: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
-
-    @field_validator('*', mode='before')
-    def empty_string_to_none(cls, v):
-        return None if v == '' else v
-
-
-class HotelImages(BaseModel):
-    rooms: Optional[List[Image]] = None
-    site: Optional[List[Image]] = None
-    amenities: Optional[List[Image]] = None
-
-
-class HotelResponse(BaseModel):
-    hotel_id: str = Field(..., alias="Id")
-    destination_id: int = Field(..., alias="DestinationId")
-    name: str = Field(..., alias="Name")
-    description: Optional[str] = None
-    location: Location
-    amenities: Optional[Amenities] = None
-    images: Optional[HotelImages] = None
-    booking_conditions: Optional[List[str]] = None
-
-    class Config:
-        populate_by_name = True
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class EncodedHotelResponse:
+    """
+    A hotel response built from its cached JSON fragment.
+    The fragment is left empty when the client already has the current version.
+    """
+    fragment: Optional[bytes]
+    etag: str
+    not_modified: bool = False
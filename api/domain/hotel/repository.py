@@ -1,11 +1,20 @@
 from . import models, schemas
+from ..etag import hotel_etag, etag_matches
 from services.database import BaseDB
+from models.hotel import hotel_response
 
 
 def get_hotel(db: BaseDB, hotel_filter: schemas.HotelFilter):
     try:
         data = db.find(hotel_filter.hotel_id, hotel_filter.destination_id)
-        return models.HotelResponse(**data.model_dump())
+        if not data:
+            return None
+        etag = hotel_etag(db.version(data), hotel_filter.format, hotel_filter.fields)
+        if etag_matches(hotel_filter.if_none_match, etag):
+            return models.EncodedHotelResponse(fragment = None, etag = etag, not_modified = True)
+        return models.EncodedHotelResponse(
+            fragment = db.encoded(data, hotel_response.select(hotel_filter.fields)),
+            etag = etag)
     except Exception as e:
         return None
     
@@ -1,6 +1,19 @@
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, field_validator
+from models.hotel import hotel_response
 
 
 class HotelFilter(BaseModel):
     hotel_id: str
-    destination_id: int = None
\ No newline at end of file
+    destination_id: int = None
+    # Output encoding: compact 'json', streamed 'ndjson', or indented 'pretty' for debugging
+    format: Literal["json", "ndjson", "pretty"] = "json"
+    # Fields to return, as top-level names or dotted paths such as 'location.city'
+    fields: Optional[List[str]] = None
+    # Value of the If-None-Match request header, for conditional requests
+    if_none_match: Optional[str] = None
+
+    @field_validator("fields")
+    def validate_fields(cls, v):
+        hotel_response.select(v)
+        return v
@@ -0,0 +1,26 @@
+import base64
+import json
+from typing import Optional
+
+
+def encode_cursor(last_hotel_id: Optional[str]) -> Optional[str]:
+    """
+    Encode the last hotel ID of a page into an opaque cursor.
+    """
+    if last_hotel_id is None:
+        return None
+    raw = json.dumps({'after': last_hotel_id}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """
+    Decode an opaque cursor back into the hotel ID to resume after.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))['after']
+    except Exception as e:
+        raise ValueError(f"Invalid cursor '{cursor}': {e}")
@@ -1,55 +1,18 @@
-from typing import List, Optional, Dict
-from pydantic import BaseModel, field_validator, Field, HttpUrl
-
-
-class Image(BaseModel):
-    link: HttpUrl
-    description: Optional[str] = None
-
-
-class Amenities(BaseModel):
-    general: Optional[List[str]] = None
-    room: Optional[List[str]] = None
-
-
-class Location(BaseModel):
-    address: Optional[str] = None
-    city: Optional[str] = None
-    country: Optional[str] = None
-    postal_code: Optional[str] = None
-    latitude: Optional[float] = None
-    longitude: Optional[float] = None
-
-    @field_validator('*', mode='before')
-    def empty_string_to_none(cls, v):
-        return None if v == '' else v
-
-
-class HotelImages(BaseModel):
-    rooms: Optional[List[Image]] = None
-    site: Optional[List[Image]] = None
-    amenities: Optional[List[Image]] = None
-
-
-class HotelResponse(BaseModel):
-    hotel_id: str = Field(..., alias="Id")
-    destination_id: int = Field(..., alias="DestinationId")
-    name: str = Field(..., alias="Name")
-    description: Optional[str] = None
-    location: Location
-    amenities: Optional[Amenities] = None
-    images: Optional[HotelImages] = None
-    booking_conditions: Optional[List[str]] = None
-
-    class Config:
-        populate_by_name = True
-
-class HotelsResponse(BaseModel):
-    hotels: List[HotelResponse]
-    # count: int
-    # page: int
-    # total_pages: int
-    # total_count: int
-
-    class Config:
-        populate_by_name = True
\ No newline at end of file
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+
+@dataclass
+class EncodedHotelsResponse:
+    """
+    A hotels response assembled from cached per-hotel JSON fragments.
+    Fragments are produced lazily so streaming encoders never hold the whole list.
+    """
+    hotels: Iterable[bytes]
+    # Pagination fields, only set for paginated requests
+    count: Optional[int] = None
+    next_cursor: Optional[str] = None
+    total_count: Optional[int] = None
+    etag: Optional[str] = None
+    # Set when the client already has the current version, so nothing is encoded
+    not_modified: bool = False
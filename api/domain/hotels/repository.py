@@ -1,12 +1,46 @@
 from . import models, schemas
+from .cursor import encode_cursor, decode_cursor
+from ..etag import list_etag, etag_matches
 from services.database import BaseDB
+from models.hotel import hotel_response
 from utils.logger import logger
 
 def get_hotels(db: BaseDB, hotels_filter: schemas.HotelsFilter = {None, None}):
     try:
+        if hotels_filter.limit:
+            return get_hotels_page(db, hotels_filter)
         data = db.find_all(hotels_filter.hotel_ids, hotels_filter.destination_ids)
-        data = [models.HotelResponse(**hotel.model_dump()) for hotel in data]
-        return models.HotelsResponse(hotels = data)
+        etag = list_etag((db.version(hotel) for hotel in data), hotels_filter.format, hotels_filter.fields)
+        return encode_hotels(db, hotels_filter, data, models.EncodedHotelsResponse(hotels = [], etag = etag))
     except Exception as e:
         logger.log(f"Failed to get hotels: {e}", "error")
         return []
+
+def get_hotels_page(db: BaseDB, hotels_filter: schemas.HotelsFilter):
+    data, last_hotel_id = db.find_page(decode_cursor(hotels_filter.cursor),
+                                       hotels_filter.limit,
+                                       hotels_filter.hotel_ids,
+                                       hotels_filter.destination_ids)
+    total_count = None
+    if hotels_filter.include_total:
+        total_count = db.count(hotels_filter.hotel_ids, hotels_filter.destination_ids)
+    next_cursor = encode_cursor(last_hotel_id)
+    etag = list_etag((db.version(hotel) for hotel in data), hotels_filter.format, hotels_filter.fields,
+                     next_cursor, total_count)
+    return encode_hotels(db, hotels_filter, data,
+                         models.EncodedHotelsResponse(hotels = [],
+                                                      count = len(data),
+                                                      next_cursor = next_cursor,
+                                                      total_count = total_count,
+                                                      etag = etag))
+
+def encode_hotels(db: BaseDB, hotels_filter: schemas.HotelsFilter, data, response: models.EncodedHotelsResponse):
+    """
+    Attach the lazily encoded hotels to a response, unless the client already has this version.
+    """
+    if etag_matches(hotels_filter.if_none_match, response.etag):
+        response.not_modified = True
+        return response
+    field_set = hotel_response.select(hotels_filter.fields)
+    response.hotels = (db.encoded(hotel, field_set) for hotel in data)
+    return response
@@ -1,7 +1,31 @@
-from pydantic import BaseModel
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Literal, Optional, Dict
+from models.hotel import hotel_response
+from .cursor import decode_cursor
 
 class HotelsFilter(BaseModel):
     hotel_ids: Optional[List[str]] = None
     destination_ids: Optional[List[int]] = None
-    
\ No newline at end of file
+    # Page size; when set, results are paginated by hotel ID
+    limit: Optional[int] = Field(None, gt=0)
+    # Opaque cursor returned as `next_cursor` by the previous page
+    cursor: Optional[str] = None
+    # Whether to count every matching hotel, which costs a full filter pass
+    include_total: bool = False
+    # Output encoding: compact 'json', streamed 'ndjson', or indented 'pretty' for debugging
+    format: Literal["json", "ndjson", "pretty"] = "json"
+    # Fields to return, as top-level names or dotted paths such as 'location.city'
+    fields: Optional[List[str]] = None
+    # Value of the If-None-Match request header, for conditional requests
+    if_none_match: Optional[str] = None
+
+    @field_validator("fields")
+    def validate_fields(cls, v):
+        hotel_response.select(v)
+        return v
+
+    @field_validator("cursor")
+    def validate_cursor(cls, v):
+        decode_cursor(v)
+        return v
+    
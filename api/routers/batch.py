@@ -0,0 +1,10 @@
+from api.domain.batch import service, schemas
+from services.database import BaseDB
+from .converter.batch import convert
+
+from .. import hotel_api
+
+@hotel_api('/hotels/batch')
+def get_hotels_batch(hotel_db: BaseDB, batch_filter: schemas.HotelBatchFilter):
+    batch_filter = schemas.HotelBatchFilter(**batch_filter)
+    return convert(service.get_hotels_batch(hotel_db, batch_filter), batch_filter.format)
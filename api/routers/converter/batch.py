@@ -0,0 +1,14 @@
+from api.services.response import Response
+from .encoders import get_encoder
+
+def convert(data, output_format = "json"):
+    if not data:
+        return Response(status = 500)
+    headers = {"etag": data.etag}
+    if data.not_modified:
+        return Response(status = 304, headers = headers)
+    try:
+        encoder = get_encoder(output_format)
+        return Response(encoder.encode_batch(data.hotels, data.missing), media_type = encoder.media_type, headers = headers)
+    except Exception as e:
+        raise Exception(f'Error when converting hotel batch to json: {e}')
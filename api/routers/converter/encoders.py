@@ -0,0 +1,123 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Optional, Union
+from utils.output import join_fragments, prettify_fragment
+
+
+class ResponseEncoder(ABC):
+    """
+    Encodes cached hotel fragments into a response body.
+    """
+    media_type = "application/json"
+
+    @abstractmethod
+    def encode_hotel(self, fragment: bytes) -> bytes:
+        """Encode a single hotel response"""
+
+    @abstractmethod
+    def encode_hotels(self, fragments: Iterable[bytes]) -> Union[bytes, Iterator[bytes]]:
+        """Encode a list of hotels"""
+
+    @abstractmethod
+    def encode_page(self, fragments: Iterable[bytes], count: int,
+                    next_cursor: Optional[str], total_count: Optional[int]) -> Union[bytes, Iterator[bytes]]:
+        """Encode a page of hotels with its pagination fields"""
+
+    @abstractmethod
+    def encode_batch(self, fragments: Iterable[bytes], missing: List[str]) -> Union[bytes, Iterator[bytes]]:
+        """Encode the hotels found for a batch of IDs with the IDs that were not found"""
+
+
+class CompactJSONEncoder(ResponseEncoder):
+    """
+    Compact JSON built by concatenating the cached fragments.
+    """
+
+    def encode_hotel(self, fragment):
+        return b"[" + fragment + b"]"
+
+    def encode_hotels(self, fragments):
+        return b"[" + b",".join(fragments) + b"]"
+
+    def encode_page(self, fragments, count, next_cursor, total_count):
+        return b"".join([
+            b'{"hotels":', self.encode_hotels(fragments),
+            b',"count":', json.dumps(count).encode(),
+            b',"next_cursor":', json.dumps(next_cursor).encode(),
+            b',"total_count":', json.dumps(total_count).encode(),
+            b'}'
+        ])
+
+    def encode_batch(self, fragments, missing):
+        return b"".join([
+            b'{"hotels":', self.encode_hotels(fragments),
+            b',"missing":', json.dumps(missing, separators=(",", ":")).encode(),
+            b'}'
+        ])
+
+
+class PrettyJSONEncoder(ResponseEncoder):
+    """
+    Indented JSON for debugging. Re-encodes every fragment, so it is the slowest encoder.
+    """
+
+    def encode_hotel(self, fragment):
+        return join_fragments([prettify_fragment(fragment)])
+
+    def encode_hotels(self, fragments):
+        return join_fragments([prettify_fragment(fragment) for fragment in fragments])
+
+    def encode_page(self, fragments, count, next_cursor, total_count):
+        return json.dumps({
+            "hotels": [json.loads(fragment) for fragment in fragments],
+            "count": count,
+            "next_cursor": next_cursor,
+            "total_count": total_count
+        }, indent=4).encode()
+
+    def encode_batch(self, fragments, missing):
+        return json.dumps({
+            "hotels": [json.loads(fragment) for fragment in fragments],
+            "missing": missing
+        }, indent=4).encode()
+
+
+class NDJSONEncoder(ResponseEncoder):
+    """
+    Newline-delimited JSON, streamed one hotel per line.
+    Paginated responses end with a line holding the pagination fields, and
+    batch responses with a line listing the IDs that were not found.
+    """
+    media_type = "application/x-ndjson"
+
+    def encode_hotel(self, fragment):
+        return fragment + b"\n"
+
+    def encode_hotels(self, fragments):
+        for fragment in fragments:
+            yield fragment + b"\n"
+
+    def encode_page(self, fragments, count, next_cursor, total_count):
+        yield from self.encode_hotels(fragments)
+        yield json.dumps({
+            "count": count,
+            "next_cursor": next_cursor,
+            "total_count": total_count
+        }, separators=(",", ":")).encode() + b"\n"
+
+    def encode_batch(self, fragments, missing):
+        yield from self.encode_hotels(fragments)
+        yield json.dumps({"missing": missing}, separators=(",", ":")).encode() + b"\n"
+
+
+ENCODERS = {
+    "json": CompactJSONEncoder(),
+    "pretty": PrettyJSONEncoder(),
+    "ndjson": NDJSONEncoder(),
+}
+
+
+def get_encoder(name: str) -> ResponseEncoder:
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown output format '{name}'")
+    return ENCODERS[name]
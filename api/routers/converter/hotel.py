@@ -1,9 +1,14 @@
-import json
+from api.services.response import Response
+from .encoders import get_encoder
 
-def convert(data):
+def convert(data, output_format = "json"):
     if not data:
-        return None
+        return Response(status = 404)
+    headers = {"etag": data.etag}
+    if data.not_modified:
+        return Response(status = 304, headers = headers)
     try:
-        return json.dumps([data.model_dump(mode = "json")], indent = 4)
+        encoder = get_encoder(output_format)
+        return Response(encoder.encode_hotel(data.fragment), media_type = encoder.media_type, headers = headers)
     except Exception as e:
-        raise Exception(f'Error when converting hotel to json: {e}')
\ No newline at end of file
+        raise Exception(f'Error when converting hotel to json: {e}')
@@ -1,10 +1,18 @@
-import json
+from api.services.response import Response
+from .encoders import get_encoder
 
-def convert(data):
+def convert(data, output_format = "json"):
     if not data:
-        return None
+        return Response(status = 500)
+    headers = {"etag": data.etag}
+    if data.not_modified:
+        return Response(status = 304, headers = headers)
     try:
-        return json.dumps([hotel.model_dump(mode = "json") for hotel in data.hotels], 
-                          indent=4)
+        encoder = get_encoder(output_format)
+        if data.count is None:
+            body = encoder.encode_hotels(data.hotels)
+        else:
+            body = encoder.encode_page(data.hotels, data.count, data.next_cursor, data.total_count)
+        return Response(body, media_type = encoder.media_type, headers = headers)
     except Exception as e:
         raise Exception(f'Error when converting hotel to json: {e}')
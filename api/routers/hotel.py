@@ -5,4 +5,5 @@ from .. import hotel_api
 
 @hotel_api('/hotel')
 def get_hotel(hotel_db: BaseDB, hotel_filter: schemas.HotelFilter):
-    return convert(service.get_hotel(hotel_db, schemas.HotelFilter(**hotel_filter)))
+    hotel_filter = schemas.HotelFilter(**hotel_filter)
+    return convert(service.get_hotel(hotel_db, hotel_filter), hotel_filter.format)
@@ -6,4 +6,5 @@ from .. import hotel_api
 
 @hotel_api('/hotels')
 def get_hotels(hotel_db: BaseDB, hotels_filter: schemas.HotelsFilter = {None, None}):
-    return convert(service.get_hotels(hotel_db, schemas.HotelsFilter(**hotels_filter)))
+    hotels_filter = schemas.HotelsFilter(**hotels_filter)
+    return convert(service.get_hotels(hotel_db, hotels_filter), hotels_filter.format)
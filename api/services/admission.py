@@ -0,0 +1,149 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from utils.exceptions import OverloadException
+
+
+class ConcurrencyLimiter:
+    """
+    Limits how many requests of a route run at once, with a bounded FIFO queue.
+    Requests are rejected up front when the queue is full or when the expected
+    queue wait, estimated from recent service times, exceeds their budget, so
+    overload fails fast instead of slowing every request down.
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, queue_timeout: float,
+                 smoothing: float = 0.2):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._smoothing = smoothing
+        self._active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        # Moving average of the time a request holds a slot, in seconds
+        self._service_time: Optional[float] = None
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_deadline = 0
+        self.timed_out = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def estimated_wait(self) -> float:
+        """
+        Estimate how long a request arriving now would wait for a slot.
+        """
+        if self._active < self.max_concurrency and not self._waiters:
+            return 0.0
+        return (len(self._waiters) + 1) * (self._service_time or 0.0) / self.max_concurrency
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(self.estimated_wait()))
+
+    @asynccontextmanager
+    async def slot(self, budget: Optional[float] = None):
+        """
+        Hold a slot while the block runs. Raises OverloadException if one cannot be had within the budget.
+        """
+        await self._acquire(self.queue_timeout if budget is None else min(budget, self.queue_timeout))
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(time.perf_counter() - started)
+            self._release()
+
+    async def _acquire(self, budget: float) -> None:
+        if self._active < self.max_concurrency and not self._waiters:
+            self._active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise OverloadException(f"Too many queued requests for '{self.name}'", 429, self._retry_after())
+        if self.estimated_wait() > budget:
+            self.rejected_deadline += 1
+            raise OverloadException(f"Expected wait for '{self.name}' exceeds the request budget", 503,
+                                    self._retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            # A released slot is handed straight to the waiter, so `_active` is not touched here
+            await asyncio.wait_for(waiter, budget)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; pass it on
+                self._release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise OverloadException(f"Timed out waiting for '{self.name}'", 503, self._retry_after())
+            raise
+        self.admitted += 1
+
+    def _release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def _record(self, elapsed: float) -> None:
+        if self._service_time is None:
+            self._service_time = elapsed
+        else:
+            self._service_time += self._smoothing * (elapsed - self._service_time)
+
+    def stats(self) -> dict:
+        return {
+            'active': self._active,
+            'queue_depth': len(self._waiters),
+            'max_concurrency': self.max_concurrency,
+            'max_queue': self.max_queue,
+            'service_time': self._service_time,
+            'admitted': self.admitted,
+            'rejected_queue_full': self.rejected_queue_full,
+            'rejected_deadline': self.rejected_deadline,
+            'timed_out': self.timed_out,
+        }
+
+
+class AdmissionController:
+    """
+    Holds one concurrency limiter per route, configured from the default
+    limits and any per-route overrides.
+    """
+
+    def __init__(self, default: dict, routes: Optional[dict[str, dict]] = None):
+        self._default = default
+        self._overrides = routes or {}
+        self._limiters: dict[str, ConcurrencyLimiter] = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AdmissionController":
+        return cls(config['default'], config['routes'])
+
+    def limiter(self, route: str) -> ConcurrencyLimiter:
+        limiter = self._limiters.get(route)
+        if limiter is None:
+            limits = {**self._default, **self._overrides.get(route, {})}
+            limiter = self._limiters[route] = ConcurrencyLimiter(route, **limits)
+        return limiter
+
+    def stats(self) -> dict:
+        return {route: limiter.stats() for route, limiter in self._limiters.items()}
@@ -0,0 +1,279 @@
+import asyncio
+import contextlib
+import functools
+import inspect
+import json
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Type, get_args, get_origin
+from urllib.parse import parse_qsl
+from pydantic import BaseModel, ValidationError
+
+from http import HTTPStatus
+from api.domain.etag import coded_etag
+from api.services.admission import AdmissionController
+from api.services.compression import CompressedResponseCache
+from api.services.hotel import HotelAPI
+from api.services.response import Response
+from configs.config import admission_config, compression_config, server_config
+from services.database import BaseDB
+from utils.exceptions import OverloadException
+from utils.logger import logger
+from utils.metrics import metrics
+
+
+def _is_list(annotation) -> bool:
+    """
+    Check whether a (possibly Optional) field annotation is a list.
+    """
+    if get_origin(annotation) in (list, List):
+        return True
+    return any(_is_list(arg) for arg in get_args(annotation) if arg is not type(None))
+
+
+def parse_query(query_string: bytes, model: Optional[Type[BaseModel]]) -> dict[str, Any]:
+    """
+    Parse a query string into a filter dictionary for the route's filter model.
+    List fields accept repeated and comma-separated values; other fields keep their last value.
+    """
+    params: dict[str, Any] = {}
+    list_fields = set()
+    if model is not None:
+        list_fields = {name for name, field in model.model_fields.items() if _is_list(field.annotation)}
+
+    for key, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=False):
+        if key in list_fields:
+            params.setdefault(key, []).extend(item for item in value.split(",") if item)
+        else:
+            params[key] = value
+    return params
+
+
+def _filter_model(func) -> Optional[Type[BaseModel]]:
+    """
+    Find the filter model a route handler builds from its filter dictionary.
+    """
+    for parameter in inspect.signature(func).parameters.values():
+        if inspect.isclass(parameter.annotation) and issubclass(parameter.annotation, BaseModel):
+            return parameter.annotation
+    return None
+
+
+class HotelASGIApp:
+    """
+    An ASGI application serving the routes registered on a HotelAPI.
+    Route handlers are synchronous, so they run on a thread pool while the
+    event loop keeps accepting and streaming responses.
+    """
+
+    def __init__(self,
+                 api: HotelAPI,
+                 db: BaseDB,
+                 executor: Optional[Executor] = None,
+                 compression: Optional[CompressedResponseCache] = None,
+                 admission: Optional[AdmissionController] = None,
+                 stats_providers: Optional[dict[str, Callable[[], dict]]] = None):
+        self._api = api
+        self._db = db
+        self._executor = executor or ThreadPoolExecutor(max_workers=server_config['workers'])
+        if compression is None and compression_config['enabled']:
+            compression = CompressedResponseCache.from_config(compression_config)
+        self.compression = compression
+        if admission is None and admission_config['enabled']:
+            admission = AdmissionController.from_config(admission_config)
+        self.admission = admission
+        # Extra sections for the stats endpoint, such as the refresh scheduler's
+        self._stats_providers = stats_providers or {}
+        self._routes = {route: (name, _filter_model(func)) for name, (route, func) in api.routes.items()}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+
+        if scope['method'] not in ('GET', 'HEAD'):
+            await self._send_error(send, 405, "Method Not Allowed")
+            return
+
+        if scope['path'] == server_config['stats_path']:
+            body = json.dumps(self.stats()).encode()
+            await self._send_body(send, 200, 'application/json', body, head=scope['method'] == 'HEAD')
+            return
+
+        if scope['path'] == server_config['metrics_path']:
+            await self._send_metrics(scope, send)
+            return
+
+        route = self._routes.get(scope['path'])
+        if route is None:
+            await self._send_error(send, 404, "Not Found")
+            return
+
+        name, model = route
+        params = parse_query(scope.get('query_string', b''), model)
+        if model is not None and 'if_none_match' in model.model_fields:
+            if_none_match = self._header(scope, b'if-none-match')
+            if if_none_match is not None:
+                params['if_none_match'] = if_none_match
+        handler = functools.partial(getattr(self._api, name), self._db, params)
+
+        async with contextlib.AsyncExitStack() as stack:
+            try:
+                await stack.enter_async_context(self._admit(scope))
+            except OverloadException as e:
+                await self._send_error(send, e.status, e.message,
+                                       headers=[(b'retry-after', str(e.retry_after).encode())])
+                return
+
+            try:
+                response = await asyncio.get_running_loop().run_in_executor(self._executor, handler)
+            except ValidationError as e:
+                await self._send_error(send, 400, json.loads(e.json(include_url=False)))
+                return
+            except Exception as e:
+                logger.log(f"Route '{scope['path']}' failed: {e}", "error")
+                await self._send_error(send, 500, "Internal Server Error")
+                return
+
+            # Streamed bodies are encoded and large ones compressed while sending,
+            # so the slot is held until the response is out
+            await self._send_response(scope, send, response, head=scope['method'] == 'HEAD')
+
+    async def _send_response(self, scope, send, response: Response, head=False):
+        response_headers = dict(response.headers)
+        body = response.body
+        etag = response.headers.get('etag')
+        extra = []
+        if (self.compression is not None and response.status == 200 and etag
+                and self.compression.compressible(body)):
+            extra.append((b'vary', b'accept-encoding'))
+            codec = self.compression.negotiate(self._header(scope, b'accept-encoding'))
+            if codec is not None:
+                # Variants are keyed by ETag, so each representation is compressed once per content version
+                body = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self.compression.compress, (scope['path'], etag), body, codec)
+                extra.append((b'content-encoding', codec.name.encode()))
+                response_headers['etag'] = coded_etag(etag, codec.name)
+        elif self.compression is not None and response.status == 304 and etag:
+            # Revalidating a compressed variant answers with that variant's ETag
+            codec = self.compression.negotiate(self._header(scope, b'accept-encoding'))
+            if_none_match = self._header(scope, b'if-none-match') or ''
+            if codec is not None and coded_etag(etag, codec.name) in if_none_match:
+                extra.append((b'vary', b'accept-encoding'))
+                response_headers['etag'] = coded_etag(etag, codec.name)
+        headers = [(name.encode('latin-1'), value.encode('latin-1')) for name, value in response_headers.items()]
+        headers += extra
+        if response.status == 304:
+            # Not modified: validators only, no body or content headers
+            await send({'type': 'http.response.start', 'status': 304, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        if response.body is None:
+            await self._send_error(send, response.status, HTTPStatus(response.status).phrase)
+            return
+        await self._send_body(send, response.status, response.media_type, body, head=head, headers=headers)
+
+    async def _send_body(self, send, status, media_type, body, head=False, headers=None):
+        headers = [(b'content-type', media_type.encode())] + (headers or [])
+        if isinstance(body, bytes):
+            headers.append((b'content-length', str(len(body)).encode()))
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': b'' if head else body})
+            return
+
+        # Streamed bodies are encoded on the executor, since the encoder may read hotels from disk,
+        # and sent in batches of chunks so the event loop stays free for other connections
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        if not head:
+            loop = asyncio.get_running_loop()
+            chunks = iter(body)
+            try:
+                while True:
+                    data = await loop.run_in_executor(self._executor, self._read_chunks, chunks)
+                    if not data:
+                        break
+                    await send({'type': 'http.response.body', 'body': data, 'more_body': True})
+            except Exception as e:
+                # The status line is already out, so the connection is dropped without ending the body
+                logger.log(f"Streaming response failed after it started: {e}", "error")
+                raise
+            finally:
+                close = getattr(body, 'close', None)
+                if close is not None:
+                    close()
+        await send({'type': 'http.response.body', 'body': b''})
+
+    @staticmethod
+    def _read_chunks(chunks) -> bytes:
+        """
+        Pull chunks from a streamed body until a batch of `stream_chunk_size` bytes is ready.
+        Returns an empty batch once the body is exhausted.
+        """
+        batch = []
+        size = 0
+        for chunk in chunks:
+            batch.append(chunk)
+            size += len(chunk)
+            if size >= server_config['stream_chunk_size']:
+                break
+        return b''.join(batch)
+
+    async def _send_metrics(self, scope, send):
+        """
+        Serve the metrics registry as Prometheus text, or as JSON with `?format=json`.
+        """
+        params = dict(parse_qsl(scope.get('query_string', b'').decode('latin-1')))
+        if params.get('format') == 'json':
+            body, media_type = metrics.to_json().encode(), 'application/json'
+        else:
+            body, media_type = metrics.to_prometheus().encode(), 'text/plain; version=0.0.4; charset=utf-8'
+        await self._send_body(send, 200, media_type, body, head=scope['method'] == 'HEAD')
+
+    async def _send_error(self, send, status, detail, headers=None):
+        body = json.dumps({'detail': detail}).encode()
+        await self._send_body(send, status, 'application/json', body, headers=headers)
+
+    def _admit(self, scope):
+        """
+        Wait for a slot on the route's limiter. Clients can shorten the queue
+        budget with an `x-request-timeout` header, in seconds.
+        """
+        if self.admission is None:
+            return contextlib.nullcontext()
+        budget = None
+        timeout = self._header(scope, b'x-request-timeout')
+        if timeout is not None:
+            try:
+                budget = max(0.0, float(timeout))
+            except ValueError:
+                pass
+        return self.admission.limiter(scope['path']).slot(budget)
+
+    def stats(self) -> dict:
+        """
+        Get admission, request coalescing and compression counters.
+        """
+        stats = {
+            'admission': self.admission.stats() if self.admission is not None else None,
+            'coalescing': self._api.flight.stats(),
+            'compression': self.compression.stats() if self.compression is not None else None,
+        }
+        for name, provider in self._stats_providers.items():
+            stats[name] = provider()
+        return stats
+
+    @staticmethod
+    def _header(scope, name: bytes) -> Optional[str]:
+        values = [value.decode('latin-1') for key, value in scope.get('headers', []) if key == name]
+        return ", ".join(values) if values else None
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
@@ -0,0 +1,154 @@
+import gzip
+from abc import ABC, abstractmethod
+from typing import Hashable, List, Optional
+
+from api.services.singleflight import SingleFlight
+from services.cache import HotCache
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Codec(ABC):
+    """
+    A content coding that responses can be compressed with.
+    """
+    name: str
+
+    def __init__(self, level: int):
+        self.level = level
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+
+class GzipCodec(Codec):
+    name = "gzip"
+
+    def compress(self, data):
+        # A fixed mtime keeps the output identical for identical bodies
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+
+class BrotliCodec(Codec):
+    name = "br"
+
+    def compress(self, data):
+        return brotli.compress(data, quality=self.level)
+
+
+class ZstdCodec(Codec):
+    name = "zstd"
+
+    def compress(self, data):
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+
+# Codec classes and the module each one needs, which may not be installed
+CODECS = {
+    "br": (BrotliCodec, brotli),
+    "zstd": (ZstdCodec, zstandard),
+    "gzip": (GzipCodec, gzip),
+}
+
+
+def available_codecs(levels: dict[str, int], preference: List[str]) -> List[Codec]:
+    """
+    Build the codecs that can be used here, in the server's order of preference.
+    """
+    codecs = []
+    for name in preference:
+        codec_class, module = CODECS[name]
+        if module is not None:
+            codecs.append(codec_class(levels[name]))
+    return codecs
+
+
+def parse_accept_encoding(accept_encoding: Optional[str]) -> dict[str, float]:
+    """
+    Parse an Accept-Encoding header into a map of content coding to quality value.
+    """
+    qualities = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+    return qualities
+
+
+class CompressedResponseCache:
+    """
+    Keeps compressed variants of response bodies so each one is compressed once.
+    Entries are keyed by the route and the response ETag, which changes with
+    the content version, so a refresh naturally stops serving old variants and
+    they age out of the bounded cache.
+    """
+
+    def __init__(self,
+                 codecs: List[Codec],
+                 min_size: int = 1024,
+                 max_items: int = 1024,
+                 max_bytes: Optional[int] = None):
+        self.codecs = codecs
+        self.min_size = min_size
+        self._cache = HotCache(max_items, max_bytes)
+        self._flight = SingleFlight()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "CompressedResponseCache":
+        return cls(available_codecs(config['levels'], config['preference']),
+                   min_size=config['min_size'],
+                   max_items=config['max_items'],
+                   max_bytes=config['max_bytes'])
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[Codec]:
+        """
+        Pick the coding the client rates highest, breaking ties by server preference.
+        Returns None when the response should be sent uncompressed.
+        """
+        qualities = parse_accept_encoding(accept_encoding)
+        best, best_quality = None, 0.0
+        for codec in self.codecs:
+            quality = qualities.get(codec.name, qualities.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = codec, quality
+        return best
+
+    def compressible(self, body) -> bool:
+        return isinstance(body, bytes) and len(body) >= self.min_size
+
+    def compress(self, key: Hashable, body: bytes, codec: Codec) -> bytes:
+        """
+        Get the compressed variant of a body, compressing it on first use.
+        Concurrent requests for the same missing variant share one compression.
+        """
+        cache_key = (key, codec.name)
+        data = self._cache.get(cache_key)
+        if data is not None:
+            return data
+
+        data, _ = self._flight.do(cache_key, lambda: codec.compress(body))
+        self._cache.put(cache_key, data, len(data))
+        return data
+
+    def stats(self) -> dict:
+        stats = self._cache.stats()
+        stats['codecs'] = [codec.name for codec in self.codecs]
+        return stats
@@ -1,9 +1,47 @@
+import time
+from collections.abc import Iterator
+from typing import Any, Hashable, Optional
+
+from api.services.singleflight import SingleFlight
+from configs.config import api_config
 from utils.logger import logger
+from utils.metrics import metrics
+from utils.profiler import stage as profile_stage
+
+REQUEST_SECONDS = metrics.histogram('api_request_seconds', 'Time to answer a route call, including waits on '
+                                                           'coalesced calls.', ['route'])
+REQUESTS = metrics.counter('api_requests', 'Route calls by response status.', ['route', 'status'])
+COALESCED = metrics.counter('api_coalesced', 'Route calls answered with the result of an identical in-flight call.',
+                            ['route'])
+
+
+def _freeze(value: Any) -> Hashable:
+    """
+    Turn route arguments into a hashable key. Raises TypeError for values that cannot be keyed.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    hash(value)
+    return value
+
+
+def _shareable(response) -> bool:
+    """
+    Streamed bodies can only be read once, so they are not handed to coalesced callers.
+    """
+    return not isinstance(getattr(response, 'body', None), Iterator)
+
 
 class HotelAPI:
-    def __init__(self):
+    def __init__(self, coalesce: Optional[bool] = None):
         self.decorators = {}
         self.routes = {}
+        self.coalesce = api_config['coalesce_requests'] if coalesce is None else coalesce
+        self.flight = SingleFlight()
 
     def __call__(self, route):
         def wrapper(func):
@@ -20,12 +58,49 @@ class HotelAPI:
             raise ValueError(f"Decorator '{name}' not registered.")
         return decorator
 
+    def _request_key(self, name, args, kwargs) -> Optional[Hashable]:
+        """
+        Key identical calls to a route so concurrent ones can share one computation.
+        Returns None when coalescing is disabled or the arguments cannot be keyed.
+        """
+        if not self.coalesce:
+            return None
+        try:
+            return (name, _freeze(args), _freeze(kwargs))
+        except TypeError:
+            return None
+
+    def _call(self, item, route, func, args, kwargs):
+        """
+        Run a route, sharing the result of an identical call already in flight.
+        """
+        def call():
+            logger.log("Calling route '%s' with function '%s'.", "info", route, func.__name__)
+            return func(*args, **kwargs)
+
+        key = self._request_key(item, args, kwargs)
+        if key is None:
+            return call()
+        result, shared = self.flight.do(key, call, _shareable)
+        if shared:
+            COALESCED.inc(route=route)
+            logger.log("Shared in-flight result of route '%s'.", "debug", route)
+        return result
+
     def __getattr__(self, item):
         if item in self.routes:
             route, func = self.routes[item]
 
             def wrapped_function(*args, **kwargs):
-                logger.log(f"Calling route '{route}' with function '{func.__name__}'.", "info")
-                return func(*args, **kwargs)
+                start = time.perf_counter()
+                status = 'error'
+                try:
+                    with profile_stage('query'):
+                        result = self._call(item, route, func, args, kwargs)
+                    status = getattr(result, 'status', 200)
+                    return result
+                finally:
+                    REQUEST_SECONDS.observe(time.perf_counter() - start, route=route)
+                    REQUESTS.inc(route=route, status=status)
             return wrapped_function
         raise AttributeError(f"'HotelAPI' object has no attribute '{item}'")
@@ -0,0 +1,67 @@
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import ValidationError
+
+from utils.logger import logger
+
+
+class QueryRunner:
+    """
+    Answers many independent queries against one loaded catalog.
+    Queries run on a thread pool and results come back as NDJSON lines in
+    input order. At most `window` queries are in flight, so arbitrarily long
+    inputs are streamed with bounded memory.
+
+    Each output line holds the input line number, the query text, the status
+    and either the route's JSON `result` or an `error` detail. Results are
+    always encoded as compact JSON so they can be embedded in the line.
+    """
+
+    def __init__(self, api, db, route: str = 'get_hotels', workers: int = 4, window: Optional[int] = None):
+        self._api = api
+        self._db = db
+        self._route = route
+        self._workers = workers
+        self._window = window or workers * 4
+
+    def run(self, lines: Iterable[str], parse: Callable[[str], dict]) -> Iterator[bytes]:
+        """
+        Parse each non-empty, non-comment line into route parameters with `parse` and answer it.
+        `parse` raises ValueError for lines it cannot read; they are reported as 400 errors.
+        """
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='query') as executor:
+            for number, line in enumerate(lines, start=1):
+                query = line.strip()
+                if not query or query.startswith('#'):
+                    continue
+                pending.append(executor.submit(self._answer, number, query, parse))
+                if len(pending) >= self._window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _answer(self, number: int, query: str, parse: Callable[[str], dict]) -> bytes:
+        head = b'{"line":' + str(number).encode() + b',"query":' + json.dumps(query).encode()
+        try:
+            params = parse(query)
+            params['format'] = 'json'
+            response = getattr(self._api, self._route)(self._db, params)
+        except ValidationError as e:
+            return self._error(head, 400, json.loads(e.json(include_url=False)))
+        except ValueError as e:
+            return self._error(head, 400, str(e))
+        except Exception as e:
+            logger.log(f"Query on line {number} failed: {e}", "error")
+            return self._error(head, 500, "Internal Server Error")
+
+        if response.status != 200 or response.body is None:
+            return self._error(head, response.status, "No result")
+        return head + b',"status":200,"result":' + response.body + b'}\n'
+
+    @staticmethod
+    def _error(head: bytes, status: int, detail) -> bytes:
+        return head + b',"status":' + str(status).encode() + b',"error":' + json.dumps(detail).encode() + b'}\n'
@@ -0,0 +1,21 @@
+from typing import Iterator, Optional, Union
+
+
+class Response:
+    """
+    The result of a route: an encoded body with the status and headers to send with it.
+    The body is bytes, an iterator of byte chunks for streamed responses, or None.
+    """
+
+    def __init__(self,
+                 body: Optional[Union[bytes, Iterator[bytes]]] = None,
+                 status: int = 200,
+                 media_type: str = "application/json",
+                 headers: Optional[dict[str, str]] = None):
+        self.body = body
+        self.status = status
+        self.media_type = media_type
+        self.headers = headers or {}
+
+    def __repr__(self):
+        return f"Response(status={self.status}, media_type={self.media_type!r}, headers={self.headers!r})"
@@ -0,0 +1,217 @@
+import asyncio
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import unquote
+
+from configs.config import server_config
+from utils.logger import logger
+
+
+class HTTPServer:
+    """
+    A small HTTP/1.1 server that drives an ASGI application.
+    Connections are kept alive between requests, and responses without a
+    content length are streamed with chunked transfer encoding.
+    """
+
+    def __init__(self, app, host: str, port: int,
+                 keep_alive_timeout: float = None,
+                 max_header_size: int = None,
+                 max_body_size: int = None):
+        self._app = app
+        self._host = host
+        self._port = port
+        self._keep_alive_timeout = keep_alive_timeout or server_config['keep_alive_timeout']
+        self._max_header_size = max_header_size or server_config['max_header_size']
+        self._max_body_size = server_config['max_body_size'] if max_body_size is None else max_body_size
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle_connection, self._host, self._port, limit=self._max_header_size)
+        logger.log(f"Serving on http://{self._host}:{self.port}", "info")
+
+    @property
+    def port(self) -> int:
+        if self._server and self._server.sockets:
+            return self._server.sockets[0].getsockname()[1]
+        return self._port
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self._keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._write_simple(writer, 431)
+                    return
+
+                request = self._parse_head(head)
+                if request is None:
+                    await self._write_simple(writer, 400)
+                    return
+
+                method, target, version, raw_headers = request
+                headers = dict(raw_headers)
+                length = self._content_length(headers)
+                if length is None:
+                    await self._write_simple(writer, 400)
+                    return
+                if length > self._max_body_size:
+                    # The body is never read, so the connection cannot be reused
+                    await self._write_simple(writer, 413)
+                    return
+                body = await reader.readexactly(length) if length else b""
+
+                connection = headers.get(b"connection", b"").lower()
+                keep_alive = connection != b"close" if version == "1.1" else connection == b"keep-alive"
+
+                completed = await self._dispatch(writer, method, target, version, raw_headers, body, keep_alive)
+                if not keep_alive or not completed:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _parse_head(head: bytes):
+        try:
+            lines = head[:-4].split(b"\r\n")
+            method, target, version = lines[0].decode("latin-1").split(" ", 2)
+            if not version.startswith("HTTP/"):
+                return None
+            headers = []
+            for line in lines[1:]:
+                name, _, value = line.partition(b":")
+                headers.append((name.strip().lower(), value.strip()))
+            return method, target, version[5:], headers
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _content_length(headers: dict) -> Optional[int]:
+        """
+        Get the request body length, or None if the Content-Length header is malformed.
+        """
+        value = headers.get(b"content-length", b"").strip()
+        if not value:
+            return 0
+        if not value.isdigit():
+            return None
+        return int(value)
+
+    async def _dispatch(self, writer, method, target, version, headers, body, keep_alive) -> bool:
+        """
+        Run the application for one request.
+        Returns False if the application failed, in which case the connection must be closed.
+        """
+        path, _, query = target.partition("?")
+        peer = writer.get_extra_info("peername")
+        sock = writer.get_extra_info("sockname")
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': version,
+            'method': method,
+            'scheme': 'http',
+            'path': unquote(path),
+            'raw_path': path.encode("latin-1"),
+            'query_string': query.encode("latin-1"),
+            'root_path': '',
+            'headers': headers,
+            'client': tuple(peer[:2]) if peer else None,
+            'server': tuple(sock[:2]) if sock else None,
+        }
+
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return {'type': 'http.disconnect'}
+
+        state = {'status': None, 'headers': None, 'chunked': False, 'started': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                state['status'] = message['status']
+                state['headers'] = list(message.get('headers', []))
+                return
+
+            if message['type'] != 'http.response.body':
+                return
+
+            chunk = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if not state['started']:
+                state['started'] = True
+                names = {name.lower() for name, _ in state['headers']}
+                if state['status'] in (204, 304):
+                    # These responses never carry a body, so no framing headers
+                    pass
+                elif b'content-length' not in names:
+                    if more_body:
+                        state['chunked'] = True
+                        state['headers'].append((b'transfer-encoding', b'chunked'))
+                    else:
+                        state['headers'].append((b'content-length', str(len(chunk)).encode()))
+                state['headers'].append((b'connection', b'keep-alive' if keep_alive else b'close'))
+                writer.write(self._status_line(state['status']) +
+                             b"".join(name + b": " + value + b"\r\n" for name, value in state['headers']) +
+                             b"\r\n")
+
+            if method != 'HEAD':
+                if state['chunked']:
+                    if chunk:
+                        writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                    if not more_body:
+                        writer.write(b"0\r\n\r\n")
+                elif chunk:
+                    writer.write(chunk)
+            await writer.drain()
+
+        try:
+            await self._app(scope, receive, send)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except Exception as e:
+            logger.log(f"Application failed on {method} {path}: {e}", "error")
+            if not state['started']:
+                await self._write_simple(writer, 500)
+            # A response cut off after it started cannot be ended cleanly, so the connection is dropped
+            return False
+        return True
+
+    @staticmethod
+    def _status_line(status: int) -> bytes:
+        try:
+            reason = HTTPStatus(status).phrase
+        except ValueError:
+            reason = ""
+        return f"HTTP/1.1 {status} {reason}\r\n".encode("latin-1")
+
+    async def _write_simple(self, writer, status: int):
+        writer.write(self._status_line(status) + b"content-length: 0\r\nconnection: close\r\n\r\n")
+        await writer.drain()
+
+
+def serve(app, host: str = None, port: int = None):
+    """
+    Run an ASGI application on the built-in HTTP server until interrupted.
+    """
+    server = HTTPServer(app, host or server_config['host'], port or server_config['port'])
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.log("Server stopped.", "info")
@@ -0,0 +1,74 @@
+import threading
+from typing import Any, Callable, Hashable, Tuple
+
+
+class _Call:
+    """
+    An in-flight computation that other callers with the same key can wait on.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one computation.
+    The first caller runs the function; callers arriving while it is in flight
+    wait for it and receive the same result or exception. Nothing is cached
+    once the call completes, so later calls always see fresh data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._executed = 0
+        self._shared = 0
+
+    def do(self,
+           key: Hashable,
+           fn: Callable[[], Any],
+           shareable: Callable[[Any], bool] = lambda result: True) -> Tuple[Any, bool]:
+        """
+        Run `fn` for `key`, or wait for the identical call already in flight.
+        Results that cannot be handed to several callers, such as one-shot
+        streams, fail `shareable` and are recomputed by each waiting caller.
+        Returns the result and whether it came from another caller's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            if shareable(call.result):
+                with self._lock:
+                    self._shared += 1
+                return call.result, True
+            return fn(), False
+
+        try:
+            call.result = fn()
+            return call.result, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._executed += 1
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self._executed,
+                'shared': self._shared,
+            }
@@ -0,0 +1,318 @@
+"""
+Per-call cost of the cleaner, each attribute normalizer and each attribute
+merger, measured in isolation on values drawn from a synthetic catalog.
+
+    python -m benchmarks.bench_hot_paths
+    python -m benchmarks.bench_hot_paths --hotels 5000 --repeat 15 --output hot_paths.json
+    python -m benchmarks.bench_hot_paths --only merger --compare hot_paths.json --fail-on-regression
+
+Every target is timed with the implementation the refresh uses, which is the
+baseline, and with any alternatives registered for it through `register`.
+Each implementation is checked to return the same values as the baseline
+before it is timed. Each repeat calls the function once on every sample value,
+after `--warmup` untimed passes. Normalizers change their input, so they get
+fresh copies for every pass; copying is not timed.
+"""
+import argparse
+import copy
+import gc
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.bench_refresh import _commit
+from benchmarks.catalog_generator import SUPPLIER_NAMES, CatalogSpec, generate_records
+from configs.config import merger_config
+from models.record import AmenitiesRecord, HotelRecord
+from services.catalog import SUPPLIERS, create_merger, create_normalizer
+from services.merger import AmenitiesMerger, AttributeMerger, BookingConditionsMerger
+from services.normalizer import AttributeNormalizer
+from utils.bias import HotelBias
+from utils.cleaner import HotelCleaner
+
+# Target -> {"values": sample set, "copy": whether inputs are changed in place, "implementations": name -> factory}
+# The first implementation registered for a target is its baseline.
+TARGETS: Dict[str, dict] = {}
+
+
+def register(target: str, name: str, values: Optional[str] = None, copy_values: bool = False):
+    """
+    Register a factory returning a one-argument callable as an implementation of `target`.
+    `values` and `copy_values` are taken from the first registration of a target.
+    """
+    def decorator(factory: Callable[[], Callable[[Any], Any]]):
+        entry = TARGETS.setdefault(target, {"values": values, "copy": copy_values, "implementations": {}})
+        entry["implementations"][name] = factory
+        return factory
+    return decorator
+
+
+_SPECIAL_CHARACTERS = re.compile(r'[^a-zA-Z0-9\s.,"\'?!]')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s([^\w\s])')
+_CAPITALS = re.compile(r'(?<!^)(?=[A-Z])')
+
+
+class CompiledCleaner(HotelCleaner):
+    """
+    HotelCleaner with its patterns compiled once, skipping the lookup in the `re` cache on every call.
+    """
+
+    @staticmethod
+    def clean_text(text: str) -> str:
+        if not isinstance(text, str):
+            return HotelCleaner.clean_text(text)
+        text = _SPECIAL_CHARACTERS.sub(' ', text)
+        text = _SPACE_BEFORE_PUNCTUATION.sub(r'\1', text)
+        return ' '.join(text.split())
+
+    def clean_amenity(self, text: str) -> str:
+        if not isinstance(text, str):
+            return super().clean_amenity(text)
+        return _CAPITALS.sub(' ', self.clean_text(text)).lower()
+
+
+class CachedCleaner(CompiledCleaner):
+    """
+    CompiledCleaner remembering its results. Suppliers repeat the same names, amenities,
+    conditions and captions across hotels, so most calls in a refresh are hits.
+    """
+
+    def __init__(self, maxsize: int = 8192):
+        self.clean_text = lru_cache(maxsize)(CompiledCleaner.clean_text)
+        self.clean_caption = lru_cache(maxsize)(super().clean_caption)
+        self.clean_amenity = lru_cache(maxsize)(super().clean_amenity)
+
+
+class DedupAmenitiesMerger(AmenitiesMerger):
+    """
+    AmenitiesMerger keeping amenities in insertion-ordered dicts instead of searching lists.
+    """
+
+    def merge(self, data: List[dict] = []) -> AmenitiesRecord:
+        if not data:
+            return None
+        merged = {field: {} for field in AmenitiesRecord.__slots__}
+        for amenities in filter(None, data):
+            amenities_data = self.decode_merge_data(amenities)
+            if not amenities_data:
+                continue
+            for field, seen in merged.items():
+                seen.update(dict.fromkeys(getattr(amenities_data, field) or ()))
+        return AmenitiesRecord(**{field: list(seen) for field, seen in merged.items()})
+
+
+class DedupBookingConditionsMerger(BookingConditionsMerger):
+    """
+    BookingConditionsMerger deduplicating through an insertion-ordered dict.
+    """
+
+    def merge(self, data: List[dict] = []) -> List[str]:
+        if not data:
+            return None
+        merged = {}
+        for booking_conditions in filter(None, data):
+            merged.update(dict.fromkeys(filter(None, self.decode_merge_data(booking_conditions) or ())))
+        return list(merged)
+
+
+CLEANERS = {
+    "HotelCleaner": HotelCleaner,
+    "CompiledCleaner": CompiledCleaner,
+    "CachedCleaner": CachedCleaner,
+}
+
+for _name, _cleaner in CLEANERS.items():
+    register("cleaner.clean_text", _name, "text")(lambda cleaner=_cleaner: cleaner().clean_text)
+    register("cleaner.clean_caption", _name, "caption")(lambda cleaner=_cleaner: cleaner().clean_caption)
+    register("cleaner.clean_amenity", _name, "amenity")(lambda cleaner=_cleaner: cleaner().clean_amenity)
+
+# Normalizers as the refresh builds them, then with each alternative cleaner swapped in
+for _field, _normalizer in create_normalizer().get_all_normalizers():
+    for _name, _cleaner in CLEANERS.items():
+        register(f"normalizer.{type(_normalizer).__name__}", _name, _field, copy_values=True)(
+            lambda cls=type(_normalizer), cleaner=_cleaner: cls(cleaner()).normalize)
+
+for _field, _merger in create_merger().get_all_mergers():
+    register(f"merger.{type(_merger).__name__}", type(_merger).__name__, f"merge:{_field}")(
+        lambda merger=_merger: merger.merge)
+
+register("merger.AmenitiesMerger", "DedupAmenitiesMerger")(
+    lambda: DedupAmenitiesMerger(HotelBias(merger_config['bias_factors'])).merge)
+register("merger.BookingConditionsMerger", "DedupBookingConditionsMerger")(
+    lambda: DedupBookingConditionsMerger(HotelBias(merger_config['bias_factors'])).merge)
+
+
+def build_samples(spec: CatalogSpec) -> Dict[str, list]:
+    """
+    Parse a synthetic catalog and collect the values each target sees in a refresh: raw
+    strings for the cleaner, raw attributes for the normalizers and, for the mergers,
+    the merge batches of every hotel built from its normalized supplier records.
+    """
+    suppliers = {name: SUPPLIERS[name](f"http://localhost/suppliers/{name}") for name in SUPPLIER_NAMES}
+    hotels = [HotelRecord.from_model(suppliers[supplier].parse(record))
+              for supplier, record in generate_records(spec)]
+
+    samples: Dict[str, list] = {"text": [], "caption": [], "amenity": []}
+    for hotel in hotels:
+        samples["text"] += filter(None, [hotel.name, hotel.description, hotel.location.address,
+                                         *(hotel.booking_conditions or ())])
+        if hotel.amenities:
+            samples["amenity"] += (hotel.amenities.general or []) + (hotel.amenities.room or [])
+        if hotel.images:
+            samples["caption"] += [image.description for images in (hotel.images.rooms, hotel.images.amenities)
+                                   for image in images or () if image.description]
+
+    normalizer = create_normalizer()
+    for field, _ in normalizer.get_all_normalizers():
+        samples[field] = [getattr(hotel, field) for hotel in hotels]
+
+    grouped: Dict[str, list] = {}
+    for hotel in normalizer.normalize(copy.deepcopy(hotels)):
+        grouped.setdefault(hotel.hotel_id, []).append(hotel)
+    order = {name: position for position, name in enumerate(SUPPLIER_NAMES)}
+    for field, _ in create_merger().get_all_mergers():
+        samples[f"merge:{field}"] = [
+            [AttributeMerger.encode_merge_data(getattr(hotel, field), hotel.source)
+             for hotel in sorted(records, key=lambda record: order[record.source])]
+            for records in grouped.values()
+        ]
+    return samples
+
+
+def _inputs(values: list, copy_values: bool) -> list:
+    return copy.deepcopy(values) if copy_values else values
+
+
+def check(func: Callable, baseline: Callable, values: list, copy_values: bool) -> bool:
+    """
+    Whether `func` returns what the baseline returns for every value.
+    """
+    expected = [baseline(value) for value in _inputs(values, copy_values)]
+    return [func(value) for value in _inputs(values, copy_values)] == expected
+
+
+def measure(func: Callable, values: list, copy_values: bool, warmup: int, repeat: int) -> dict:
+    """
+    Time `repeat` passes of `func` over every value after `warmup` untimed ones, in nanoseconds per call.
+    """
+    timings = []
+    for run in range(warmup + repeat):
+        inputs = _inputs(values, copy_values)
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter_ns()
+            for value in inputs:
+                func(value)
+            elapsed = time.perf_counter_ns() - started
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if run >= warmup:
+            timings.append(elapsed / len(inputs))
+    return {
+        "calls": len(values),
+        "min_ns": round(min(timings), 1),
+        "median_ns": round(statistics.median(timings), 1),
+        "stdev_ns": round(statistics.stdev(timings), 1) if len(timings) > 1 else 0.0,
+    }
+
+
+def run(spec: CatalogSpec, warmup: int, repeat: int, only: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+    samples = build_samples(spec)
+    results = {}
+    for target, entry in TARGETS.items():
+        if only and only not in target:
+            continue
+        values = samples[entry["values"]]
+        if not values:
+            continue
+        implementations = {name: factory() for name, factory in entry["implementations"].items()}
+        baseline = next(iter(implementations.values()))
+        results[target] = {}
+        for name, func in implementations.items():
+            report = measure(func, values, entry["copy"], warmup, repeat)
+            report["matches_baseline"] = func is baseline or check(func, baseline, values, entry["copy"])
+            results[target][name] = report
+        print(f"{target}: {len(values)} values", file=sys.stderr)
+    return results
+
+
+def print_results(results: dict, baseline: Optional[dict] = None, threshold: float = 0.1) -> List[str]:
+    """
+    Print the comparison table and return the (target, implementation) pairs slower than in `baseline`.
+    """
+    previous = baseline["targets"] if baseline else {}
+    regressions = []
+    header = (f"{'target':<42} {'implementation':<30} {'calls':>7} {'min ns':>10} {'median ns':>10} "
+              f"{'stdev':>7} {'speedup':>8}")
+    print(header + (f" {'before ns':>10} {'change':>8}" if baseline else ""))
+    for target, implementations in results["targets"].items():
+        reference = next(iter(implementations.values()))["min_ns"]
+        for position, (name, report) in enumerate(implementations.items()):
+            stdev = report["stdev_ns"] / report["median_ns"] if report["median_ns"] else 0.0
+            line = (f"{target if position == 0 else '':<42} {name:<30} {report['calls']:>7} "
+                    f"{report['min_ns']:>10.0f} {report['median_ns']:>10.0f} {stdev:>7.1%} "
+                    f"{reference / report['min_ns']:>7.2f}x")
+            before = previous.get(target, {}).get(name)
+            if before is not None:
+                change = (report["min_ns"] - before["min_ns"]) / before["min_ns"]
+                line += f" {before['min_ns']:>10.0f} {change:>+8.1%}"
+                if change > threshold:
+                    line += "  REGRESSED"
+                    regressions.append(f"{target} ({name})")
+            if not report["matches_baseline"]:
+                line += "  DIFFERS FROM BASELINE"
+            print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cleaners, normalizers and attribute mergers per call.")
+    parser.add_argument("--hotels", type=int, default=1000, help="Size of the synthetic catalog values are drawn from.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warmup", type=int, default=2, help="Untimed passes before the timed ones.")
+    parser.add_argument("--repeat", type=int, default=7, help="Timed passes over the sample values.")
+    parser.add_argument("--only", type=str, default=None, help="Only run targets whose name contains this.")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", type=str, default=None, help="A previous results file to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Flag implementations this much slower than in the compared run.")
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="Exit with status 1 when any implementation regressed.")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "targets": run(CatalogSpec(args.hotels, seed=args.seed), args.warmup, args.repeat, args.only),
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    regressions = print_results(results, baseline, args.threshold)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} regressed: {', '.join(regressions)}", file=sys.stderr)
+        if args.fail_on_regression:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Per-hotel response cost before and after the shared response projection.
+
+    python -m benchmarks.bench_projection
+"""
+import json
+import timeit
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+from benchmarks.fixtures import sample_hotel
+from models.hotel import Location, Amenities, HotelImages, hotel_response
+from services.database import HotelDB
+
+
+class LegacyHotelResponse(BaseModel):
+    """
+    The response model the API used to build from every stored hotel.
+    """
+    hotel_id: str = Field(..., alias="Id")
+    destination_id: int = Field(..., alias="DestinationId")
+    name: str = Field(..., alias="Name")
+    description: Optional[str] = None
+    location: Location
+    amenities: Optional[Amenities] = None
+    images: Optional[HotelImages] = None
+    booking_conditions: Optional[List[str]] = None
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def legacy_response(hotel) -> bytes:
+    """Dump, re-validate, dump again and encode, as the API used to"""
+    response = LegacyHotelResponse(**hotel.model_dump())
+    return json.dumps(response.model_dump(mode="json"), indent=4).encode()
+
+
+def legacy_compact_response(hotel) -> bytes:
+    """The legacy conversion with compact stdlib encoding"""
+    response = LegacyHotelResponse(**hotel.model_dump())
+    return json.dumps(response.model_dump(mode="json")).encode()
+
+
+def projected_response(hotel) -> bytes:
+    """Exclude fields at serialization time with Pydantic's native encoder"""
+    return hotel_response.dump_json(hotel)
+
+
+def cached_response(db, hotel) -> bytes:
+    """Read the fragment HotelDB encoded when the hotel was written"""
+    return db.encoded(hotel)
+
+
+CASES = {
+    "legacy (HotelResponse + json.dumps indent=4)": legacy_response,
+    "legacy (HotelResponse + json.dumps compact)": legacy_compact_response,
+    "projection (model_dump_json exclude)": projected_response,
+}
+
+
+def run(number: int = 5000, repeat: int = 5) -> dict:
+    hotel = sample_hotel()
+    assert json.loads(legacy_response(hotel)) == json.loads(projected_response(hotel))
+
+    db = HotelDB()
+    db.update_one(hotel)
+    cases = dict(CASES)
+    cases["cached fragment (HotelDB.encoded)"] = lambda hotel: cached_response(db, hotel)
+
+    results = {}
+    for name, func in cases.items():
+        timings = timeit.repeat(lambda: func(hotel), number=number, repeat=repeat)
+        results[name] = min(timings) / number * 1e6
+    return results
+
+
+def main():
+    results = run()
+    baseline = next(iter(results.values()))
+    print(f"{'case':<48} {'us/hotel':>10} {'speedup':>9}")
+    for name, micros in results.items():
+        print(f"{name:<48} {micros:>10.2f} {baseline / micros:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
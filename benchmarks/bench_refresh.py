@@ -0,0 +1,311 @@
+"""
+End-to-end refresh benchmark on synthetic catalogs served by a local stub
+supplier server. For each scale it times the fetch, parse, normalize, merge
+and store stages one after another, then full staged and pipelined refreshes,
+and records throughput, latency and peak memory.
+
+    python -m benchmarks.bench_refresh --hotels 1000,10000,100000 --output refresh.json
+    python -m benchmarks.bench_refresh --hotels 10000 --latency 0.2 --error-rate 0.1
+    python -m benchmarks.bench_refresh --hotels 10000 --compare refresh.json
+
+Stage latencies are per request for fetch and per batch of `--batch-size`
+records for the other stages. Peak memory is the tracemalloc peak of Python
+allocations, measured in a second pass so tracing does not skew the timings;
+`--no-memory` skips it.
+"""
+import argparse
+import gc
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from benchmarks.catalog_generator import CatalogSpec, generate_payloads
+from benchmarks.stub_server import StubSupplierServer
+
+REFRESH_MODES = ("staged", "pipelined")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+class Measurement:
+    """
+    Wall time, per-call latencies and, when tracing, the peak of Python allocations of one stage.
+    """
+
+    def __init__(self, trace: bool):
+        self.trace = trace
+        self.seconds = 0.0
+        self.latencies: List[float] = []
+        self.peak_bytes = 0
+
+    @contextmanager
+    def total(self):
+        if self.trace:
+            tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.seconds = time.perf_counter() - started
+            if self.trace:
+                self.peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+    @contextmanager
+    def call(self):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.latencies.append(time.perf_counter() - started)
+
+    def report(self, records: int, **extra) -> dict:
+        report = {
+            "seconds": round(self.seconds, 4),
+            "records": records,
+            "records_per_second": round(records / self.seconds, 1) if self.seconds else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(self.latencies, 50) * 1000, 3),
+                "p95": round(percentile(self.latencies, 95) * 1000, 3),
+                "max": round(max(self.latencies, default=0.0) * 1000, 3),
+            },
+            **extra,
+        }
+        if self.trace:
+            report["peak_mb"] = round(self.peak_bytes / 1e6, 2)
+        return report
+
+
+def _batches(items: list, size: int):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def run_stages(endpoints: Dict[str, str], batch_size: int, trace: bool = False) -> Dict[str, dict]:
+    """
+    Run the refresh stages one after another on fresh databases, measuring each.
+    """
+    from services.catalog import create_merger, create_normalizer, create_suppliers
+    from services.database import HotelDB, RawHotelDB
+    from utils.exceptions import SupplierException
+
+    suppliers = create_suppliers({"endpoint": endpoints})
+    normalizer, merger = create_normalizer(), create_merger()
+    raw_hotel_db, hotel_db = RawHotelDB(), HotelDB()
+    order = {name: position for position, name in enumerate(suppliers)}
+    results = {}
+
+    raw, failures = {}, 0
+    measurement = Measurement(trace)
+    with measurement.total():
+        for name, supplier in suppliers.items():
+            with measurement.call():
+                try:
+                    raw[name] = supplier.fetch_raw()
+                except SupplierException:
+                    raw[name] = []
+                    failures += 1
+    results["fetch"] = measurement.report(sum(map(len, raw.values())), failures=failures)
+
+    parsed = []
+    measurement = Measurement(trace)
+    with measurement.total():
+        for name, items in raw.items():
+            for batch in _batches(items, batch_size):
+                with measurement.call():
+                    parsed.extend(suppliers[name].parse_all(batch))
+    results["parse"] = measurement.report(len(parsed))
+    del raw
+
+    normalized = []
+    measurement = Measurement(trace)
+    with measurement.total():
+        for batch in _batches(parsed, batch_size):
+            with measurement.call():
+                normalized.extend(normalizer.normalize(batch))
+    results["normalize"] = measurement.report(len(normalized))
+    del parsed
+
+    grouped: Dict[str, list] = {}
+    for hotel in normalized:
+        grouped.setdefault(hotel.hotel_id, []).append(hotel)
+    merged = []
+    measurement = Measurement(trace)
+    with measurement.total():
+        for batch in _batches(list(grouped.values()), batch_size):
+            with measurement.call():
+                for records in batch:
+                    hotel = merger.merge(sorted(records, key=lambda record: order.get(record.source, len(order))))
+                    if hotel:
+                        merged.append(hotel)
+    results["merge"] = measurement.report(len(merged))
+
+    measurement = Measurement(trace)
+    with measurement.total():
+        for batch in _batches(normalized, batch_size):
+            with measurement.call():
+                raw_hotel_db.update_many(batch)
+        for batch in _batches(merged, batch_size):
+            with measurement.call():
+                hotel_db.update_many(batch)
+    results["store"] = measurement.report(len(normalized) + len(merged))
+    return results
+
+
+def run_refresh(endpoints: Dict[str, str], mode: str, trace: bool = False) -> dict:
+    """
+    Run a full refresh without checkpoints into fresh databases.
+    """
+    from configs.config import pipeline_config
+    from services.catalog import CatalogRefresher, create_merger, create_normalizer, create_suppliers
+    from services.database import HotelDB, RawHotelDB
+
+    pipeline = {key: value for key, value in pipeline_config.items() if key != "enabled"}
+    raw_hotel_db, hotel_db = RawHotelDB(), HotelDB()
+    refresher = CatalogRefresher(create_suppliers({"endpoint": endpoints}), create_normalizer(), create_merger(),
+                                 raw_hotel_db, hotel_db, pipeline if mode == "pipelined" else None)
+    measurement = Measurement(trace)
+    with measurement.total():
+        refresher.refresh_all()
+    report = measurement.report(hotel_db.length(), raw_records=raw_hotel_db.length())
+    # One call, so a latency distribution says nothing here
+    del report["latency_ms"]
+    return report
+
+
+def run_scale(spec: CatalogSpec, args) -> dict:
+    started = time.perf_counter()
+    payloads = generate_payloads(spec)
+    generated = time.perf_counter() - started
+    print(f"{spec.hotels} hotels: generated {sum(map(len, payloads.values())) / 1e6:.1f} MB in {generated:.1f}s",
+          file=sys.stderr)
+
+    server = StubSupplierServer(payloads, latency=args.latency, jitter=args.jitter,
+                                error_rate=args.error_rate, malformed_rate=args.malformed_rate, seed=spec.seed)
+    with server:
+        endpoints = server.endpoints()
+        gc.collect()
+        stages = run_stages(endpoints, args.batch_size)
+        refresh = {}
+        for mode in REFRESH_MODES:
+            gc.collect()
+            refresh[mode] = run_refresh(endpoints, mode)
+
+        if args.memory:
+            gc.collect()
+            for stage, traced in run_stages(endpoints, args.batch_size, trace=True).items():
+                stages[stage]["peak_mb"] = traced["peak_mb"]
+            for mode in REFRESH_MODES:
+                gc.collect()
+                refresh[mode]["peak_mb"] = run_refresh(endpoints, mode, trace=True)["peak_mb"]
+
+    return {
+        "hotels": spec.hotels,
+        "overlap": spec.overlap,
+        "duplication": spec.duplication,
+        "payload_mb": {name: round(len(body) / 1e6, 2) for name, body in payloads.items()},
+        "stub_requests": server.requests,
+        "injected_faults": server.injected,
+        "stages": stages,
+        "refresh": refresh,
+    }
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _rows(results: dict):
+    """
+    Yield (hotels, name, report) for every stage and refresh mode in a result file.
+    """
+    for run in results["runs"]:
+        for stage, report in run["stages"].items():
+            yield run["hotels"], stage, report
+        for mode, report in run["refresh"].items():
+            yield run["hotels"], f"refresh ({mode})", report
+
+
+def _cell(value: Optional[float], width: int, precision: int) -> str:
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}.{precision}f}"
+
+
+def print_results(results: dict, baseline: Optional[dict] = None) -> None:
+    previous = {(hotels, name): report for hotels, name, report in _rows(baseline)} if baseline else {}
+    header = f"{'hotels':>8} {'stage':<20} {'seconds':>9} {'records/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'peak MB':>9}"
+    print(header + (f" {'before s':>9} {'change':>8}" if baseline else ""))
+    for hotels, name, report in _rows(results):
+        latency = report.get("latency_ms", {})
+        line = (f"{hotels:>8} {name:<20} {report['seconds']:>9.3f} {report['records_per_second']:>11.0f} "
+                f"{_cell(latency.get('p50'), 9, 2)} {_cell(latency.get('p95'), 9, 2)} "
+                f"{_cell(report.get('peak_mb'), 9, 1)}")
+        before = previous.get((hotels, name))
+        if before is not None:
+            change = (report["seconds"] - before["seconds"]) / before["seconds"] if before["seconds"] else 0.0
+            line += f" {before['seconds']:>9.3f} {change:>+8.1%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark refreshes end to end on synthetic catalogs.")
+    parser.add_argument("--hotels", type=str, default="1000,10000", help="Comma-separated catalog sizes.")
+    parser.add_argument("--overlap", type=float, default=CatalogSpec.overlap)
+    parser.add_argument("--duplication", type=float, default=CatalogSpec.duplication)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every supplier response waits.")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of supplier requests failing with a 500.")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Share of supplier requests answered with a truncated body.")
+    parser.add_argument("--batch-size", type=int, default=500, help="Records per timed batch within a stage.")
+    parser.add_argument("--memory", action=argparse.BooleanOptionalAction, default=True,
+                        help="Measure peak memory in a second, traced pass.")
+    parser.add_argument("--output", type=str, default=None, help="Write the results to this JSON file.")
+    parser.add_argument("--compare", type=str, default=None, help="A previous results file to compare against.")
+    args = parser.parse_args()
+
+    results = {
+        "meta": {
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "runs": [],
+    }
+    for hotels in (int(value) for value in args.hotels.split(",")):
+        spec = CatalogSpec(hotels, args.overlap, args.duplication, args.seed)
+        results["runs"].append(run_scale(spec, args))
+    # ru_maxrss is in KiB on Linux
+    results["meta"]["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Startup cost of the CLI: import time per module (from `python -X importtime`)
+and wall time of invocations that do not refresh the catalog.
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --top 30 --output startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only the refresh path should load
+REFRESH_MODULES = ["requests", "suppliers", "services.catalog", "services.normalizer", "services.merger",
+                   "services.pipeline"]
+
+# Import statements timed module by module; the query path is what a query without a refresh loads
+IMPORTS = {
+    "main": "import main",
+    "query path": "import main, api, database.hotel",
+}
+
+INVOCATIONS = {
+    "import main": [sys.executable, "-c", "import main"],
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    # The query path without a refresh: loads the API and database and answers one query
+    "main.py --no-refresh iJhz 5432": [sys.executable, "main.py", "--no-refresh", "iJhz", "5432"],
+}
+
+
+def import_times(statement: str) -> Dict[str, dict]:
+    """
+    Run an import statement in a fresh interpreter and return each module's self and cumulative import time in ms.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        times[name.strip()] = {
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        }
+    return times
+
+
+def wall_time(command: List[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, capture_output=True, check=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def import_report(statement: str, repeat: int, top: int) -> dict:
+    runs = [import_times(statement) for _ in range(repeat)]
+    # Median over runs smooths out filesystem cache effects
+    modules = {
+        name: {
+            "self_ms": statistics.median(run[name]["self_ms"] for run in runs if name in run),
+            "cumulative_ms": statistics.median(run[name]["cumulative_ms"] for run in runs if name in run),
+        }
+        for name in runs[0]
+    }
+    slowest = sorted(modules.items(), key=lambda item: item[1]["self_ms"], reverse=True)[:top]
+    return {
+        "total_ms": sum(timing["self_ms"] for timing in modules.values()),
+        "modules_loaded": len(modules),
+        "refresh_modules_loaded": [name for name in REFRESH_MODULES if name in modules],
+        "slowest_modules": dict(slowest),
+    }
+
+
+def run(repeat: int = 5, top: int = 15) -> dict:
+    return {
+        "imports": {name: import_report(statement, repeat, top) for name, statement in IMPORTS.items()},
+        "invocations_ms": {name: wall_time(command, repeat) for name, command in INVOCATIONS.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI startup and import time.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to report.")
+    parser.add_argument("--output", type=str, default=None, help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.top)
+    for name, report in results["imports"].items():
+        print(f"{name}: {report['total_ms']:.1f} ms across {report['modules_loaded']} modules, "
+              f"refresh modules loaded: {', '.join(report['refresh_modules_loaded']) or 'none'}")
+        print(f"{'module':<48} {'self ms':>9} {'cumul. ms':>10}")
+        for module, timing in report["slowest_modules"].items():
+            print(f"{module:<48} {timing['self_ms']:>9.2f} {timing['cumulative_ms']:>10.2f}")
+        print()
+    print(f"{'invocation':<48} {'wall ms':>9}")
+    for name, millis in results["invocations_ms"].items():
+        print(f"{name:<48} {millis:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
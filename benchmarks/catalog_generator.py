@@ -0,0 +1,258 @@
+"""
+Synthetic supplier catalogs shaped like the Acme, Patagonia and Paperflies
+endpoints, at any scale. Output is deterministic for a given seed.
+
+    python -m benchmarks.catalog_generator --hotels 100000 --output data/synthetic
+    python -m benchmarks.catalog_generator --hotels 1000000 --overlap 0.8 --duplication 0.05
+
+`overlap` is the share of hotels listed by more than one supplier and
+`duplication` the share of records a supplier sends twice. Every hotel is
+listed by at least one supplier.
+"""
+import argparse
+import json
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Tuple
+
+SUPPLIER_NAMES = ("acme", "patagonia", "paperflies")
+
+CITIES = [
+    ("Singapore", "SG", "Singapore"),
+    ("Tokyo", "JP", "Japan"),
+    ("Bangkok", "TH", "Thailand"),
+    ("Ho Chi Minh City", "VN", "Vietnam"),
+    ("Kuala Lumpur", "MY", "Malaysia"),
+    ("Jakarta", "ID", "Indonesia"),
+    ("Seoul", "KR", "South Korea"),
+    ("Sydney", "AU", "Australia"),
+    ("London", "GB", "United Kingdom"),
+    ("Paris", "FR", "France"),
+]
+
+NAME_PREFIXES = ["Grand", "Royal", "Beach", "Park", "Harbour", "Garden", "City", "Riverside", "Sunset", "Imperial"]
+NAME_KINDS = ["Hotel", "Villas", "Resort", "Suites", "Inn", "Residences", "Lodge"]
+STREETS = ["Sentosa Gateway", "Nanson Road", "Nishi-Shinjuku", "Orchard Road", "Sukhumvit Road", "Le Loi Street",
+           "Jalan Ampang", "George Street", "Baker Street", "Rue de Rivoli"]
+
+GENERAL_AMENITIES = ["outdoor pool", "indoor pool", "business center", "childcare", "wifi", "dry cleaning",
+                     "breakfast", "parking", "bar", "gym", "spa", "concierge", "restaurant", "airport shuttle"]
+ROOM_AMENITIES = ["aircon", "tv", "coffee machine", "kettle", "hair dryer", "iron", "bathtub", "minibar",
+                  "safe", "balcony"]
+# Acme and Patagonia send amenities in their own spelling; the normalizer is expected to clean these up
+ACME_SPELLING = {"outdoor pool": "Pool", "indoor pool": "Pool", "business center": "BusinessCenter",
+                 "wifi": "WiFi ", "dry cleaning": "DryCleaning", "breakfast": " Breakfast", "bar": "Bar",
+                 "bathtub": "BathTub", "aircon": "Aircon", "parking": "Parking"}
+PATAGONIA_SPELLING = {"tv": "Tv", "bathtub": "Tub", "coffee machine": "Coffee machine", "hair dryer": "Hair dryer"}
+
+IMAGE_CAPTIONS = {
+    "rooms": ["Double room", "Suite", "Bathroom", "Twin room", "Deluxe room"],
+    "site": ["Front", "Restaurant", "Lobby", "Garden"],
+    "amenities": ["RWS", "Pool", "Gym", "Spa"],
+}
+
+BOOKING_CONDITIONS = [
+    "All children are welcome. One child under 12 years stays free of charge when using existing beds.",
+    "Pets are not allowed.",
+    "WiFi is available in all areas and is free of charge.",
+    "Free private parking is possible on site (reservation is not needed).",
+    "Guests must be 18 years of age to check in.",
+    "Cancellation is free up to 48 hours before arrival.",
+]
+
+DESCRIPTION_SENTENCES = [
+    "Surrounded by tropical gardens, these upscale villas are a short walk from the train station.",
+    "This 5 star hotel is located on the coastline.",
+    "Enjoy sophisticated waterfront living in the heart of the city.",
+    "Rooms feature floor-to-ceiling windows with views of the skyline.",
+    "The hotel offers an outdoor pool, a fitness centre and three restaurants.",
+    "Guests can relax at the spa or take the free shuttle to the shopping district.",
+]
+
+_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+# Coprime with 62, so scaling the index by it is a bijection and IDs stay unique but look unordered
+_ID_MULTIPLIER = 2_654_435_761
+
+
+@dataclass(frozen=True)
+class CatalogSpec:
+    hotels: int
+    overlap: float = 0.6
+    duplication: float = 0.02
+    seed: int = 0
+
+
+def hotel_id(index: int, width: int = 6) -> str:
+    value = (index * _ID_MULTIPLIER) % (len(_ID_ALPHABET) ** width)
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, len(_ID_ALPHABET))
+        digits.append(_ID_ALPHABET[digit])
+    return "".join(reversed(digits))
+
+
+def suppliers_of(spec: CatalogSpec, rng: random.Random) -> Tuple[str, ...]:
+    """
+    The suppliers that list a hotel: one for most, two or three for a share `overlap` of them.
+    """
+    count = rng.choice((2, 3)) if rng.random() < spec.overlap else 1
+    return tuple(sorted(rng.sample(SUPPLIER_NAMES, count), key=SUPPLIER_NAMES.index))
+
+
+def base_hotel(spec: CatalogSpec, index: int, rng: random.Random) -> dict:
+    """
+    The true record of a hotel, which each supplier renders in its own shape and with its own gaps.
+    """
+    destination = rng.randrange(max(spec.hotels // 50, 1))
+    city, country_code, country = CITIES[destination % len(CITIES)]
+    hid = hotel_id(index)
+    images = {
+        category: [{"link": f"https://d2ey9sqrvkqdfs.cloudfront.net/{hid}/{category[0]}{n}.jpg",
+                    "caption": rng.choice(captions)} for n in range(rng.randint(0, 4))]
+        for category, captions in IMAGE_CAPTIONS.items()
+    }
+    return {
+        "id": hid,
+        "destination_id": 1000 + destination,
+        "name": f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_KINDS)} {city}",
+        "address": f"{rng.randint(1, 300)} {rng.choice(STREETS)}",
+        "postal_code": f"{rng.randint(10000, 999999):06d}",
+        "city": city,
+        "country_code": country_code,
+        "country": country,
+        "latitude": round(rng.uniform(-60, 60), 6),
+        "longitude": round(rng.uniform(-180, 180), 6),
+        "description": " ".join(rng.sample(DESCRIPTION_SENTENCES, rng.randint(1, 3))),
+        "general": rng.sample(GENERAL_AMENITIES, rng.randint(2, 8)),
+        "room": rng.sample(ROOM_AMENITIES, rng.randint(1, 6)),
+        "images": images,
+        "booking_conditions": rng.sample(BOOKING_CONDITIONS, rng.randint(0, 4)),
+    }
+
+
+def to_acme(hotel: dict, rng: random.Random) -> dict:
+    missing_coordinates = rng.random() < 0.2
+    return {
+        "Id": hotel["id"],
+        "DestinationId": hotel["destination_id"],
+        "Name": hotel["name"],
+        "Latitude": "" if missing_coordinates else hotel["latitude"],
+        "Longitude": "" if missing_coordinates else hotel["longitude"],
+        "Address": f" {hotel['address']} ",
+        "City": hotel["city"],
+        "Country": hotel["country_code"],
+        "PostalCode": hotel["postal_code"],
+        "Description": f"  {hotel['description']}",
+        "Facilities": [ACME_SPELLING.get(amenity, amenity.title()) for amenity in hotel["general"] + hotel["room"][:1]],
+    }
+
+
+def to_patagonia(hotel: dict, rng: random.Random) -> dict:
+    images = hotel["images"]
+    return {
+        "id": hotel["id"],
+        "destination": hotel["destination_id"],
+        "name": hotel["name"],
+        "lat": hotel["latitude"],
+        "lng": hotel["longitude"],
+        "address": f"{hotel['address']}, {hotel['postal_code']}",
+        "info": None if rng.random() < 0.15 else hotel["description"],
+        "amenities": None if rng.random() < 0.1 else [PATAGONIA_SPELLING.get(amenity, amenity.capitalize())
+                                                       for amenity in hotel["room"]],
+        "images": {
+            "rooms": [{"url": image["link"], "description": image["caption"]} for image in images["rooms"]],
+            "amenities": [{"url": image["link"], "description": image["caption"]} for image in images["amenities"]],
+        },
+    }
+
+
+def to_paperflies(hotel: dict, rng: random.Random) -> dict:
+    images = hotel["images"]
+    return {
+        "hotel_id": hotel["id"],
+        "destination_id": hotel["destination_id"],
+        "hotel_name": hotel["name"] if rng.random() > 0.1 else hotel["name"].split(" ")[0],
+        "location": {"address": f"{hotel['address']}, {hotel['city']} {hotel['postal_code']}",
+                     "country": hotel["country"]},
+        "details": hotel["description"],
+        "amenities": {"general": hotel["general"], "room": hotel["room"]},
+        "images": {
+            "rooms": [{"link": image["link"], "caption": image["caption"]} for image in images["rooms"]],
+            "site": [{"link": image["link"], "caption": image["caption"]} for image in images["site"]],
+        },
+        "booking_conditions": hotel["booking_conditions"],
+    }
+
+
+RENDERERS = {
+    "acme": to_acme,
+    "patagonia": to_patagonia,
+    "paperflies": to_paperflies,
+}
+
+
+def generate_records(spec: CatalogSpec) -> Iterator[Tuple[str, dict]]:
+    """
+    Stream (supplier, record) pairs, hotel by hotel. A share `duplication` of each supplier's records is sent twice.
+    """
+    for index in range(spec.hotels):
+        # One generator per hotel, so a hotel's records do not depend on how the others were drawn
+        rng = random.Random(spec.seed * 1_000_000_007 + index)
+        suppliers = suppliers_of(spec, rng)
+        hotel = base_hotel(spec, index, rng)
+        for supplier in suppliers:
+            record = RENDERERS[supplier](hotel, rng)
+            yield supplier, record
+            if rng.random() < spec.duplication:
+                yield supplier, record
+
+
+def generate_payloads(spec: CatalogSpec) -> Dict[str, bytes]:
+    """
+    Build every supplier's response body as a JSON array, holding records only as encoded bytes.
+    """
+    parts = {supplier: [] for supplier in SUPPLIER_NAMES}
+    for supplier, record in generate_records(spec):
+        parts[supplier].append(json.dumps(record, separators=(",", ":")).encode())
+    return {supplier: b"[" + b",".join(records) + b"]" for supplier, records in parts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic supplier catalogs.")
+    parser.add_argument("--hotels", type=int, default=10000)
+    parser.add_argument("--overlap", type=float, default=CatalogSpec.overlap,
+                        help="Share of hotels listed by more than one supplier.")
+    parser.add_argument("--duplication", type=float, default=CatalogSpec.duplication,
+                        help="Share of records a supplier sends twice.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default="data/synthetic",
+                        help="Directory to write <supplier>.json files to.")
+    args = parser.parse_args()
+
+    spec = CatalogSpec(args.hotels, args.overlap, args.duplication, args.seed)
+    os.makedirs(args.output, exist_ok=True)
+    started = time.perf_counter()
+    paths = {supplier: os.path.join(args.output, f"{supplier}.json") for supplier in SUPPLIER_NAMES}
+    files = {supplier: open(path, "wb") for supplier, path in paths.items()}
+    counts = dict.fromkeys(SUPPLIER_NAMES, 0)
+    try:
+        for supplier, record in generate_records(spec):
+            files[supplier].write(b"," if counts[supplier] else b"[")
+            files[supplier].write(json.dumps(record, separators=(",", ":")).encode())
+            counts[supplier] += 1
+        for supplier, f in files.items():
+            f.write(b"]" if counts[supplier] else b"[]")
+    finally:
+        for f in files.values():
+            f.close()
+
+    print(f"{'supplier':<12} {'records':>10} {'MB':>9}")
+    for supplier, path in paths.items():
+        print(f"{supplier:<12} {counts[supplier]:>10} {os.path.getsize(path) / 1e6:>9.1f}")
+    print(f"generated in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+from models.hotel import Hotel
+
+# A fully populated merged hotel, shaped like the output of the refresh pipeline
+SAMPLE_HOTEL = {
+    "hotel_id": "iJhz",
+    "destination_id": 5432,
+    "name": "Beach Villas Singapore",
+    "description": "Surrounded by tropical gardens, these upscale villas in elegant Colonial-style buildings "
+                   "are part of the Resorts World Sentosa complex and a 2-minute walk from the Waterfront train station.",
+    "location": {
+        "address": "8 Sentosa Gateway, Beach Villas, 098269",
+        "city": "Singapore",
+        "country": "SG",
+        "postal_code": "098269",
+        "latitude": 1.264751,
+        "longitude": 103.824006
+    },
+    "amenities": {
+        "general": ["outdoor pool", "indoor pool", "business center", "childcare", "wifi", "dry cleaning", "breakfast"],
+        "room": ["aircon", "tv", "coffee machine", "kettle", "hair dryer", "iron", "bathtub"]
+    },
+    "images": {
+        "rooms": [
+            {"link": "https://d2ey9sqrvkqdfs.cloudfront.net/0qZF/2.jpg", "description": "double room"},
+            {"link": "https://d2ey9sqrvkqdfs.cloudfront.net/0qZF/3.jpg", "description": "double room"},
+            {"link": "https://d2ey9sqrvkqdfs.cloudfront.net/0qZF/4.jpg", "description": "bathroom"}
+        ],
+        "site": [
+            {"link": "https://d2ey9sqrvkqdfs.cloudfront.net/0qZF/1.jpg", "description": "front"}
+        ],
+        "amenities": [
+            {"link": "https://d2ey9sqrvkqdfs.cloudfront.net/0qZF/0.jpg", "description": "rws"}
+        ]
+    },
+    "booking_conditions": [
+        "All children are welcome. One child under 12 years stays free of charge when using existing beds.",
+        "Pets are not allowed.",
+        "WiFi is available in all areas and is free of charge.",
+        "Free private parking is possible on site (reservation is not needed)."
+    ],
+    "source": "merged"
+}
+
+
+def sample_hotel(hotel_id: str = None) -> Hotel:
+    """
+    Build a sample hotel, optionally overriding its ID.
+    """
+    data = dict(SAMPLE_HOTEL)
+    if hotel_id is not None:
+        data["hotel_id"] = hotel_id
+    return Hotel(**data)
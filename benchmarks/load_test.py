@@ -0,0 +1,148 @@
+"""
+Drive the HTTP server with concurrent keep-alive connections and report
+requests/sec and latency percentiles.
+
+    python server.py &
+    python -m benchmarks.load_test --path '/hotel?hotel_id=iJhz' --path '/hotels?limit=50'
+
+Use --self-host N to start the built-in server in-process with N sample hotels.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import time
+from collections import Counter
+from typing import List, Optional
+
+
+async def read_response(reader: asyncio.StreamReader) -> int:
+    """
+    Read one HTTP/1.1 response and return its status code.
+    """
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head[:-4].split(b"\r\n")
+    status = int(lines[0].split(b" ", 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get(b"transfer-encoding") == b"chunked":
+        while True:
+            size = int((await reader.readuntil(b"\r\n"))[:-2], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    else:
+        await reader.readexactly(int(headers.get(b"content-length", b"0")))
+    return status
+
+
+async def run_connection(host: str, port: int, paths, requests: int,
+                         latencies: List[float], errors: List[int]):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for path in itertools.islice(paths, requests):
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode()
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def run_load_test(host: str, port: int, paths: List[str], connections: int, requests: int) -> dict:
+    latencies: List[float] = []
+    errors: List[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        run_connection(host, port, itertools.cycle(paths[i % len(paths):] + paths[:i % len(paths)]),
+                       requests, latencies, errors)
+        for i in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        # Shed requests (429/503) show up here when admission control is rejecting load
+        'errors_by_status': {str(status): count for status, count in sorted(Counter(errors).items())},
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50) * 1000, 3),
+            'p90': round(percentile(latencies, 90) * 1000, 3),
+            'p99': round(percentile(latencies, 99) * 1000, 3),
+            'max': round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def start_local_server(hotels: int) -> int:
+    """
+    Start the built-in server on a background thread with sample hotels and return its port.
+    """
+    from api import hotel_api
+    from api.services.asgi import HotelASGIApp
+    from api.services.server import HTTPServer
+    from benchmarks.fixtures import sample_hotel
+    from services.database import HotelDB
+
+    db = HotelDB()
+    db.update_many([sample_hotel(f"h{i:07d}") for i in range(hotels)])
+    server = HTTPServer(HotelASGIApp(hotel_api, db), "127.0.0.1", 0)
+    ready = threading.Event()
+
+    def run():
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(server.start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return server.port
+
+
+def parse_arguments(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Load test the hotel HTTP server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="Request path, may be repeated. Defaults to a single hotel lookup.")
+    parser.add_argument("--connections", type=int, default=32, help="Concurrent keep-alive connections.")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection.")
+    parser.add_argument("--self-host", type=int, default=0, metavar="HOTELS",
+                        help="Start an in-process server with this many sample hotels.")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_arguments(argv)
+    port = args.port
+    paths = args.paths
+    if args.self_host:
+        port = start_local_server(args.self_host)
+        paths = paths or ["/hotel?hotel_id=h0000000", "/hotels?limit=20", "/hotels?limit=20&fields=hotel_id,name"]
+    paths = paths or ["/hotel?hotel_id=iJhz"]
+
+    result = asyncio.run(run_load_test(args.host, port, paths, args.connections, args.requests))
+    print(json.dumps(result, indent=4))
+
+
+if __name__ == "__main__":
+    main()
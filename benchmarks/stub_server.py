@@ -0,0 +1,162 @@
+"""
+A local HTTP server that stands in for the supplier endpoints, serving
+synthetic catalogs with configurable latency and injected failures.
+
+    python -m benchmarks.stub_server --hotels 100000 --port 8100 --latency 0.2 --error-rate 0.1
+
+Suppliers are served at /suppliers/<name>. Point `supplier_config['endpoint']`
+at them, or use `StubSupplierServer.endpoints()` in-process.
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from benchmarks.catalog_generator import CatalogSpec, generate_payloads
+
+
+class StubSupplierServer:
+    """
+    Serves pre-encoded supplier payloads. Every response waits `latency`
+    seconds plus up to `jitter` more. A share `error_rate` of requests fail
+    with a 500 and a share `malformed_rate` get a truncated, unparseable body.
+    """
+
+    def __init__(self,
+                 payloads: Dict[str, bytes],
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 malformed_rate: float = 0.0,
+                 seed: int = 0):
+        self.payloads = payloads
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.requests = 0
+        self.injected = {"error": 0, "malformed": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def endpoints(self) -> Dict[str, str]:
+        """
+        Supplier endpoints in the shape of `supplier_config['endpoint']`.
+        """
+        host = self._server.server_address[0]
+        return {name: f"http://{host}:{self.port}/suppliers/{name}" for name in self.payloads}
+
+    def start(self) -> "StubSupplierServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-suppliers", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """
+        Serve on the calling thread until interrupted.
+        """
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _fault(self) -> Optional[str]:
+        with self._lock:
+            self.requests += 1
+            roll = self._rng.random()
+            delay = self.latency + self._rng.random() * self.jitter
+            fault = None
+            if roll < self.error_rate:
+                fault = "error"
+            elif roll < self.error_rate + self.malformed_rate:
+                fault = "malformed"
+            if fault:
+                self.injected[fault] += 1
+        if delay:
+            time.sleep(delay)
+        return fault
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                name = self.path.rstrip("/").rsplit("/", 1)[-1]
+                body = stub.payloads.get(name) if self.path.startswith("/suppliers/") else None
+                if body is None:
+                    self._send(404, b'{"detail":"Not Found"}')
+                    return
+                fault = stub._fault()
+                if fault == "error":
+                    self._send(500, b'{"detail":"Injected failure"}')
+                elif fault == "malformed":
+                    self._send(200, body[:len(body) // 2])
+                else:
+                    self._send(200, body)
+
+            def _send(self, status: int, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic supplier catalogs over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--hotels", type=int, default=10000)
+    parser.add_argument("--overlap", type=float, default=CatalogSpec.overlap)
+    parser.add_argument("--duplication", type=float, default=CatalogSpec.duplication)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every response waits.")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Up to this many extra seconds per response.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500.")
+    parser.add_argument("--malformed-rate", type=float, default=0.0,
+                        help="Share of requests answered with a truncated body.")
+    args = parser.parse_args()
+
+    payloads = generate_payloads(CatalogSpec(args.hotels, args.overlap, args.duplication, args.seed))
+    server = StubSupplierServer(payloads, args.host, args.port, args.latency, args.jitter,
+                                args.error_rate, args.malformed_rate, args.seed)
+    for name, endpoint in server.endpoints().items():
+        print(f"{name:<12} {endpoint}  ({len(payloads[name]) / 1e6:.1f} MB)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
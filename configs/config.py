@@ -29,9 +29,149 @@ merger_config = {
     'source_attr_name': 'source'  # Attribute name to indicate the data's source
 }
 
+# Configuration for the refresh pipeline
+pipeline_config = {
+    # Stream full refreshes through fetch, normalize and merge workers instead of running the stages in turn
+    'enabled': True,
+    'chunk_size': 50,  # Records per chunk passed between stages
+    'queue_size': 8,  # Chunks buffered between stages before the upstream stage waits
+    'normalize_workers': 2,
+}
+
+# Configuration for refresh checkpoints
+checkpoint_config = {
+    # Checkpoint fetched and normalized data during the server's full refreshes so a failed run can be resumed;
+    # one-shot CLI queries never checkpoint
+    'enabled': True,
+    'root': 'data/runs',  # One subdirectory per refresh run
+    'keep_runs': 3,  # Completed runs kept for inspection; older ones are removed
+    'max_resume_age': 3600,  # Seconds after which an unfinished run is discarded instead of resumed
+    'batch_size': 50,  # Hotels per normalized batch when the pipeline is disabled
+}
+
+# Configuration for the background refresh scheduler
+scheduler_config = {
+    'enabled': True,
+    # Seconds between background refreshes of each supplier in service mode; the starting point for adaptive cadence
+    'intervals': {
+        'acme': 300,
+        'patagonia': 300,
+        'paperflies': 300
+    },
+    'retry_interval': 30,  # First retry delay after a failed refresh, doubled on each further failure
+    'jitter': 0.1,  # Random spread applied to intervals so suppliers do not refresh in lockstep
+    # 'adaptive' tunes each supplier's interval to how often its data changes; 'fixed' keeps the intervals above
+    'cadence': 'adaptive',
+    'smoothing': 0.5,  # Weight of the latest change ratio in its moving average
+    'adaptive': {
+        'min_interval': 60,
+        'max_interval': 3600,
+        'low_change_ratio': 0.01,  # At or below this, back off
+        'high_change_ratio': 0.1,  # At or above this, refresh sooner
+        'speedup': 0.5,  # Interval multiplier for volatile suppliers
+        'backoff': 1.5,  # Interval multiplier for stable suppliers
+        # Per-supplier overrides of min_interval/max_interval, e.g. {'acme': {'min_interval': 30}}
+        'bounds': {},
+    },
+}
+
 # Configuration for logger
 logger_config = {
     'log_level': 'INFO',
     'log_dir': 'logs',
     'enable_console_logging': False,
+    'format': 'json',  # 'json' writes one JSON object per line to the log file; 'text' writes plain lines
+    # Records per second, per call site, below WARNING; bursts above `burst` are dropped and counted
+    'rate_limit': {
+        'enabled': True,
+        'rate': 50,
+        'burst': 500,
+    },
+}
+
+# Configuration for the hotel database
+database_config = {
+    # 'memory' keeps every hotel resident; 'tiered' keeps a bounded hot set in memory
+    # and pages the rest of the catalog to a local on-disk store
+    'backend': 'memory',
+    'tiered': {
+        'cold_path': 'data/hotels.sqlite3',
+        'hot_max_items': 10000,
+        'hot_max_bytes': 64 * 1024 * 1024,  # Budget for the serialized size of hot hotels
+        'eviction_policy': 'lru',  # 'lru' or 'lfu'
+        'admission_policy': 'always',  # 'always' or 'frequency'
+        'admission_threshold': 2,  # Misses before a hotel is admitted with 'frequency'
+    },
+}
+
+# Configuration for the hotel API
+api_config = {
+    'coalesce_requests': True,  # Share one computation between concurrent identical requests
+    'max_batch_size': 1000,  # Most hotel IDs accepted by one batch request
+    'max_field_sets': 256,  # Distinct `fields` selections whose validated field sets are kept
+}
+
+# Configuration for response compression
+compression_config = {
+    'enabled': True,
+    'min_size': 1024,  # Smaller bodies are sent uncompressed
+    # Codecs in order of preference; brotli and zstd are used when their modules are installed
+    'preference': ['br', 'zstd', 'gzip'],
+    'levels': {'gzip': 6, 'br': 5, 'zstd': 3},
+    'max_items': 1024,  # Compressed variants kept in memory
+    'max_bytes': 64 * 1024 * 1024,
+}
+
+# Configuration for admission control and load shedding
+admission_config = {
+    'enabled': True,
+    # Limits applied to every route unless overridden below
+    'default': {
+        'max_concurrency': 8,  # Requests running at once
+        'max_queue': 64,  # Requests waiting for a slot; more are rejected with 429
+        'queue_timeout': 1.0,  # Longest queue wait in seconds; longer expected waits are rejected with 503
+    },
+    'routes': {
+        '/hotels': {'max_concurrency': 4, 'max_queue': 32},
+    },
+}
+
+# Configuration for the command line
+cli_config = {
+    'batch_workers': 4,  # Threads answering queries in --batch mode
+    'batch_window': 256,  # Batch queries in flight at once; results are written in input order
+}
+
+# Configuration for the HTTP server
+server_config = {
+    'host': '127.0.0.1',
+    'port': 8000,
+    'workers': 8,  # Threads running route handlers
+    'keep_alive_timeout': 5.0,  # Seconds an idle keep-alive connection stays open
+    'max_header_size': 16 * 1024,
+    'max_body_size': 64 * 1024,  # Larger request bodies are refused with 413; the API only serves GET and HEAD
+    'stream_chunk_size': 64 * 1024,  # Bytes of a streamed body encoded per hop to the worker threads
+    'stats_path': '/_stats',  # Serves admission, coalescing and compression counters
+    'metrics_path': '/metrics',  # Serves the metrics registry as Prometheus text, or JSON with ?format=json
+}
+
+# Configuration for the profiler
+profile_config = {
+    'output_dir': 'profiles',  # One timestamped subdirectory per profiled run
+    'interval': 0.001,  # Seconds between stack samples for the collapsed-stack output
+    'memory': False,  # Trace allocations with tracemalloc: net memory per stage and allocation sites of its first run
+    'memory_frames': 1,  # Frames kept per traced allocation
+    'top': 30,  # Functions and allocation sites listed in the text reports
+}
+
+# Configuration for metrics
+metrics_config = {
+    'prefix': 'hotels_',  # Prepended to every metric name
+    # Upper bounds in seconds of histogram buckets unless a metric sets its own
+    'buckets': (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+}
+
+# Configuration for image URL canonicalisation
+url_config = {
+    'cache_size': 65536,  # Distinct raw image URLs whose canonical form is remembered
 }
@@ -1,4 +1,32 @@
-from services.database import HotelDB, RawHotelDB
+from services.database import HotelDB, RawHotelDB, TieredHotelDB
+from services.cache import HotCache, create_eviction_policy, create_admission_policy
+from configs.config import database_config
+from utils.metrics import metrics
+
+
+def create_hotel_db():
+    """
+    Build the hotel database selected by the configured backend.
+    """
+    if database_config['backend'] != 'tiered':
+        return HotelDB()
+
+    # Only the tiered backend needs the SQLite store
+    from services.storage import DiskHotelStore
+
+    tiered_config = database_config['tiered']
+    admission_kwargs = {}
+    if tiered_config['admission_policy'] == 'frequency':
+        admission_kwargs['threshold'] = tiered_config['admission_threshold']
+
+    hot_cache = HotCache(
+        max_items=tiered_config['hot_max_items'],
+        max_bytes=tiered_config['hot_max_bytes'],
+        eviction=create_eviction_policy(tiered_config['eviction_policy']),
+        admission=create_admission_policy(tiered_config['admission_policy'], **admission_kwargs)
+    )
+    return TieredHotelDB(DiskHotelStore(tiered_config['cold_path']), hot_cache)
+
 
 # Initialize the raw hotel database
 # This database is designed to store raw hotel data categorized by hotel ID and source.
@@ -6,4 +34,13 @@ raw_hotel_db = RawHotelDB()
 
 # Initialize the hotel database
 # This database holds processed or merged hotel data, indexed by hotel ID.
-hotel_db = HotelDB()
+hotel_db = create_hotel_db()
+
+# Sizes are read from the databases when metrics are collected
+DB_HOTELS = metrics.gauge('db_hotels', 'Records held by each hotel database.', ['db'])
+DB_HOTELS.set_function(raw_hotel_db.length, db='raw')
+DB_HOTELS.set_function(hotel_db.length, db='hotels')
+if isinstance(hotel_db, TieredHotelDB):
+    HOT_CACHE = metrics.gauge('hot_cache', 'Occupancy and hit counts of the tiered backend\'s hot set.', ['stat'])
+    for stat in ('items', 'bytes', 'hits', 'misses', 'evictions', 'rejections'):
+        HOT_CACHE.set_function(lambda stat=stat: hotel_db.stats()['hot'][stat], stat=stat)
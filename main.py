@@ -1,134 +1,288 @@
-from suppliers import SupplierManager
-from services import HotelService
-from database import HotelDB
-from models.hotel import Hotel
-from api import hotel_api
-
-from suppliers.modules.acme import AcmeSupplier
-from suppliers.modules.patagonia import PatagoniaSupplier
-from suppliers.modules.paperflies import PaperfliesSupplier
-from services.normalizer import DataNormalizer
-from services.merger import DataMerger
-
-from services.normalizer import DescriptionNormalizer
-from services.normalizer import LocationNormalizer
-from services.normalizer import AmenitiesNormalizer
-from services.normalizer import ImagesNormalizer
-from services.normalizer import NameNormalizer
-from services.normalizer import BookingConditionsNormalizer
-
-from services.merger import DescriptionMerger
-from services.merger import LocationMerger
-from services.merger import AmenitiesMerger
-from services.merger import ImagesMerger
-from services.merger import NameMerger
-from services.merger import BookingConditionsMerger
-
-from utils.cleaner import HotelCleaner
-from utils.bias import HotelBias
-from utils.logger import logger
-from utils.output import pretty_hotel_output
-from utils.output import pretty_hotels_output
+import argparse
+import shlex
+import sys
 
-from database.hotel import raw_hotel_db, hotel_db
+from configs.config import cli_config
+from utils.logger import logger
 
-from configs.config import supplier_config, merger_config
+# The API, the databases and the refresh stack are imported by the code paths that use them,
+# so --help and argument errors return without loading Pydantic models or the HTTP client.
 
 def update_suppliers_data():
-    suppliers = {
-        "acme": AcmeSupplier(supplier_config['endpoint']['acme']),
-        "patagonia": PatagoniaSupplier(supplier_config['endpoint']['patagonia']),
-        "paperflies": PaperfliesSupplier(supplier_config['endpoint']['paperflies'])
-    }
+    from database.hotel import raw_hotel_db, hotel_db
+    # The refresh stack (suppliers, HTTP client, normalizers and mergers) is only imported when refreshing
+    from services.catalog import create_catalog_refresher
 
-    supplier_manager = SupplierManager(suppliers)
-    suppliers_data = supplier_manager.get_all_suppliers_data()
-
-    cleaner = HotelCleaner()
-    normalizers = {
-        "description": DescriptionNormalizer(cleaner),
-        "location": LocationNormalizer(cleaner),
-        "amenities": AmenitiesNormalizer(cleaner),
-        "images": ImagesNormalizer(cleaner),
-        "name": NameNormalizer(cleaner),
-        "booking_conditions": BookingConditionsNormalizer(cleaner)
-    }
+    create_catalog_refresher(raw_hotel_db, hotel_db).refresh_all()
+
+
+def write_output(output):
+    """
+    Write an encoded response to stdout, chunk by chunk if it is streamed.
+    """
+    if not output:
+        print(output)
+        return
+    if isinstance(output, bytes):
+        output = [output, b"\n"]
+    for chunk in output:
+        sys.stdout.buffer.write(chunk)
+    sys.stdout.flush()
+
+
+class QueryLineParser:
+    """
+    Parse one batch query line with the same arguments as the command line.
+    Raises ValueError instead of exiting when a line is invalid.
+    """
+
+    class _Parser(argparse.ArgumentParser):
+        def error(self, message):
+            raise ValueError(message)
+
+    def __init__(self):
+        self._parser = self._Parser(prog="query", add_help=False)
+        add_query_arguments(self._parser)
+
+    def __call__(self, line):
+        hotel_ids, destination_ids, options = query_params(self._parser.parse_args(shlex.split(line)))
+        return {"hotel_ids": hotel_ids, "destination_ids": destination_ids, **options}
+
+
+def add_query_arguments(parser, optional_ids=False):
+    """
+    Add the arguments describing one hotel query to a parser.
+    """
+    nargs = "?" if optional_ids else None
+    parser.add_argument(
+        "hotel_ids",
+        type=str,
+        nargs=nargs,
+        help="Comma-separated list of hotel IDs, or 'none' if no filtering by hotel ID is required.",
+    )
+    parser.add_argument(
+        "destination_ids",
+        type=str,
+        nargs=nargs,
+        help="Comma-separated list of destination IDs, or 'none' if no filtering by destination ID is required.",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="Maximum number of hotels per page. Results are returned with a next cursor when set.",
+    )
+    parser.add_argument(
+        "--cursor",
+        type=str,
+        default=None,
+        help="Cursor returned by the previous page.",
+    )
+    parser.add_argument(
+        "--include-total",
+        action="store_true",
+        help="Include the total number of matching hotels in paginated results.",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "ndjson", "pretty"],
+        default="json",
+        help="Output encoding: compact JSON, one hotel per line, or indented JSON for debugging.",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default=None,
+        help="Comma-separated list of fields to return, e.g. 'hotel_id,name,location.city'.",
+    )
+
+
+def query_params(args):
+    """
+    Turn parsed query arguments into hotel IDs, destination IDs and query options.
+    """
+    hotel_ids = args.hotel_ids.split(
+        ",") if args.hotel_ids.lower() != "none" else None
+    destination_ids = args.destination_ids.split(
+        ",") if args.destination_ids.lower() != "none" else None
 
-    bias = HotelBias(merger_config['bias_factors'])
-    mergers = {
-        "name": NameMerger(bias),
-        "description": DescriptionMerger(bias),
-        "location": LocationMerger(bias),
-        "amenities": AmenitiesMerger(bias),
-        "images": ImagesMerger(bias),
-        "booking_conditions": BookingConditionsMerger(bias)
+    options = {
+        "limit": args.limit,
+        "cursor": args.cursor,
+        "include_total": args.include_total,
+        "format": args.format,
+        "fields": args.fields.split(",") if args.fields else None
     }
-    
-    svc = HotelService(suppliers_data,
-                       DataNormalizer(normalizers),
-                       DataMerger(mergers, 
-                                  merger_config['source_attr_name'],
-                                  merger_config['unmerged_attrs']),
-                       raw_hotel_db)
-
-    svc.normalize_hotels()
-    svc.merge_hotels()
-    
-    hotel_db.update_many(svc.get)
-    
-    logger.log(f'Updated {hotel_db.length()} hotels in the database', 'info')
-    logger.log(f'Updated {raw_hotel_db.length()} raw hotels in the database', 'info')
+    return hotel_ids, destination_ids, options
 
 
 def parse_arguments():
     """
-    Parse command-line arguments for hotel_ids and destination_ids.
+    Parse command-line arguments for hotel_ids, destination_ids and pagination.
     Returns:
         hotel_ids (list or None): A list of hotel IDs, or None if 'none' is passed.
         destination_ids (list or None): A list of destination IDs, or None if 'none' is passed.
+        options (dict): The page size, cursor, total count flag, output format and field selection.
+        batch (dict or None): The query file and worker count when running in batch mode.
+        refresh (bool): Whether to refresh the catalog from the suppliers before answering.
+        diagnostics (dict): The file to dump metrics to and the stages to profile, each None when not requested,
+            and whether to trace allocations while profiling.
     """
-    import argparse  # Import argparse here to keep the function self-contained
-
     parser = argparse.ArgumentParser(
         description="Filter hotels by hotel_ids and destination_ids."
     )
+    add_query_arguments(parser, optional_ids=True)
     parser.add_argument(
-        "hotel_ids",
+        "--batch",
         type=str,
-        help="Comma-separated list of hotel IDs, or 'none' if no filtering by hotel ID is required.",
+        default=None,
+        metavar="FILE",
+        help="Answer every query line in FILE ('-' for stdin) against one loaded catalog, writing NDJSON. "
+             "Each line takes the same arguments as the command line, e.g. 'iJhz,f8c9 5432 --fields name'.",
     )
     parser.add_argument(
-        "destination_ids",
+        "--no-refresh",
+        action="store_true",
+        help="Answer from the catalog already stored by the tiered backend instead of refreshing suppliers first.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=cli_config['batch_workers'],
+        help="Threads answering batch queries.",
+    )
+    parser.add_argument(
+        "--metrics-dump",
         type=str,
-        help="Comma-separated list of destination IDs, or 'none' if no filtering by destination ID is required.",
+        default=None,
+        metavar="PATH",
+        help="Write the collected metrics to PATH before exiting, as JSON if it ends in '.json' "
+             "and as Prometheus text otherwise.",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="STAGES",
+        help="Profile these comma-separated stages (fetch, normalize, merge, store, query, or 'all'), "
+             "writing cProfile, collapsed-stack and allocation reports under profile_config['output_dir'].",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also trace allocations and write the memory each stage added to memory.txt.",
     )
 
     # Parse the arguments
     args = parser.parse_args()
+    refresh = not args.no_refresh
+    diagnostics = {"metrics_dump": args.metrics_dump, "profile": None, "profile_memory": args.profile_memory}
+    if args.profile is not None:
+        from utils.profiler import parse_stages
+        try:
+            diagnostics["profile"] = parse_stages(args.profile)
+        except ValueError as e:
+            parser.error(str(e))
+    elif args.profile_memory:
+        parser.error("argument --profile-memory: requires --profile")
+    if args.batch is not None:
+        return None, None, None, {"path": args.batch, "workers": args.workers}, refresh, diagnostics
+    if args.hotel_ids is None or args.destination_ids is None:
+        parser.error("hotel_ids and destination_ids are required unless --batch is given")
 
-    # Process hotel_ids and destination_ids
-    hotel_ids = args.hotel_ids.split(
-        ",") if args.hotel_ids.lower() != "none" else None
-    destination_ids = args.destination_ids.split(
-        ",") if args.destination_ids.lower() != "none" else None
+    hotel_ids, destination_ids, options = query_params(args)
+    try:
+        validate_query(hotel_ids, destination_ids, options)
+    except ValueError as e:
+        parser.error(str(e))
+    return hotel_ids, destination_ids, options, None, refresh, diagnostics
+
+
+def validate_query(hotel_ids, destination_ids, options):
+    """
+    Check a query against the /hotels filter model before anything is refreshed.
+    Raises ValueError naming the offending arguments.
+    """
+    from pydantic import ValidationError
+    from api.domain.hotels.schemas import HotelsFilter
+
+    try:
+        HotelsFilter.model_validate({"hotel_ids": hotel_ids, "destination_ids": destination_ids, **options})
+    except ValidationError as e:
+        problems = []
+        for error in e.errors(include_url=False):
+            name = str(error["loc"][0]) if error["loc"] else "query"
+            argument = name if name in ("hotel_ids", "destination_ids") else "--" + name.replace("_", "-")
+            problems.append(f"argument {argument}: {error['msg']}")
+        raise ValueError("; ".join(problems))
+
+
+def run_batch(path, workers):
+    """
+    Answer every query in a file or stdin and write one NDJSON result line per query.
+    """
+    from api import hotel_api
+    from api.services.query_runner import QueryRunner
+    from database.hotel import hotel_db
+
+    runner = QueryRunner(hotel_api, hotel_db, workers=workers, window=cli_config['batch_window'])
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        count = 0
+        for line in runner.run(source, QueryLineParser()):
+            sys.stdout.buffer.write(line)
+            count += 1
+        sys.stdout.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    logger.log(f"Answered {count} batch queries from {path}.", "info")
 
-    return hotel_ids, destination_ids
 
 def main():
     
-    update_suppliers_data()
-    
-    hotel_ids, destination_ids = parse_arguments()
+    hotel_ids, destination_ids, options, batch, refresh, diagnostics = parse_arguments()
+    if diagnostics["profile"]:
+        from utils import profiler
+        profiler.enable(diagnostics["profile"], memory=diagnostics["profile_memory"] or None)
+    try:
+        answer(hotel_ids, destination_ids, options, batch, refresh)
+    finally:
+        if diagnostics["profile"]:
+            profiler.disable()
+        if diagnostics["metrics_dump"]:
+            from utils.metrics import metrics
+            metrics.dump(diagnostics["metrics_dump"])
+
+
+def answer(hotel_ids, destination_ids, options, batch, refresh):
+    """
+    Refresh the catalog unless told not to, then answer the query or the batch of queries.
+    """
+    from api import hotel_api
+    from database.hotel import hotel_db
+
+    if refresh:
+        update_suppliers_data()
+    elif not hotel_db.length():
+        logger.log("Skipping the refresh with an empty catalog; --no-refresh needs the tiered backend's "
+                   "stored catalog.", "warning")
+
+    if batch is not None:
+        run_batch(batch["path"], batch["workers"])
+        return
+
     logger.log(f"Filtering hotels by hotel_ids: {hotel_ids}, destination_ids: {destination_ids}", "info")
 
     
     params = {
         "hotel_ids": hotel_ids,
-        "destination_ids": destination_ids
+        "destination_ids": destination_ids,
+        **options
     }
     
     hotels = hotel_api.get_hotels(hotel_db, params)
-    print(hotels)
+    write_output(hotels.body)
     
 
 if __name__ == "__main__":
@@ -1,8 +1,17 @@
-from typing import List, Optional, Dict
-from pydantic import BaseModel, field_validator, Field, HttpUrl
+import json
+from functools import lru_cache
+from typing import Annotated, Any, List, Optional, Dict, Tuple, get_args, get_origin
+from configs.config import api_config
+from pydantic import BaseModel, BeforeValidator, WithJsonSchema, field_validator, Field
+from utils.urls import canonical_url
+
+# An HTTP(S) URL kept as its canonical string. Validation is cached by the raw string,
+# so the same link validated again when a merged hotel is built or read from disk costs a lookup
+CanonicalUrl = Annotated[str, BeforeValidator(canonical_url),
+                         WithJsonSchema({'type': 'string', 'format': 'uri', 'minLength': 1, 'maxLength': 2083})]
 
 class Image(BaseModel):
-    link: HttpUrl
+    link: CanonicalUrl
     description: Optional[str] = None
 
 class Amenities(BaseModel):
@@ -83,3 +92,117 @@ class Hotel(BaseModel):
                 ]
             }
         }
+
+
+class FieldSet:
+    """
+    A validated selection of response fields.
+    `top_level` is set when only whole top-level fields are selected, so responses
+    can be assembled from per-field fragments; `include` is the equivalent Pydantic spec.
+    """
+
+    def __init__(self, include: dict, top_level: Optional[Tuple[str, ...]]):
+        self.include = include
+        self.top_level = top_level
+
+
+def _unwrap(annotation) -> Tuple[Any, bool]:
+    """
+    Strip Optional and List from a field annotation.
+    Returns the inner type and whether the field is a list.
+    """
+    is_list = False
+    while True:
+        origin = get_origin(annotation)
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if origin in (list, List):
+            is_list = True
+            annotation = args[0]
+        elif args and origin is not None and len(args) == 1:
+            annotation = args[0]
+        else:
+            return annotation, is_list
+
+
+class HotelResponseProjection:
+    """
+    The API view of a stored hotel.
+    Fields are excluded at serialization time, so no intermediate response model is built.
+    """
+
+    def __init__(self, exclude: set[str]):
+        self.exclude = set(exclude)
+        self.fields = [name for name in Hotel.model_fields if name not in self.exclude]
+        # Keyed on the normalized selection, and bounded because the selection comes from clients
+        self._field_set = lru_cache(maxsize=api_config['max_field_sets'])(self._build_field_set)
+
+    def dump(self, hotel: Hotel) -> dict:
+        """
+        Project a hotel into a JSON-compatible dictionary.
+        """
+        return hotel.model_dump(mode="json", exclude=self.exclude)
+
+    def dump_json(self, hotel: Hotel, field_set: Optional[FieldSet] = None) -> bytes:
+        """
+        Project a hotel straight into compact JSON bytes with Pydantic's native encoder,
+        optionally keeping only the selected fields.
+        """
+        if field_set is None:
+            return hotel.model_dump_json(exclude=self.exclude).encode()
+        return hotel.model_dump_json(include=field_set.include).encode()
+
+    def select(self, fields: Optional[List[str]]) -> Optional[FieldSet]:
+        """
+        Resolve dotted field paths such as 'name' or 'location.city' into a field set.
+        Recently used field sets are memoised, so repeated requests pay for validation once.
+        """
+        if not fields:
+            return None
+        return self._field_set(tuple(sorted({path.strip() for path in fields})))
+
+    def _build_field_set(self, fields: Tuple[str, ...]) -> FieldSet:
+        include: dict = {}
+        for path in fields:
+            parts = path.split(".")
+            if parts[0] not in self.fields:
+                raise ValueError(f"Unknown field '{path}'")
+
+            model, spec = Hotel, include
+            for depth, part in enumerate(parts):
+                if model is None or not hasattr(model, "model_fields") or part not in model.model_fields:
+                    raise ValueError(f"Unknown field '{path}'")
+                if spec.get(part) is True:
+                    break
+                if depth == len(parts) - 1:
+                    spec[part] = True
+                    break
+                model, is_list = _unwrap(model.model_fields[part].annotation)
+                child = spec.setdefault(part, {})
+                if is_list:
+                    child = child.setdefault("__all__", {})
+                spec = child
+
+        top_level = None
+        if all(value is True for value in include.values()):
+            top_level = tuple(name for name in self.fields if name in include)
+        return FieldSet(include, top_level)
+
+    @staticmethod
+    def split_fragment(fragment: bytes) -> dict[str, bytes]:
+        """
+        Split a serialized hotel into one serialized value per top-level field.
+        """
+        return {name: json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+                for name, value in json.loads(fragment).items()}
+
+    @staticmethod
+    def join_fields(field_fragments: dict[str, bytes], names: Tuple[str, ...]) -> bytes:
+        """
+        Assemble a serialized object from per-field fragments.
+        """
+        return b"{" + b",".join(b'"' + name.encode() + b'":' + field_fragments[name]
+                                for name in names) + b"}"
+
+
+# The response returned by the API: every hotel field except its supplier source
+hotel_response = HotelResponseProjection(exclude={"source"})
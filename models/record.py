@@ -0,0 +1,203 @@
+from typing import Any, List, Optional, Union
+
+from models.hotel import Amenities, Hotel, HotelImages, Image, Location
+
+
+class Record:
+    """
+    A plain slotted record: fixed fields, no per-instance dict and no validation on assignment.
+    Records carry hotels between parsing and storage once Pydantic has validated them.
+    """
+    __slots__ = ()
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+
+class LocationRecord(Record):
+    __slots__ = ('address', 'city', 'country', 'postal_code', 'latitude', 'longitude')
+
+    def __init__(self, address: Optional[str] = None, city: Optional[str] = None, country: Optional[str] = None,
+                 postal_code: Optional[str] = None, latitude: Optional[float] = None,
+                 longitude: Optional[float] = None):
+        self.address = address
+        self.city = city
+        self.country = country
+        self.postal_code = postal_code
+        self.latitude = latitude
+        self.longitude = longitude
+
+    @classmethod
+    def from_model(cls, location: Location) -> 'LocationRecord':
+        return cls(location.address, location.city, location.country, location.postal_code,
+                   location.latitude, location.longitude)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'LocationRecord':
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class AmenitiesRecord(Record):
+    __slots__ = ('general', 'room')
+
+    def __init__(self, general: Optional[List[str]] = None, room: Optional[List[str]] = None):
+        self.general = general
+        self.room = room
+
+    @classmethod
+    def from_model(cls, amenities: Amenities) -> 'AmenitiesRecord':
+        return cls(amenities.general, amenities.room)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AmenitiesRecord':
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return {'general': self.general, 'room': self.room}
+
+
+class ImageRecord(Record):
+    # The link is the canonical string of the URL validated at ingress
+    __slots__ = ('link', 'description')
+
+    def __init__(self, link: str, description: Optional[str] = None):
+        self.link = link
+        self.description = description
+
+    @classmethod
+    def from_model(cls, image: Image) -> 'ImageRecord':
+        return cls(image.link, image.description)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ImageRecord':
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return {'link': self.link, 'description': self.description}
+
+
+def _images(images: Optional[List[Any]], convert) -> Optional[list]:
+    return None if images is None else [convert(image) for image in images]
+
+
+class ImagesRecord(Record):
+    __slots__ = ('rooms', 'site', 'amenities')
+
+    def __init__(self, rooms: Optional[List[ImageRecord]] = None, site: Optional[List[ImageRecord]] = None,
+                 amenities: Optional[List[ImageRecord]] = None):
+        self.rooms = rooms
+        self.site = site
+        self.amenities = amenities
+
+    @classmethod
+    def from_model(cls, images: HotelImages) -> 'ImagesRecord':
+        return cls(_images(images.rooms, ImageRecord.from_model),
+                   _images(images.site, ImageRecord.from_model),
+                   _images(images.amenities, ImageRecord.from_model))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ImagesRecord':
+        return cls(**{name: _images(images, ImageRecord.from_dict) for name, images in data.items()})
+
+    def to_dict(self) -> dict:
+        return {name: _images(getattr(self, name), ImageRecord.to_dict) for name in self.__slots__}
+
+
+class HotelRecord(Record):
+    """
+    The internal form of a hotel between supplier parsing and storage. Suppliers
+    validate their data into a Hotel; normalizing and merging then work on records,
+    and merged hotels are validated into a Hotel again before they are stored.
+    """
+    __slots__ = ('hotel_id', 'destination_id', 'name', 'description', 'location',
+                 'amenities', 'images', 'booking_conditions', 'source')
+
+    def __init__(self,
+                 hotel_id: str,
+                 destination_id: int,
+                 name: str,
+                 description: Optional[str] = None,
+                 location: Optional[LocationRecord] = None,
+                 amenities: Optional[AmenitiesRecord] = None,
+                 images: Optional[ImagesRecord] = None,
+                 booking_conditions: Optional[List[str]] = None,
+                 source: Optional[str] = None):
+        self.hotel_id = hotel_id
+        self.destination_id = destination_id
+        self.name = name
+        self.description = description
+        self.location = location
+        self.amenities = amenities
+        self.images = images
+        self.booking_conditions = booking_conditions
+        self.source = source
+
+    @classmethod
+    def from_model(cls, hotel: Hotel) -> 'HotelRecord':
+        return cls(hotel.hotel_id,
+                   hotel.destination_id,
+                   hotel.name,
+                   hotel.description,
+                   LocationRecord.from_model(hotel.location),
+                   AmenitiesRecord.from_model(hotel.amenities) if hotel.amenities is not None else None,
+                   ImagesRecord.from_model(hotel.images) if hotel.images is not None else None,
+                   hotel.booking_conditions,
+                   hotel.source)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'HotelRecord':
+        """
+        Rebuild a record from `to_dict` output, without validating it again.
+        """
+        data = dict(data)
+        data['location'] = LocationRecord.from_dict(data['location'])
+        if data.get('amenities') is not None:
+            data['amenities'] = AmenitiesRecord.from_dict(data['amenities'])
+        if data.get('images') is not None:
+            data['images'] = ImagesRecord.from_dict(data['images'])
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the record into a JSON-compatible dictionary keyed by Hotel field names.
+        """
+        return {
+            'hotel_id': self.hotel_id,
+            'destination_id': self.destination_id,
+            'name': self.name,
+            'description': self.description,
+            'location': self.location.to_dict() if self.location is not None else None,
+            'amenities': self.amenities.to_dict() if self.amenities is not None else None,
+            'images': self.images.to_dict() if self.images is not None else None,
+            'booking_conditions': self.booking_conditions,
+            'source': self.source,
+        }
+
+    def to_model(self) -> Hotel:
+        """
+        Validate the record into a Hotel.
+        """
+        return Hotel.model_validate(self.to_dict())
+
+    def copy(self) -> 'HotelRecord':
+        """
+        Copy the record, sharing its attribute values.
+        """
+        return HotelRecord(self.hotel_id, self.destination_id, self.name, self.description, self.location,
+                           self.amenities, self.images, self.booking_conditions, self.source)
+
+
+def as_record(hotel: Union[Hotel, HotelRecord]) -> HotelRecord:
+    """
+    Get the record of a hotel, converting validated Hotel models.
+    """
+    return hotel if isinstance(hotel, HotelRecord) else HotelRecord.from_model(hotel)
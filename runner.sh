@@ -1,6 +1,13 @@
 
+if [ $# -eq 2 ] && [ "$1" = "--batch" ]; then
+  # Answer every query line in a file, or stdin with '-', against one loaded catalog
+  python3 main.py --batch "$2"
+  exit $?
+fi
+
 if [ $# -ne 2 ]; then
   echo "Usage: $0 <hotel_ids> <destination_ids>"
+  echo "       $0 --batch <queries_file|->"
   exit 1
 fi
 
@@ -9,4 +16,4 @@ HOTEL_IDS=$1
 DESTINATION_IDS=$2
 
 # Run the Python script with the provided arguments
-python3 main.py "$HOTEL_IDS" "$DESTINATION_IDS"
\ No newline at end of file
+python3 main.py "$HOTEL_IDS" "$DESTINATION_IDS"
@@ -0,0 +1,91 @@
+from api import hotel_api
+from api.services.asgi import HotelASGIApp
+from api.services.server import serve
+from database.hotel import raw_hotel_db, hotel_db
+from services.catalog import create_catalog_refresher
+from services.scheduler import RefreshScheduler, create_cadence_policy
+from configs.config import scheduler_config, server_config
+from utils import profiler
+from utils.logger import logger
+
+
+def parse_arguments():
+    """
+    Parse command-line arguments for the server address.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Serve the hotel API over HTTP."
+    )
+    parser.add_argument("--host", type=str, default=server_config['host'], help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=server_config['port'], help="Port to listen on.")
+    parser.add_argument(
+        "--no-refresh",
+        action="store_true",
+        help="Load the catalog once at startup and do not refresh it in the background.",
+    )
+    parser.add_argument(
+        "--uvicorn",
+        action="store_true",
+        help="Serve with uvicorn instead of the built-in server (requires uvicorn to be installed).",
+    )
+    parser.add_argument(
+        "--profile",
+        type=profiler.parse_stages,
+        default=None,
+        metavar="STAGES",
+        help="Profile these comma-separated stages (fetch, normalize, merge, store, query, or 'all') "
+             "from startup until shutdown, writing reports under profile_config['output_dir'].",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="With --profile, also trace allocations and write the memory each stage added to memory.txt.",
+    )
+    args = parser.parse_args()
+    if args.profile_memory and not args.profile:
+        parser.error("argument --profile-memory: requires --profile")
+    return args
+
+
+def main():
+    args = parse_arguments()
+    if args.profile:
+        profiler.enable(args.profile, memory=args.profile_memory or None)
+
+    # Load the catalog once; queries are then served from it while suppliers refresh in the background
+    refresher = create_catalog_refresher(raw_hotel_db, hotel_db, checkpoint=True)
+    refresher.refresh_all()
+
+    scheduler = None
+    stats_providers = {}
+    if scheduler_config['enabled'] and not args.no_refresh:
+        cadence_name = scheduler_config['cadence']
+        cadence = create_cadence_policy(cadence_name, **scheduler_config.get(cadence_name, {}))
+        scheduler = RefreshScheduler(refresher,
+                                     scheduler_config['intervals'],
+                                     scheduler_config['retry_interval'],
+                                     scheduler_config['jitter'],
+                                     cadence,
+                                     scheduler_config['smoothing'])
+        scheduler.start()
+        stats_providers['refresh'] = scheduler.stats
+
+    app = HotelASGIApp(hotel_api, hotel_db, stats_providers=stats_providers)
+
+    if args.uvicorn:
+        import uvicorn
+        uvicorn.run(app, host=args.host, port=args.port, timeout_keep_alive=int(server_config['keep_alive_timeout']))
+    else:
+        serve(app, args.host, args.port)
+
+    if scheduler is not None:
+        scheduler.stop()
+    # Reports are written on shutdown, covering the startup refresh, background refreshes and queries
+    profiler.disable()
+
+
+if __name__ == "__main__":
+    main()
+    logger.close()
@@ -1 +1,6 @@
-from services.hotel import HotelService
\ No newline at end of file
+def __getattr__(name):
+    # Imported on first use: HotelService pulls in the refresh stack, which query-only code never needs
+    if name == "HotelService":
+        from services.hotel import HotelService
+        return HotelService
+    raise AttributeError(f"module 'services' has no attribute '{name}'")
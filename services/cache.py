@@ -0,0 +1,302 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+from utils.exceptions import DBException
+
+
+class EvictionPolicy(ABC):
+    """
+    Decides which key leaves the hot cache when it is full.
+    """
+
+    @abstractmethod
+    def record_insert(self, key: Hashable) -> None:
+        """
+        Track a key that has just been inserted.
+        """
+        pass
+
+    @abstractmethod
+    def record_access(self, key: Hashable) -> None:
+        """
+        Track a hit on a key that is already cached.
+        """
+        pass
+
+    @abstractmethod
+    def record_remove(self, key: Hashable) -> None:
+        """
+        Forget a key that has left the cache.
+        """
+        pass
+
+    @abstractmethod
+    def victim(self) -> Optional[Hashable]:
+        """
+        Return the key that should be evicted next.
+        """
+        pass
+
+
+class LRUEvictionPolicy(EvictionPolicy):
+    """
+    Evicts the least recently used key.
+    """
+
+    def __init__(self):
+        self._order: OrderedDict[Hashable, None] = OrderedDict()
+
+    def record_insert(self, key):
+        self._order[key] = None
+        self._order.move_to_end(key)
+
+    def record_access(self, key):
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def record_remove(self, key):
+        self._order.pop(key, None)
+
+    def victim(self):
+        return next(iter(self._order), None)
+
+
+class LFUEvictionPolicy(EvictionPolicy):
+    """
+    Evicts the least frequently used key, oldest first among equal counts.
+    Every operation is O(1) thanks to per-frequency buckets.
+    """
+
+    def __init__(self):
+        self._freq: dict[Hashable, int] = {}
+        self._buckets: dict[int, OrderedDict[Hashable, None]] = {}
+        self._min_freq = 0
+
+    def _bump(self, key, freq):
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = freq + 1
+        self._freq[key] = freq + 1
+        self._buckets.setdefault(freq + 1, OrderedDict())[key] = None
+
+    def record_insert(self, key):
+        if key in self._freq:
+            self._bump(key, self._freq[key])
+            return
+        self._freq[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_freq = 1
+
+    def record_access(self, key):
+        if key in self._freq:
+            self._bump(key, self._freq[key])
+
+    def record_remove(self, key):
+        freq = self._freq.pop(key, None)
+        if freq is None:
+            return
+        bucket = self._buckets[freq]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[freq]
+            if self._min_freq == freq:
+                self._min_freq = min(self._buckets, default=0)
+
+    def victim(self):
+        bucket = self._buckets.get(self._min_freq)
+        if not bucket:
+            return None
+        return next(iter(bucket))
+
+
+class AdmissionPolicy(ABC):
+    """
+    Decides whether a key read from the cold tier is worth caching.
+    """
+
+    @abstractmethod
+    def admit(self, key: Hashable) -> bool:
+        pass
+
+
+class AlwaysAdmission(AdmissionPolicy):
+    """
+    Admits every key on its first miss.
+    """
+
+    def admit(self, key):
+        return True
+
+
+class FrequencyAdmission(AdmissionPolicy):
+    """
+    Admits a key only once it has missed `threshold` times, so one-off
+    lookups do not push genuinely hot hotels out of the cache.
+    """
+
+    def __init__(self, threshold: int = 2, max_tracked: int = 100_000):
+        self._threshold = threshold
+        self._max_tracked = max_tracked
+        self._counts: dict[Hashable, int] = {}
+
+    def admit(self, key):
+        count = self._counts.get(key, 0) + 1
+        if count >= self._threshold:
+            self._counts.pop(key, None)
+            return True
+        if len(self._counts) >= self._max_tracked:
+            # Age the doorkeeper instead of letting it grow with the catalog
+            self._counts.clear()
+        self._counts[key] = count
+        return False
+
+
+EVICTION_POLICIES = {
+    'lru': LRUEvictionPolicy,
+    'lfu': LFUEvictionPolicy,
+}
+
+ADMISSION_POLICIES = {
+    'always': AlwaysAdmission,
+    'frequency': FrequencyAdmission,
+}
+
+
+def create_eviction_policy(name: str) -> EvictionPolicy:
+    if name not in EVICTION_POLICIES:
+        raise DBException(f"Unknown eviction policy '{name}'")
+    return EVICTION_POLICIES[name]()
+
+
+def create_admission_policy(name: str, **kwargs) -> AdmissionPolicy:
+    if name not in ADMISSION_POLICIES:
+        raise DBException(f"Unknown admission policy '{name}'")
+    return ADMISSION_POLICIES[name](**kwargs)
+
+
+class HotCache:
+    """
+    A bounded in-memory cache. Size is limited by entry count and, optionally,
+    by the sum of the sizes reported for each entry.
+    Operations are guarded by a lock so readers and a background writer can share it.
+    """
+
+    def __init__(self,
+                 max_items: int,
+                 max_bytes: Optional[int] = None,
+                 eviction: EvictionPolicy = None,
+                 admission: AdmissionPolicy = None):
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._eviction = eviction or LRUEvictionPolicy()
+        self._admission = admission or AlwaysAdmission()
+        self._entries: dict[Hashable, tuple[Any, int]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._eviction.record_access(key)
+            return entry[0]
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Read a value without counting a hit or miss or touching the eviction order.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+
+    def admit(self, key: Hashable, value: Any, size: int = 0) -> bool:
+        """
+        Insert a value after a miss, subject to the admission policy.
+        """
+        with self._lock:
+            if key not in self._entries and not self._admission.admit(key):
+                self.rejections += 1
+                return False
+            return self.put(key, value, size)
+
+    def put(self, key: Hashable, value: Any, size: int = 0) -> bool:
+        """
+        Insert or replace a value, evicting other entries to make room.
+        """
+        with self._lock:
+            if self._max_items <= 0 or (self._max_bytes is not None and size > self._max_bytes):
+                self.remove(key)
+                return False
+
+            self.remove(key)
+            while self._entries and (len(self._entries) >= self._max_items or
+                                     (self._max_bytes is not None and self._bytes + size > self._max_bytes)):
+                victim = self._eviction.victim()
+                if victim is None:
+                    break
+                self.remove(victim)
+                self.evictions += 1
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._eviction.record_insert(key)
+            return True
+
+    def replace(self, key: Hashable, value: Any, size: int = 0) -> bool:
+        """
+        Refresh a value only if it is already cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            return self.put(key, value, size)
+
+    def remove(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+                self._eviction.record_remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                self.remove(key)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'items': len(self._entries),
+                'bytes': self._bytes,
+                'max_items': self._max_items,
+                'max_bytes': self._max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hit_rate,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+            }
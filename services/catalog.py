@@ -0,0 +1,282 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from suppliers import SupplierManager
+from suppliers.base_supplier import BaseSupplier
+from suppliers.modules.acme import AcmeSupplier
+from suppliers.modules.patagonia import PatagoniaSupplier
+from suppliers.modules.paperflies import PaperfliesSupplier
+
+from services.hotel import HotelService
+from services.pipeline import RefreshPipeline
+from services.checkpoint import CheckpointStore, RefreshCheckpoint
+from services.database import BaseDB, RawHotelDB
+from services.normalizer import DataNormalizer
+from services.normalizer import DescriptionNormalizer
+from services.normalizer import LocationNormalizer
+from services.normalizer import AmenitiesNormalizer
+from services.normalizer import ImagesNormalizer
+from services.normalizer import NameNormalizer
+from services.normalizer import BookingConditionsNormalizer
+from services.merger import DataMerger
+from services.merger import DescriptionMerger
+from services.merger import LocationMerger
+from services.merger import AmenitiesMerger
+from services.merger import ImagesMerger
+from services.merger import NameMerger
+from services.merger import BookingConditionsMerger
+
+from models.hotel import Hotel
+from utils.cleaner import HotelCleaner
+from utils.bias import HotelBias
+from utils.exceptions import SupplierException
+from utils.logger import logger
+from utils.profiler import stage as profile_stage
+from utils.vocabulary import vocabulary
+
+from configs.config import supplier_config, merger_config, pipeline_config, checkpoint_config
+
+
+SUPPLIERS = {
+    "acme": AcmeSupplier,
+    "patagonia": PatagoniaSupplier,
+    "paperflies": PaperfliesSupplier,
+}
+
+
+def create_suppliers(config: dict = supplier_config) -> Dict[str, BaseSupplier]:
+    """
+    Build a supplier for every configured endpoint.
+    """
+    return {name: SUPPLIERS[name](endpoint) for name, endpoint in config['endpoint'].items()}
+
+
+def create_normalizer() -> DataNormalizer:
+    cleaner = HotelCleaner()
+    return DataNormalizer({
+        "description": DescriptionNormalizer(cleaner),
+        "location": LocationNormalizer(cleaner),
+        "amenities": AmenitiesNormalizer(cleaner),
+        "images": ImagesNormalizer(cleaner),
+        "name": NameNormalizer(cleaner),
+        "booking_conditions": BookingConditionsNormalizer(cleaner)
+    })
+
+
+def create_merger(config: dict = merger_config) -> DataMerger:
+    bias = HotelBias(config['bias_factors'])
+    return DataMerger({
+        "name": NameMerger(bias),
+        "description": DescriptionMerger(bias),
+        "location": LocationMerger(bias),
+        "amenities": AmenitiesMerger(bias),
+        "images": ImagesMerger(bias),
+        "booking_conditions": BookingConditionsMerger(bias)
+    }, config['source_attr_name'], config['unmerged_attrs'])
+
+
+@dataclass
+class RefreshResult:
+    """
+    The outcome of refreshing one supplier.
+    """
+    supplier: str
+    fetched: int
+    merged: int
+    # Records added, modified or removed since the previous fetch
+    changed: int = 0
+    # Changed records as a share of the supplier's previous and current records
+    change_ratio: float = 0.0
+
+
+def fingerprint(hotels: List[Hotel]) -> Dict[str, str]:
+    """
+    Hash each fetched record, as parsed and before normalization, by hotel ID.
+    """
+    return {
+        hotel.hotel_id: hashlib.blake2b(hotel.model_dump_json().encode(), digest_size=12).hexdigest()
+        for hotel in hotels
+    }
+
+
+class CatalogRefresher:
+    """
+    Runs the fetch, normalize and merge pipeline and writes the result into the databases.
+    Suppliers can be refreshed one at a time: the raw database keeps every
+    source's last good records, so re-merging the hotels a supplier touched
+    combines its fresh data with what the other suppliers last returned.
+    With a checkpoint store, full refreshes checkpoint their fetched and
+    normalized data, and a run that failed is resumed by the next full refresh.
+    """
+
+    def __init__(self,
+                 suppliers: Dict[str, BaseSupplier],
+                 normalizer: DataNormalizer,
+                 merger: DataMerger,
+                 raw_hotel_db: RawHotelDB,
+                 hotel_db: BaseDB,
+                 pipeline: Optional[dict] = None,
+                 checkpoints: Optional[CheckpointStore] = None,
+                 checkpoint_batch_size: int = 50):
+        self.suppliers = suppliers
+        self._normalizer = normalizer
+        self._merger = merger
+        self._raw_hotel_db = raw_hotel_db
+        self._hotel_db = hotel_db
+        # Content hashes of each supplier's last fetched records
+        self._fingerprints: Dict[str, Dict[str, str]] = {}
+        # Settings for the streaming pipeline used by full refreshes; None runs the stages one after another
+        self._pipeline = pipeline
+        self._checkpoints = checkpoints
+        # Batch size of checkpoints written by the staged path; the pipeline checkpoints each of its chunks
+        self._checkpoint_batch_size = checkpoint_batch_size
+
+    def refresh_all(self) -> None:
+        """
+        Fetch every supplier and rebuild the catalog from the combined data.
+        """
+        checkpoint = self._start_checkpoint()
+        # Terms that only stale records still use are dropped; records already stored keep their values
+        vocabulary.clear()
+        try:
+            if self._pipeline is not None:
+                self._refresh_all_pipelined(checkpoint)
+            else:
+                self._refresh_all_staged(checkpoint)
+        except Exception as e:
+            if checkpoint:
+                checkpoint.fail(str(e))
+            raise
+        if checkpoint:
+            checkpoint.complete()
+            self._checkpoints.collect(checkpoint)
+        logger.log(f'Updated {self._hotel_db.length()} hotels in the database', 'info')
+        logger.log(f'Updated {self._raw_hotel_db.length()} raw hotels in the database', 'info')
+
+    def _start_checkpoint(self) -> Optional[RefreshCheckpoint]:
+        if self._checkpoints is None:
+            return None
+        if self._pipeline is not None:
+            return self._checkpoints.start('pipelined', self._pipeline['chunk_size'])
+        return self._checkpoints.start('staged', self._checkpoint_batch_size)
+
+    def _refresh_all_pipelined(self, checkpoint: Optional[RefreshCheckpoint] = None) -> None:
+        result = RefreshPipeline(self.suppliers, self._normalizer, self._merger,
+                                 self._raw_hotel_db, self._hotel_db,
+                                 fingerprint=fingerprint, checkpoint=checkpoint, **self._pipeline).run()
+        for name in self.suppliers:
+            # Failed suppliers keep their previous hashes, like their records in the raw database
+            if name not in result.failed:
+                current = result.fingerprints.get(name, {})
+                self._remove_dropped(name, self._fingerprints.get(name, {}).keys() - current.keys())
+                self._fingerprints[name] = current
+        self._prune_catalog({name: result.fingerprints.get(name, {}) for name in self.suppliers
+                             if name not in result.failed})
+
+    def _refresh_all_staged(self, checkpoint: Optional[RefreshCheckpoint] = None) -> None:
+        data = SupplierManager(self.suppliers).get_all_suppliers_data(checkpoint)
+        self._process(data, checkpoint)
+        fetched = {}
+        for name in self.suppliers:
+            current = fingerprint([hotel for hotel in data if hotel.source == name])
+            # Suppliers that failed or returned nothing keep their previous hashes and records
+            if current:
+                self._remove_dropped(name, self._fingerprints.get(name, {}).keys() - current.keys())
+                self._fingerprints[name] = current
+                fetched[name] = current
+        self._prune_catalog(fetched)
+
+    def refresh_supplier(self, name: str) -> RefreshResult:
+        """
+        Fetch one supplier and re-merge the hotels whose records changed since its last fetch.
+        Unchanged records are skipped, so a supplier that has not changed costs only the fetch.
+        Raises SupplierException if the supplier cannot be read, leaving its last good data in place.
+        """
+        supplier = self.suppliers.get(name)
+        if supplier is None:
+            raise SupplierException(f"Unknown supplier '{name}'")
+
+        data = supplier.load()
+        if not data:
+            raise SupplierException(f"Supplier '{name}' returned no hotels, keeping its last good data")
+
+        previous = self._fingerprints.get(name, {})
+        current = fingerprint(data)
+        changed_ids = {hotel_id for hotel_id, digest in current.items() if previous.get(hotel_id) != digest}
+        removed_ids = previous.keys() - current.keys()
+        changed = len(changed_ids) + len(removed_ids)
+        change_ratio = changed / max(len(previous.keys() | current.keys()), 1)
+
+        merged = self._process([hotel for hotel in data if hotel.hotel_id in changed_ids])
+        self._remove_dropped(name, removed_ids)
+        self._fingerprints[name] = current
+        logger.log("Refreshed %s hotels from %s records of supplier '%s' (%s changed, ratio %.2f).", "info",
+                   len(merged), len(data), name, changed, change_ratio,
+                   supplier=name, fetched=len(data), merged=len(merged), changed=changed, change_ratio=change_ratio)
+        return RefreshResult(supplier=name, fetched=len(data), merged=len(merged),
+                             changed=changed, change_ratio=change_ratio)
+
+    def _remove_dropped(self, name: str, hotel_ids: Set[str]) -> None:
+        """
+        Delete the records of hotels a supplier no longer returns. Hotels other suppliers
+        still return are re-merged from their records; the others are removed from the catalog.
+        """
+        if not hotel_ids:
+            return
+        hotel_ids = sorted(hotel_ids)
+        self._raw_hotel_db.delete_many(hotel_ids, source=name)
+        remaining = self._raw_hotel_db.find_all(hotel_ids)
+        orphaned = set(hotel_ids).difference(hotel.hotel_id for hotel in remaining)
+        self._hotel_db.delete_many(sorted(orphaned))
+        if remaining:
+            svc = HotelService(remaining, self._normalizer, self._merger, self._raw_hotel_db)
+            svc.merge_hotels()
+            with profile_stage('store'):
+                self._hotel_db.update_many(svc.get)
+        logger.log("Removed %s hotels dropped by supplier '%s' (%s re-merged from other suppliers).", "info",
+                   len(hotel_ids), name, len(hotel_ids) - len(orphaned), supplier=name, removed=len(hotel_ids))
+
+    def _prune_catalog(self, fetched: Dict[str, Dict[str, str]]) -> None:
+        """
+        Delete stored hotels that no supplier returned in a full refresh. Fingerprints only
+        cover what this process fetched, so this catches hotels dropped while it was not running.
+        Skipped unless every supplier returned data, since a failed one may still list them.
+        """
+        if not all(fetched.get(name) for name in self.suppliers):
+            logger.log("Not pruning the catalog: %s suppliers returned no data.", "warning",
+                       len(self.suppliers) - sum(1 for name in self.suppliers if fetched.get(name)))
+            return
+        current = set().union(*(hotel_ids.keys() for hotel_ids in fetched.values()))
+        stale = [hotel_id for hotel_id in self._hotel_db.ids() if hotel_id not in current]
+        if not stale:
+            return
+        self._raw_hotel_db.delete_many(stale)
+        self._hotel_db.delete_many(stale)
+        logger.log("Pruned %s hotels no supplier returned.", "info", len(stale), removed=len(stale))
+
+    def _process(self, data: List[Hotel], checkpoint: Optional[RefreshCheckpoint] = None) -> List[Hotel]:
+        if not data:
+            return []
+        svc = HotelService(data, self._normalizer, self._merger, self._raw_hotel_db, checkpoint)
+        svc.normalize_hotels()
+        svc.merge_hotels()
+        with profile_stage('store'):
+            self._hotel_db.update_many(svc.get)
+        return svc.get
+
+
+def create_catalog_refresher(raw_hotel_db: RawHotelDB, hotel_db: BaseDB, checkpoint: bool = False) -> CatalogRefresher:
+    """
+    Build a refresher from the configuration. Full refreshes are only checkpointed when
+    `checkpoint` is set and `checkpoint_config` enables it, so one-off runs leave nothing on disk.
+    """
+    pipeline = {key: value for key, value in pipeline_config.items() if key != 'enabled'}
+    checkpoints = None
+    if checkpoint and checkpoint_config['enabled']:
+        checkpoints = CheckpointStore(checkpoint_config['root'],
+                                      keep_runs=checkpoint_config['keep_runs'],
+                                      max_resume_age=checkpoint_config['max_resume_age'])
+    return CatalogRefresher(create_suppliers(), create_normalizer(), create_merger(), raw_hotel_db, hotel_db,
+                            pipeline if pipeline_config['enabled'] else None,
+                            checkpoints, checkpoint_config['batch_size'])
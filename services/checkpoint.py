@@ -0,0 +1,246 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from models.record import HotelRecord
+from utils.exceptions import CheckpointException
+from utils.logger import logger
+
+if TYPE_CHECKING:
+    from suppliers.base_supplier import BaseSupplier
+
+
+MANIFEST = 'manifest.json'
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """
+    Write a file through a temporary path and rename it into place, so readers never see a partial file.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class RefreshCheckpoint:
+    """
+    The checkpoints of one full refresh, kept in a run directory:
+
+        manifest.json                      run status and the checkpoints written so far
+        fetched/<supplier>.json            the supplier's raw records as fetched
+        normalized/<supplier>/<n>.json     the n-th batch of the supplier's normalized hotels
+
+    Every file is renamed into place after being written, so a checkpoint
+    that exists is complete and a crash never leaves a half-written one that
+    a resumed run would trust. The manifest counts checkpoints for
+    inspection; it is saved when a supplier is fetched and when the run ends.
+    """
+
+    def __init__(self, path: str, manifest: dict):
+        self.path = path
+        self.manifest = manifest
+        self._lock = threading.Lock()
+
+    @property
+    def run_id(self) -> str:
+        return self.manifest['run_id']
+
+    @property
+    def batch_size(self) -> int:
+        return self.manifest['batch_size']
+
+    def _supplier(self, supplier: str) -> dict:
+        return self.manifest['suppliers'].setdefault(supplier, {'records': None, 'batches': 0})
+
+    def _save_manifest(self) -> None:
+        self.manifest['updated'] = time.time()
+        _write_atomic(os.path.join(self.path, MANIFEST), json.dumps(self.manifest, indent=2).encode())
+
+    def _fetched_path(self, supplier: str) -> str:
+        return os.path.join(self.path, 'fetched', f'{supplier}.json')
+
+    def _batch_path(self, supplier: str, index: int) -> str:
+        return os.path.join(self.path, 'normalized', supplier, f'{index:06d}.json')
+
+    def fetched(self, supplier: str) -> Optional[List[dict]]:
+        """
+        Return the supplier's checkpointed raw records, or None if it has not been fetched in this run.
+        """
+        try:
+            with open(self._fetched_path(supplier), 'rb') as f:
+                return json.loads(f.read())
+        except FileNotFoundError:
+            return None
+
+    def fetch(self, name: str, supplier: 'BaseSupplier') -> List[dict]:
+        """
+        Return the supplier's raw records from this run, fetching and checkpointing them if they are missing.
+        """
+        items = self.fetched(name)
+        if items is None:
+            items = supplier.fetch_raw()
+            self.save_fetched(name, items)
+        else:
+            logger.log(f"Loaded {len(items)} checkpointed records of supplier '{name}'.", "info")
+        return items
+
+    def save_fetched(self, supplier: str, items: List[dict]) -> None:
+        _write_atomic(self._fetched_path(supplier), json.dumps(items).encode())
+        with self._lock:
+            self._supplier(supplier)['records'] = len(items)
+            self._save_manifest()
+
+    def batch(self, supplier: str, index: int) -> Optional[Tuple[List[HotelRecord], Dict[str, str]]]:
+        """
+        Return a checkpointed batch of normalized hotels and their fingerprints, or None if it is missing.
+        The hotels were validated before they were saved, so they are loaded straight into records.
+        """
+        try:
+            with open(self._batch_path(supplier, index), 'rb') as f:
+                batch = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        return [HotelRecord.from_dict(hotel) for hotel in batch['hotels']], batch['digests']
+
+    def save_batch(self, supplier: str, index: int, hotels: List[HotelRecord],
+                   digests: Optional[Dict[str, str]] = None) -> None:
+        batch = {
+            'hotels': [hotel.to_dict() for hotel in hotels],
+            'digests': digests or {},
+        }
+        _write_atomic(self._batch_path(supplier, index), json.dumps(batch).encode())
+        with self._lock:
+            self._supplier(supplier)['batches'] += 1
+
+    def save(self) -> None:
+        with self._lock:
+            self._save_manifest()
+
+    def resume(self) -> None:
+        with self._lock:
+            # Batches written after the manifest was last saved are still valid; count them again
+            for supplier, entry in self.manifest['suppliers'].items():
+                directory = os.path.join(self.path, 'normalized', supplier)
+                entry['batches'] = len([name for name in os.listdir(directory) if name.endswith('.json')]) \
+                    if os.path.isdir(directory) else 0
+            self.manifest['status'] = 'running'
+            self.manifest['attempts'] += 1
+            self._save_manifest()
+
+    def complete(self) -> None:
+        with self._lock:
+            self.manifest['status'] = 'completed'
+            self.manifest['error'] = None
+            self._save_manifest()
+
+    def fail(self, error: str) -> None:
+        """
+        Record why the run stopped. The run stays resumable.
+        """
+        with self._lock:
+            self.manifest['status'] = 'failed'
+            self.manifest['error'] = error
+            self._save_manifest()
+
+
+class CheckpointStore:
+    """
+    Keeps refresh runs under a root directory, one subdirectory per run.
+    Starting a run resumes the latest unfinished one when it is recent enough
+    and was checkpointed with the same mode and batch size; otherwise a new
+    run is created. Superseded unfinished runs are removed, and only the
+    newest `keep_runs` completed runs are kept.
+    The store assumes a single refreshing process per root directory.
+    """
+
+    def __init__(self, root: str, keep_runs: int = 3, max_resume_age: float = 3600):
+        self.root = root
+        self._keep_runs = keep_runs
+        self._max_resume_age = max_resume_age
+
+    def _runs(self) -> List[Tuple[str, Optional[dict]]]:
+        """
+        List run directories with their manifests, newest first. Unreadable manifests are returned as None.
+        """
+        if not os.path.isdir(self.root):
+            return []
+        runs = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if not os.path.isdir(path):
+                continue
+            try:
+                with open(os.path.join(path, MANIFEST), 'rb') as f:
+                    manifest = json.loads(f.read())
+            except (OSError, ValueError):
+                manifest = None
+            runs.append((path, manifest))
+        runs.sort(key=lambda run: run[1]['created'] if run[1] else 0, reverse=True)
+        return runs
+
+    def start(self, mode: str, batch_size: int) -> RefreshCheckpoint:
+        """
+        Resume the latest unfinished run that matches `mode` and `batch_size`, or begin a new one.
+        """
+        now = time.time()
+        for path, manifest in self._runs():
+            if manifest is None or manifest['status'] == 'completed':
+                continue
+            # Only the latest unfinished run is a candidate; older ones were already superseded
+            if (manifest['mode'] == mode and manifest['batch_size'] == batch_size
+                    and now - manifest['created'] <= self._max_resume_age):
+                checkpoint = RefreshCheckpoint(path, manifest)
+                checkpoint.resume()
+                logger.log(f"Resuming refresh run '{checkpoint.run_id}' (attempt {manifest['attempts']}).", "info")
+                self.collect(checkpoint)
+                return checkpoint
+            break
+
+        run_id = f"{time.strftime('%Y%m%dT%H%M%S', time.gmtime(now))}-{uuid.uuid4().hex[:8]}"
+        checkpoint = RefreshCheckpoint(os.path.join(self.root, run_id), {
+            'run_id': run_id,
+            'mode': mode,
+            'batch_size': batch_size,
+            'status': 'running',
+            'attempts': 1,
+            'created': now,
+            'updated': now,
+            'error': None,
+            'suppliers': {},
+        })
+        try:
+            checkpoint.save()
+        except OSError as e:
+            raise CheckpointException(f"Error creating refresh run in {self.root}: {e}")
+        logger.log(f"Started refresh run '{run_id}'.", "info")
+        self.collect(checkpoint)
+        return checkpoint
+
+    def collect(self, current: Optional[RefreshCheckpoint] = None) -> int:
+        """
+        Remove unfinished runs other than `current` and completed runs beyond the newest `keep_runs`.
+        Returns the number of run directories removed.
+        """
+        removed = 0
+        completed = 0
+        for path, manifest in self._runs():
+            is_current = current is not None and os.path.abspath(path) == os.path.abspath(current.path)
+            if manifest is not None and manifest['status'] == 'completed':
+                completed += 1
+                if completed <= self._keep_runs or is_current:
+                    continue
+            elif is_current:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+        if removed:
+            logger.log(f"Removed {removed} old refresh runs from {self.root}.", "info")
+        return removed
@@ -1,16 +1,31 @@
-from models.hotel import Hotel
+from models.hotel import Hotel, FieldSet, HotelResponseProjection, hotel_response
+from models.record import HotelRecord
+import hashlib
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from bisect import bisect_right, insort
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
 from utils.exceptions import DBException
 from utils.logger import logger
+from utils.metrics import metrics
+from services.cache import HotCache
+
+if TYPE_CHECKING:
+    # Only the tiered backend needs the SQLite store, and database.hotel imports it on demand
+    from services.storage import DiskHotelStore
+
+DB_WRITES = metrics.counter('db_writes', 'Hotels written to the merged hotel database.')
+DB_LOOKUPS = metrics.counter('db_lookups', 'Hotel lookups by ID in the merged hotel database.', ['result'])
 
 
 class BaseDB(ABC):
-    def __init__(self) -> None:
+    def __init__(self, projection: Optional[HotelResponseProjection] = None) -> None:
         """
         Base database class to define the common interface for database operations.
+
+        :param projection: Encodes a hotel into the response fragments served by the API
         """
         self._length = 0
+        self._projection = projection or hotel_response
 
     @abstractmethod
     def update_one(self, hotel: Hotel) -> Optional[Hotel]:
@@ -26,6 +41,13 @@ class BaseDB(ABC):
         """
         pass
     
+    @abstractmethod
+    def delete_many(self, hotel_ids: List[str]) -> int:
+        """
+        Remove the records of multiple hotels from the database. Returns the number removed.
+        """
+        pass
+
     @abstractmethod
     def find(self, hotel_id: str, destination_id: Optional[str]) -> Optional[Hotel]:
         """
@@ -40,6 +62,73 @@ class BaseDB(ABC):
         """
         pass
 
+    @abstractmethod
+    def ids(self) -> Iterable[str]:
+        """
+        Get the IDs of every hotel in the database.
+        """
+        pass
+
+    def find_many(self, hotel_ids: List[str]) -> List[Optional[Hotel]]:
+        """
+        Look up several hotels by ID in one pass.
+        Returns one entry per requested ID, in order, with None for unknown IDs.
+        """
+        return [self.find(hotel_id) for hotel_id in hotel_ids]
+
+    def find_page(self,
+                  after: Optional[str],
+                  limit: int,
+                  hotel_ids: Optional[List[str]] = None,
+                  destination_ids: Optional[List[int]] = None) -> Tuple[List[Hotel], Optional[str]]:
+        """
+        Find up to `limit` hotels ordered by ID, starting after the hotel ID `after`.
+        Returns the page and the ID to resume from, or None when there are no more hotels.
+        """
+        raise DBException(f"{type(self).__name__} does not support paginated reads")
+
+    def count(self, hotel_ids: Optional[List[str]] = None, destination_ids: Optional[List[int]] = None) -> int:
+        """
+        Count the hotels matching the same filters as find_all.
+        """
+        if not hotel_ids or not destination_ids:
+            return self.length()
+        return len(self.find_all(hotel_ids, destination_ids))
+
+    def encoded(self, hotel: Hotel, field_set: Optional[FieldSet] = None) -> bytes:
+        """
+        Get the serialized response for a hotel returned by this database,
+        optionally projected down to a set of fields.
+        Selections of whole top-level fields are assembled from per-field fragments.
+        """
+        if field_set is None:
+            return self._fragment(hotel)
+        if field_set.top_level is not None:
+            return self._projection.join_fields(self._field_fragments(hotel), field_set.top_level)
+        return self._projection.dump_json(hotel, field_set)
+
+    def version(self, hotel: Hotel) -> str:
+        """
+        Get the content version of a hotel: a hash of its serialized response.
+        """
+        return self.content_version(self._fragment(hotel))
+
+    @staticmethod
+    def content_version(fragment: bytes) -> str:
+        return hashlib.blake2b(fragment, digest_size=12).hexdigest()
+
+    def _fragment(self, hotel: Hotel) -> bytes:
+        """
+        Get the full response fragment for a hotel.
+        """
+        return self._projection.dump_json(hotel)
+
+    def _field_fragments(self, hotel: Hotel) -> dict[str, bytes]:
+        """
+        Get the response fragment of every top-level field of a hotel.
+        """
+        return self._projection.split_fragment(self._fragment(hotel))
+
     def length(self) -> int:
         """
         Get the total number of records in the database.
@@ -52,34 +141,122 @@ class HotelDB(BaseDB):
     A simple database to store unique hotels by their ID.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, projection: Optional[HotelResponseProjection] = None):
+        super().__init__(projection)
         self.data: dict[str, Hotel] = {}
+        # Hotel IDs kept in sorted order so pages can be served by key
+        self._index: list[str] = []
+        # Serialized response fragments, rebuilt whenever a hotel is written
+        self._encoded: dict[str, bytes] = {}
+        # Per-field fragments, split lazily from the full fragment on the first sparse read
+        self._encoded_fields: dict[str, dict[str, bytes]] = {}
+        # Content versions, hashed from the response fragment when a hotel is written
+        self._versions: dict[str, str] = {}
 
     def update_one(self, hotel: Hotel) -> Hotel:
         """
         Add or update a hotel record. If the hotel ID is new, increase the count.
         """
-        if hotel.hotel_id not in self.data:
-            self._length += 1
-        self.data[hotel.hotel_id] = hotel
-        logger.log(f"Updated HotelDB with hotel ID {hotel.hotel_id}.", "info")
+        if self._store(hotel):
+            # Indexed after the record is stored, so readers never see an ID without its hotel
+            insort(self._index, hotel.hotel_id)
         return hotel
+
+    def _store(self, hotel: Hotel) -> bool:
+        """
+        Store a hotel and its response fragment without indexing it.
+        Returns whether the hotel ID is new.
+        """
+        is_new = hotel.hotel_id not in self.data
+        DB_WRITES.inc()
+        self.data[hotel.hotel_id] = hotel
+        if is_new:
+            self._length += 1
+        self._encoded.pop(hotel.hotel_id, None)
+        self._encoded_fields.pop(hotel.hotel_id, None)
+        self._versions.pop(hotel.hotel_id, None)
+        try:
+            fragment = self._projection.dump_json(hotel)
+            self._encoded[hotel.hotel_id] = fragment
+            self._versions[hotel.hotel_id] = self.content_version(fragment)
+        except Exception as e:
+            logger.log(f"Failed to serialize hotel ID {hotel.hotel_id}, it will be encoded on read: {e}", "warning")
+        logger.log("Updated HotelDB with hotel ID %s.", "info", hotel.hotel_id)
+        return is_new
+
+    def _fragment(self, hotel: Hotel) -> bytes:
+        """
+        Get the cached response fragment for a hotel, encoding it only if the cache is cold.
+        """
+        data = self._encoded.get(hotel.hotel_id)
+        if data is None or self.data.get(hotel.hotel_id) is not hotel:
+            return self._projection.dump_json(hotel)
+        return data
+
+    def version(self, hotel: Hotel) -> str:
+        """
+        Get the content version recorded when the hotel was written.
+        """
+        version = self._versions.get(hotel.hotel_id)
+        if version is None or self.data.get(hotel.hotel_id) is not hotel:
+            return super().version(hotel)
+        return version
+
+    def _field_fragments(self, hotel: Hotel) -> dict[str, bytes]:
+        """
+        Get the cached per-field fragments for a hotel, splitting the full fragment on first use.
+        """
+        if self.data.get(hotel.hotel_id) is not hotel:
+            return super()._field_fragments(hotel)
+        fields = self._encoded_fields.get(hotel.hotel_id)
+        if fields is None:
+            fields = super()._field_fragments(hotel)
+            self._encoded_fields[hotel.hotel_id] = fields
+        return fields
     
     def update_many(self, hotels: List[Hotel]) -> List[Hotel]:
         """
         Add or update multiple hotel records.
+        New IDs are indexed with a single sort rather than one insertion each.
         """
-        for hotel in hotels:
-            self.update_one(hotel)
+        new_ids = [hotel.hotel_id for hotel in hotels if self._store(hotel)]
+        if new_ids:
+            # The sorted index is swapped in whole, so readers see either the old or the new one
+            self._index = sorted(self._index + new_ids)
         return hotels
 
+    def delete_many(self, hotel_ids: List[str]) -> int:
+        """
+        Remove multiple hotel records and their cached fragments.
+        """
+        removed = {hotel_id for hotel_id in hotel_ids if hotel_id in self.data}
+        if not removed:
+            return 0
+        # Unindexed before the records go, and swapped in whole, so readers never see an ID without its hotel
+        self._index = [hotel_id for hotel_id in self._index if hotel_id not in removed]
+        for hotel_id in removed:
+            self.data.pop(hotel_id, None)
+            self._encoded.pop(hotel_id, None)
+            self._encoded_fields.pop(hotel_id, None)
+            self._versions.pop(hotel_id, None)
+        self._length -= len(removed)
+        logger.log("Removed %s hotels from HotelDB.", "info", len(removed))
+        return len(removed)
+
+    def ids(self) -> List[str]:
+        """
+        Get the IDs of every hotel, in ID order.
+        """
+        return self._index
+
     def find_all(self, hotel_ids: Optional[List[str]], destination_ids: Optional[List[str]]) -> Optional[List[Hotel]]:
         """
         Retrieve all hotels with the given ID.
         """
         if not hotel_ids or not destination_ids:
-            return list(self.data.values())
+            # In ID order, like paginated reads, so listings do not depend on write order
+            hotels = [self.data.get(hotel_id) for hotel_id in self._index]
+            return [hotel for hotel in hotels if hotel is not None]
 
         hotel_ids = set(hotel_ids)
         destination_ids = set(destination_ids)
@@ -98,20 +275,65 @@ class HotelDB(BaseDB):
             logger.log(f"Failed to find hotels in HotelDB: {e}", "error")
             raise DBException(f"Error finding hotels in HotelDB: {e}")  
 
+    def find_many(self, hotel_ids: List[str]) -> List[Optional[Hotel]]:
+        """
+        Retrieve several hotels by ID with a single log line instead of one per lookup.
+        """
+        hotels = [self.data.get(hotel_id) for hotel_id in hotel_ids]
+        found = sum(hotel is not None for hotel in hotels)
+        DB_LOOKUPS.inc(found, result='hit')
+        DB_LOOKUPS.inc(len(hotel_ids) - found, result='miss')
+        logger.log("Found %s of %s requested hotels in HotelDB.", "info", found, len(hotel_ids))
+        return hotels
+
+    def find_page(self, after, limit, hotel_ids = None, destination_ids = None):
+        """
+        Retrieve a page of hotels from the sorted ID index.
+        Only the requested page is touched, so a full crawl is linear in the catalog size.
+        """
+        try:
+            if not hotel_ids or not destination_ids:
+                index = self._index
+                start = bisect_right(index, after) if after is not None else 0
+                page_ids = index[start:start + limit]
+                # Hotels removed since the page was sliced are skipped
+                hotels = [hotel for hotel in map(self.data.get, page_ids) if hotel is not None]
+                has_more = start + limit < len(index)
+                return hotels, (page_ids[-1] if has_more and page_ids else None)
+
+            candidates = sorted(set(hotel_ids))
+            start = bisect_right(candidates, after) if after is not None else 0
+            destination_ids = set(destination_ids)
+            hotels = []
+            for hotel_id in candidates[start:]:
+                hotel = self.data.get(hotel_id)
+                if not hotel or hotel.destination_id not in destination_ids:
+                    continue
+                if len(hotels) == limit:
+                    return hotels, hotels[-1].hotel_id
+                hotels.append(hotel)
+            return hotels, None
+
+        except Exception as e:
+            logger.log(f"Failed to find hotel page in HotelDB: {e}", "error")
+            raise DBException(f"Error finding hotel page in HotelDB: {e}")
+
 
     def find(self, hotel_id, destination_id = None) -> Optional[Hotel]:
         """
         Retrieve a single hotel by its ID.
         """
         if destination_id:
-            logger.log(f"Searching for hotel ID {hotel_id} in HotelDB with destination ID {destination_id}.", "info")
+            logger.log("Searching for hotel ID %s in HotelDB with destination ID %s.", "info", hotel_id, destination_id)
             return self.find_by_id_and_destination(hotel_id, destination_id)
         
         hotel = self.data.get(hotel_id, None)
         if hotel:
-            logger.log(f"Found hotel ID {hotel_id} in HotelDB.", "info")
+            DB_LOOKUPS.inc(result='hit')
+            logger.log("Found hotel ID %s in HotelDB.", "info", hotel_id)
         else:
-            logger.log(f"Hotel ID {hotel_id} not found in HotelDB.", "warning")
+            DB_LOOKUPS.inc(result='miss')
+            logger.log("Hotel ID %s not found in HotelDB.", "warning", hotel_id)
             
         return hotel
     
@@ -122,27 +344,274 @@ class HotelDB(BaseDB):
         hotel = self.data.get(hotel_id, None)
         
         if not hotel:
-            logger.log(f"Hotel ID {hotel_id} not found in HotelDB.", "warning")
+            DB_LOOKUPS.inc(result='miss')
+            logger.log("Hotel ID %s not found in HotelDB.", "warning", hotel_id)
             return None
+        DB_LOOKUPS.inc(result='hit')
         
         if hotel.destination_id != destination_id:
-            logger.log(f"Hotel ID {hotel_id} does not match destination ID {destination_id}.", "warning")
+            logger.log("Hotel ID %s does not match destination ID %s.", "warning", hotel_id, destination_id)
             return None
             
         return hotel
         
 
 
+class ColdScan:
+    """
+    A lazy, re-iterable view of every hotel in a TieredHotelDB, in ID order.
+    Each pass pages through the disk tier, so at most one page of rows is held at a time.
+    Passes read the store as it is when they run, so writes between two passes show up in the second.
+    """
+
+    def __init__(self, db: 'TieredHotelDB'):
+        self._db = db
+
+    def __iter__(self) -> Iterator[Hotel]:
+        for hotel_id, _, data in self._db._cold.iter_all():
+            yield self._db._peek(hotel_id) or Hotel.model_validate_json(data)
+
+
+class TieredHotelDB(BaseDB):
+    """
+    A hotel database that keeps a bounded hot set in memory and every hotel on disk.
+    Writes go through to the disk tier; reads are served from the hot cache and
+    fall back to the disk tier on a miss.
+    """
+
+    def __init__(self,
+                 cold_store: 'DiskHotelStore',
+                 hot_cache: HotCache,
+                 projection: Optional[HotelResponseProjection] = None):
+        super().__init__(projection)
+        self._cold = cold_store
+        self._hot = hot_cache
+        self._length = self._cold.count()
+
+    def update_one(self, hotel: Hotel) -> Hotel:
+        """
+        Add or update a hotel record on disk, refreshing it in the hot cache if present.
+        """
+        try:
+            data = hotel.model_dump_json(by_alias=False).encode()
+            if self._cold.put(hotel.hotel_id, hotel.destination_id, data):
+                self._length += 1
+            self._refresh_hot(hotel, data)
+            logger.log("Updated TieredHotelDB with hotel ID %s.", "info", hotel.hotel_id)
+            return hotel
+        except Exception as e:
+            logger.log(f"Failed to update TieredHotelDB: {e}", "error")
+            raise DBException(f"Error updating TieredHotelDB: {e}")
+
+    def update_many(self, hotels: List[Hotel]) -> List[Hotel]:
+        """
+        Add or update multiple hotel records in a single disk transaction.
+        """
+        try:
+            rows = []
+            for hotel in hotels:
+                data = hotel.model_dump_json(by_alias=False).encode()
+                rows.append((hotel.hotel_id, hotel.destination_id, data))
+                self._refresh_hot(hotel, data)
+            self._length += self._cold.put_many(rows)
+            logger.log("Updated TieredHotelDB with %s hotels.", "info", len(rows))
+            return hotels
+        except Exception as e:
+            logger.log(f"Failed to update TieredHotelDB: {e}", "error")
+            raise DBException(f"Error updating TieredHotelDB: {e}")
+
+    def delete_many(self, hotel_ids: List[str]) -> int:
+        """
+        Remove multiple hotel records from disk and from the hot cache.
+        """
+        try:
+            hotel_ids = list(dict.fromkeys(hotel_ids))
+            removed = self._cold.delete_many(hotel_ids)
+            for hotel_id in hotel_ids:
+                self._hot.remove(hotel_id)
+            self._length -= removed
+            logger.log("Removed %s hotels from TieredHotelDB.", "info", removed)
+            return removed
+        except Exception as e:
+            logger.log(f"Failed to remove hotels from TieredHotelDB: {e}", "error")
+            raise DBException(f"Error removing hotels from TieredHotelDB: {e}")
+
+    def ids(self) -> Iterator[str]:
+        """
+        Iterate over the IDs of every hotel on disk, in ID order.
+        """
+        return self._cold.iter_ids()
+
+    def find(self, hotel_id, destination_id = None) -> Optional[Hotel]:
+        """
+        Retrieve a single hotel by its ID, optionally checking its destination.
+        """
+        hotel = self._get(hotel_id)
+        if not hotel:
+            logger.log("Hotel ID %s not found in TieredHotelDB.", "warning", hotel_id)
+            return None
+
+        if destination_id and hotel.destination_id != destination_id:
+            logger.log("Hotel ID %s does not match destination ID %s.", "warning", hotel_id, destination_id)
+            return None
+
+        logger.log("Found hotel ID %s in TieredHotelDB.", "info", hotel_id)
+        return hotel
+
+    def find_all(self, hotel_ids: Optional[List[str]], destination_ids: Optional[List[str]]) -> Optional[Iterable[Hotel]]:
+        """
+        Retrieve all hotels with the given IDs and destinations.
+        Full scans return a lazy view of the disk tier, so they neither load the
+        catalog into memory nor flush the hot set.
+        """
+        try:
+            if not hotel_ids or not destination_ids:
+                return ColdScan(self)
+
+            destination_ids = set(destination_ids)
+            hotels = []
+            for hotel_id in set(hotel_ids):
+                hotel = self._get(hotel_id)
+                if hotel and hotel.destination_id in destination_ids:
+                    hotels.append(hotel)
+            return hotels
+
+        except Exception as e:
+            logger.log(f"Failed to find hotels in TieredHotelDB: {e}", "error")
+            raise DBException(f"Error finding hotels in TieredHotelDB: {e}")
+
+    def find_many(self, hotel_ids: List[str]) -> List[Optional[Hotel]]:
+        """
+        Retrieve several hotels by ID, serving hot hotels from memory and
+        paging all misses in from disk with one batched read.
+        """
+        try:
+            found = {}
+            missing = []
+            for hotel_id in dict.fromkeys(hotel_ids):
+                entry = self._hot.get(hotel_id)
+                if entry is not None:
+                    found[hotel_id] = entry[0]
+                else:
+                    missing.append(hotel_id)
+
+            for hotel_id, (_, data) in self._cold.get_many(missing).items():
+                found[hotel_id] = self._admit(hotel_id, data)
+
+            logger.log("Found %s of %s requested hotels in TieredHotelDB (%s read from disk).",
+                       "info", len(found), len(hotel_ids), len(missing))
+            return [found.get(hotel_id) for hotel_id in hotel_ids]
+
+        except Exception as e:
+            logger.log(f"Failed to find hotels in TieredHotelDB: {e}", "error")
+            raise DBException(f"Error finding hotels in TieredHotelDB: {e}")
+
+    def find_page(self, after, limit, hotel_ids = None, destination_ids = None):
+        """
+        Retrieve a page of hotels by seeking the disk tier's primary key index.
+        """
+        try:
+            if not hotel_ids or not destination_ids:
+                rows = self._cold.page(after, limit + 1)
+                hotels = [self._peek(hotel_id) or Hotel.model_validate_json(data)
+                          for hotel_id, _, data in rows[:limit]]
+                return hotels, (rows[limit - 1][0] if len(rows) > limit else None)
+
+            candidates = sorted(set(hotel_ids))
+            start = bisect_right(candidates, after) if after is not None else 0
+            destination_ids = set(destination_ids)
+            hotels = []
+            for hotel_id in candidates[start:]:
+                hotel = self._get(hotel_id)
+                if not hotel or hotel.destination_id not in destination_ids:
+                    continue
+                if len(hotels) == limit:
+                    return hotels, hotels[-1].hotel_id
+                hotels.append(hotel)
+            return hotels, None
+
+        except Exception as e:
+            logger.log(f"Failed to find hotel page in TieredHotelDB: {e}", "error")
+            raise DBException(f"Error finding hotel page in TieredHotelDB: {e}")
+
+    def _fragment(self, hotel: Hotel) -> bytes:
+        """
+        Get the response fragment cached next to a hot hotel, encoding cold hotels on demand.
+        """
+        entry = self._hot.peek(hotel.hotel_id)
+        if entry is not None and entry[0] is hotel:
+            return entry[1]
+        return self._projection.dump_json(hotel)
+
+    def version(self, hotel: Hotel) -> str:
+        """
+        Get the content version cached next to a hot hotel, hashing cold hotels on demand.
+        """
+        entry = self._hot.peek(hotel.hotel_id)
+        if entry is not None and entry[0] is hotel:
+            return entry[2]
+        return super().version(hotel)
+
+    def _get(self, hotel_id: str) -> Optional[Hotel]:
+        """
+        Look a hotel up in the hot cache, paging it in from disk on a miss.
+        """
+        entry = self._hot.get(hotel_id)
+        if entry is not None:
+            return entry[0]
+
+        row = self._cold.get(hotel_id)
+        if row is None:
+            return None
+
+        return self._admit(hotel_id, row[1])
+
+    def _admit(self, hotel_id: str, data: bytes) -> Hotel:
+        """
+        Decode a hotel read from disk and offer it to the hot cache with its fragment and version.
+        """
+        hotel = Hotel.model_validate_json(data)
+        fragment = self._projection.dump_json(hotel)
+        self._hot.admit(hotel_id, (hotel, fragment, self.content_version(fragment)), len(data) + len(fragment))
+        return hotel
+
+    def _peek(self, hotel_id: str) -> Optional[Hotel]:
+        entry = self._hot.peek(hotel_id)
+        return entry[0] if entry is not None else None
+
+    def _refresh_hot(self, hotel: Hotel, data: bytes) -> None:
+        """
+        Replace a hot entry, its response fragment and version after a write; cold hotels stay on disk.
+        """
+        if hotel.hotel_id not in self._hot:
+            return
+        fragment = self._projection.dump_json(hotel)
+        self._hot.replace(hotel.hotel_id, (hotel, fragment, self.content_version(fragment)), len(data) + len(fragment))
+
+    def stats(self) -> dict:
+        """
+        Get hit-rate and occupancy metrics for both tiers.
+        """
+        return {
+            'hot': self._hot.stats(),
+            'cold': {'items': self._length, 'path': self._cold.path},
+        }
+
+    def close(self) -> None:
+        self._cold.close()
+
+
 class RawHotelDB(BaseDB):
     """
     A database for storing raw hotel data from multiple sources.
+    Holds the normalized records of each source, which are only ever merged, never served.
     """
 
     def __init__(self):
         super().__init__()
-        self.data: dict[str, dict[str, Hotel]] = {}
+        self.data: dict[str, dict[str, HotelRecord]] = {}
 
-    def update_one(self, hotel: Hotel) -> Hotel:
+    def update_one(self, hotel: HotelRecord) -> HotelRecord:
         """
         Add or update a raw hotel record. Tracks multiple sources for the same hotel ID.
         """
@@ -154,14 +623,13 @@ class RawHotelDB(BaseDB):
             else:
                 self.data[hotel.hotel_id] = {hotel.source: hotel}
                 self._length += 1
-            logger.log(
-                f"Updated RawHotelDB with hotel ID {hotel.hotel_id} from source {hotel.source}.", "info")
+            logger.log("Updated RawHotelDB with hotel ID %s from source %s.", "info", hotel.hotel_id, hotel.source)
             return hotel
         except Exception as e:
             logger.log(f"Failed to update RawHotelDB: {e}", "error")
             raise DBException(f"Error updating RawHotelDB: {e}")
     
-    def update_many(self, hotels: List[Hotel]) -> List[Hotel]:
+    def update_many(self, hotels: List[HotelRecord]) -> List[HotelRecord]:
         """
         Add or update multiple raw hotel records.
         """
@@ -169,22 +637,53 @@ class RawHotelDB(BaseDB):
             self.update_one(hotel)
         return hotels
     
-    def find(self, hotel_id: str, destination_id = None) -> Optional[Hotel]:
+    def delete_one(self, hotel_id: str, source: Optional[str] = None) -> int:
+        """
+        Remove the record of a hotel from one source, or from every source if none is given.
+        Returns the number of records removed.
+        """
+        records = self.data.get(hotel_id)
+        if not records:
+            return 0
+        if source is None:
+            removed = len(records)
+            del self.data[hotel_id]
+        else:
+            removed = int(records.pop(source, None) is not None)
+            if not records:
+                del self.data[hotel_id]
+        self._length -= removed
+        logger.log("Removed %s records of hotel ID %s from RawHotelDB.", "info", removed, hotel_id)
+        return removed
+
+    def delete_many(self, hotel_ids: List[str], source: Optional[str] = None) -> int:
+        """
+        Remove the records of multiple hotels from one source, or from every source if none is given.
+        """
+        return sum(self.delete_one(hotel_id, source) for hotel_id in hotel_ids)
+
+    def ids(self) -> List[str]:
+        """
+        Get the IDs of every hotel with a record from any source.
+        """
+        return list(self.data)
+
+    def find(self, hotel_id: str, destination_id = None) -> Optional[HotelRecord]:
         """
         Retrieve a single hotel record for the given ID across all sources.
         """
         try:
             if destination_id:
-                logger.log(f"Searching for hotel ID {hotel_id} in RawHotelDB with destination ID {destination_id}.", "info")
+                logger.log("Searching for hotel ID %s in RawHotelDB with destination ID %s.",
+                           "info", hotel_id, destination_id)
                 # return self.find_by_id_and_destination(hotel_id, destination_id)
                 return None
             
             if hotel_id in self.data:
-                logger.log(
-                    f"Found {len(self.data[hotel_id])} entries for hotel ID {hotel_id} in RawHotelDB.", "info")
+                logger.log("Found %s entries for hotel ID %s in RawHotelDB.",
+                           "info", len(self.data[hotel_id]), hotel_id)
                 return list(self.data[hotel_id].values())[0]
-            logger.log(
-                f"No entries found for hotel ID {hotel_id} in RawHotelDB.", "warning")
+            logger.log("No entries found for hotel ID %s in RawHotelDB.", "warning", hotel_id)
             return None
         except Exception as e:
             logger.log(
@@ -192,7 +691,7 @@ class RawHotelDB(BaseDB):
             raise DBException(
                 f"Error finding entries for hotel ID {hotel_id}: {e}")
 
-    def find_all(self, hotel_ids: Optional[List[str]] = [], destination_ids: Optional[List[str]] = None) -> Optional[List[Hotel]]:
+    def find_all(self, hotel_ids: Optional[List[str]] = [], destination_ids: Optional[List[str]] = None) -> Optional[List[HotelRecord]]:
         
         
         if not hotel_ids:
@@ -206,11 +705,10 @@ class RawHotelDB(BaseDB):
         try:
             for hotel_id in hotel_ids:
                 if hotel_id in self.data:
-                    logger.log(
-                        f"Found {len(self.data[hotel_id])} entries for hotel ID {hotel_id} in RawHotelDB.", "info")
+                    logger.log("Found %s entries for hotel ID %s in RawHotelDB.",
+                               "info", len(self.data[hotel_id]), hotel_id)
                     hotels.extend(list(self.data[hotel_id].values()))
-                logger.log(
-                    f"No entries found for hotel ID {hotel_id} in RawHotelDB.", "info")
+                logger.log("No entries found for hotel ID %s in RawHotelDB.", "info", hotel_id)
             return hotels
         
         except Exception as e:
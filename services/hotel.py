@@ -1,8 +1,14 @@
 from services.normalizer import DataNormalizerInterface
 from services.merger import BaseDataMerger
 from services.database import RawHotelDB
+from services.checkpoint import RefreshCheckpoint
 from utils.logger import logger
 from utils.exceptions import HotelServiceException
+from utils.metrics import metrics
+from utils.profiler import stage as profile_stage
+
+STAGE_SECONDS = metrics.histogram('refresh_stage_seconds', 'Time spent in a refresh stage per call.', ['stage'])
+STAGE_HOTELS = metrics.counter('refresh_stage_hotels', 'Hotels output by a refresh stage.', ['stage'])
 
 
 class HotelService:
@@ -10,14 +16,17 @@ class HotelService:
                  data,
                  normalizer: DataNormalizerInterface,
                  merger: BaseDataMerger,
-                 raw_hotel_db: RawHotelDB = None):
+                 raw_hotel_db: RawHotelDB = None,
+                 checkpoint: RefreshCheckpoint = None):
         """
         Initialize the HotelService class with hotel data, normalizer, merger, and optional raw hotel database.
+        With a checkpoint, normalization runs in batches per supplier that are saved to and resumed from it.
         """
         self.data = data
         self._normalizer = normalizer
         self._merger = merger
         self._raw_hotel_db = raw_hotel_db
+        self._checkpoint = checkpoint
 
     @property
     def get(self):
@@ -28,28 +37,53 @@ class HotelService:
 
     def normalize_hotels(self):
         """
-        Normalize hotel data using the provided normalizer.
+        Normalize hotel data using the provided normalizer, turning parsed hotels into records.
         If a raw hotel database is available, update it with normalized data.
         """
         try:
-            self.data = self._normalizer.normalize(self.data)
-            logger.log(
-                f"Successfully normalized {len(self.data)} hotels.", "info")
+            with STAGE_SECONDS.time(stage='normalize'), profile_stage('normalize'):
+                if self._checkpoint:
+                    self.data = self._normalize_checkpointed()
+                else:
+                    self.data = self._normalizer.normalize(self.data)
+            STAGE_HOTELS.inc(len(self.data), stage='normalize')
+            logger.log("Successfully normalized %s hotels.", "info", len(self.data))
             if self._raw_hotel_db:
                 self._update_raw_hotel_db()
         except Exception as e:
             logger.log(f"Error during normalization: {e}", "error")
             raise HotelServiceException(f"Normalization failed: {e}")
 
+    def _normalize_checkpointed(self):
+        """
+        Normalize each supplier's hotels in batches, reusing batches already checkpointed in this run.
+        """
+        hotels_by_source = {}
+        for hotel in self.data:
+            hotels_by_source.setdefault(hotel.source, []).append(hotel)
+
+        normalized = []
+        batch_size = self._checkpoint.batch_size
+        for source, hotels in hotels_by_source.items():
+            for index, start in enumerate(range(0, len(hotels), batch_size)):
+                saved = self._checkpoint.batch(source, index)
+                if saved is not None:
+                    normalized.extend(saved[0])
+                    continue
+                batch = self._normalizer.normalize(hotels[start:start + batch_size])
+                self._checkpoint.save_batch(source, index, batch)
+                normalized.extend(batch)
+        return normalized
+
     def _update_raw_hotel_db(self):
         """
         Update the raw hotel database with normalized data.
         """
         try:
-            for hotel in self.data:
-                self._raw_hotel_db.update_one(hotel)
-            logger.log(
-                f"Updated raw hotel database with {len(self.data)} hotels.", "info")
+            with profile_stage('store'):
+                for hotel in self.data:
+                    self._raw_hotel_db.update_one(hotel)
+            logger.log("Updated raw hotel database with %s hotels.", "info", len(self.data))
         except Exception as e:
             logger.log(f"Failed to update raw hotel database: {e}", "error")
             raise HotelServiceException(
@@ -60,13 +94,14 @@ class HotelService:
         Merge hotels with the same ID. Uses the raw hotel database if available.
         """
         try:
-            hotels_map_by_id = self._group_hotels_by_id()
-            if self._raw_hotel_db:
-                self._merge_hotels_with_db(hotels_map_by_id)
-            else:
-                self._merge_hotels_without_db(hotels_map_by_id)
-            logger.log(
-                f"Successfully merged hotels. Total merged hotels: {len(self.data)}.", "info")
+            with STAGE_SECONDS.time(stage='merge'), profile_stage('merge'):
+                hotels_map_by_id = self._group_hotels_by_id()
+                if self._raw_hotel_db:
+                    self._merge_hotels_with_db(hotels_map_by_id)
+                else:
+                    self._merge_hotels_without_db(hotels_map_by_id)
+            STAGE_HOTELS.inc(len(self.data), stage='merge')
+            logger.log("Successfully merged hotels. Total merged hotels: %s.", "info", len(self.data))
         except Exception as e:
             logger.log(f"Error during merging: {e}", "error")
             raise HotelServiceException(f"Merging failed: {e}")
@@ -94,8 +129,7 @@ class HotelService:
                 existing_hotels = self._raw_hotel_db.find_all([hotel_id])
                 if existing_hotels:
                     merge_batch.extend(existing_hotels)
-                logger.log(
-                    f"Found {len(merge_batch)} existing hotels for ID {hotel_id}.", "info")
+                logger.log("Found %s existing hotels for ID %s.", "info", len(merge_batch), hotel_id)
                 merged_result = self._merger.merge(merge_batch)
                 if merged_result:
                     merged_data.append(merged_result)
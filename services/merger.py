@@ -1,13 +1,21 @@
+import time
 from typing import TypeVar, List, Any
 from abc import ABC, abstractmethod
 from models.hotel import Hotel
-from models.hotel import Location, Amenities, HotelImages
+from models.record import HotelRecord, LocationRecord, AmenitiesRecord, ImageRecord, ImagesRecord, as_record
 from utils.bias import Bias
 from utils.logger import logger
 from utils.exceptions import MergerException
+from utils.metrics import metrics
+from utils.urls import canonical_url
 
 T = TypeVar('T')
 
+MERGE_SECONDS = metrics.histogram('merge_seconds', 'Time to merge the records of one hotel.')
+MERGE_RECORDS = metrics.histogram('merge_records', 'Supplier records merged into one hotel.',
+                                  buckets=(1, 2, 3, 4, 5, 8, 16))
+MERGE_FAILURES = metrics.counter('merge_failures', 'Hotels that failed to merge.')
+
 
 class AttributeMerger(ABC):
     def __init__(self, bias: Bias):
@@ -64,14 +72,25 @@ class BaseDataMerger(ABC):
 
 
 class DataMerger(BaseDataMerger):
-    def merge(self, data: List[Hotel]) -> Hotel:
+    def merge(self, data: List[HotelRecord]) -> Hotel:
         """Merge hotels with the same id to a single hotel"""
         if len(data) == 0:
             return None
+        start = time.perf_counter()
         try:
-            merged_hotel = data[-1].model_copy(update=data[-1].model_dump())
-            logger.log(
-                f'Merging {len(data)} hotels with id {merged_hotel.hotel_id}', 'info')
+            merged = self._merge(data)
+        except MergerException:
+            MERGE_FAILURES.inc()
+            raise
+        MERGE_SECONDS.observe(time.perf_counter() - start)
+        MERGE_RECORDS.observe(len(data))
+        return merged
+
+    def _merge(self, data: List[HotelRecord]) -> Hotel:
+        try:
+            data = [as_record(hotel) for hotel in data]
+            merged_hotel = data[-1].copy()
+            logger.log('Merging %s hotels with id %s', 'info', len(data), merged_hotel.hotel_id)
             for field, attribute_merger in self.get_all_mergers():
                 merge_batch = []
                 for hotel in data:
@@ -89,7 +108,8 @@ class DataMerger(BaseDataMerger):
 
             try:
                 setattr(merged_hotel, 'source', 'merged')
-                return Hotel(**merged_hotel.model_dump())
+                # The one validation between parsing and storage
+                return merged_hotel.to_model()
             except Exception as e:
                 logger.log(f'Error when creating merged hotel: {e}', 'error')
                 raise MergerException(f'Error when creating merged hotel: {e}')
@@ -156,100 +176,99 @@ class DescriptionMerger(AttributeMerger):
 
 
 class LocationMerger(AttributeMerger):
-    def merge(self, data: List[dict[str, Any]] = []) -> Location:
+    def merge(self, data: List[dict[str, Any]] = []) -> LocationRecord:
         """Merge the location field"""
         if len(data) == 0 or data is None:
             return None
 
         try:
-            merged_location = {}
-            for field_name in Location.model_fields.keys():
-                merged_location[field_name] = None
+            merged_location = LocationRecord()
 
             for location in data:
-                location_data: Location = self.decode_merge_data(location)
+                location_data: LocationRecord = self.decode_merge_data(location)
 
                 if not location_data:
                     continue
 
-                for field, value in location_data.model_dump().items():
-                    if merged_location[field] is None:
-                        merged_location[field] = value
+                for field in LocationRecord.__slots__:
+                    value = getattr(location_data, field)
+                    merged_value = getattr(merged_location, field)
+                    if merged_value is None:
+                        setattr(merged_location, field, value)
                         continue
                     if isinstance(value, str):
-                        merged_location[field] = max(
-                            merged_location[field], value, key=len)
+                        setattr(merged_location, field, max(merged_value, value, key=len))
 
-            return Location(**merged_location)
+            return merged_location
         except Exception as e:
             logger.log(f'Error when merging location field: {e}', 'error')
             raise MergerException(f'Error when merging location field: {e}')
 
 
 class AmenitiesMerger(AttributeMerger):
-    def merge(self, data: List[dict[str, Any]] = []) -> Amenities:
+    def merge(self, data: List[dict[str, Any]] = []) -> AmenitiesRecord:
         if len(data) == 0 or data is None:
             return None
 
         try:
-            merged_amenities = {}
-            for field_name in Amenities.model_fields.keys():
-                merged_amenities[field_name] = []
+            merged_amenities = AmenitiesRecord(general=[], room=[])
 
             for amenities in filter(None, data):
-                amenities_data: Amenities = self.decode_merge_data(amenities)
+                amenities_data: AmenitiesRecord = self.decode_merge_data(amenities)
                 if not amenities_data:
                     continue
-                for field, amenities_list in amenities_data.model_dump().items():
+                for field in AmenitiesRecord.__slots__:
+                    amenities_list = getattr(amenities_data, field)
                     if not amenities_list:
                         continue
+                    merged_list = getattr(merged_amenities, field)
                     for amenity in amenities_list:
-                        if amenity not in merged_amenities[field]:
-                            merged_amenities[field].append(amenity)
+                        if amenity not in merged_list:
+                            merged_list.append(amenity)
 
-            return Amenities(**merged_amenities)
+            return merged_amenities
         except Exception as e:
             logger.log(f'Error when merging amenities field: {e}', 'error')
             raise MergerException(f'Error when merging amenities field: {e}')
 
 
 class ImagesMerger(AttributeMerger):
-    def merge(self, data: List[dict[str, Any]] = []) -> HotelImages:
+    def merge(self, data: List[dict[str, Any]] = []) -> ImagesRecord:
         if len(data) == 0 or data is None:
             return None
 
         try:
             merged_images = {}
-            for field_name in HotelImages.model_fields.keys():
+            for field_name in ImagesRecord.__slots__:
                 merged_images[field_name] = {}
 
             for images in filter(None, data):
-                images_data: HotelImages = self.decode_merge_data(images)
+                images_data: ImagesRecord = self.decode_merge_data(images)
 
                 if not images_data:
                     continue
 
-                for field, images_list in images_data.model_dump().items():
+                for field in ImagesRecord.__slots__:
+                    images_list = getattr(images_data, field)
                     if not images_list:
                         continue
 
                     for image in images_list:
-                        if image['link'] not in merged_images[field]:
-                            merged_images[field][image['link']] = image
+                        # Spellings of the same URL collapse into one image
+                        link = canonical_url(image.link)
+                        merged_image = merged_images[field].get(link)
+                        if merged_image is None:
+                            # Copied, as descriptions of merged images are updated in place
+                            merged_images[field][link] = ImageRecord(link, image.description)
                             continue
 
-                        if not image['description']:
+                        if not image.description:
                             continue
 
-                        new_description = max(
-                            merged_images[field][image['link']]['description'], image['description'], key=len)
-                        merged_images[field][image['link']
-                                             ]['description'] = new_description
-
-            merged_images = {field: list(images.values())
-                             for field, images in merged_images.items()}
+                        merged_image.description = max(merged_image.description or '', image.description, key=len)
 
-            return HotelImages(**merged_images)
+            return ImagesRecord(**{field: list(images.values())
+                                   for field, images in merged_images.items()})
         except Exception as e:
             logger.log(f'Error when merging images field: {e}', 'error')
             raise MergerException(f'Error when merging images field: {e}')
@@ -1,9 +1,11 @@
-from typing import List, Any, TypeVar
+from typing import List, Any, TypeVar, Union
 from abc import ABC, abstractmethod
-from models.hotel import Hotel, Location, Amenities, HotelImages
+from models.hotel import Hotel
+from models.record import HotelRecord, LocationRecord, AmenitiesRecord, ImagesRecord, as_record
 from utils.cleaner import Cleaner
 from utils.exceptions import NormalizerException
 from utils.logger import logger
+from utils.vocabulary import Vocabulary, vocabulary as shared_vocabulary
 
 class DataNormalizerInterface(ABC):
     @abstractmethod
@@ -15,8 +17,13 @@ T = TypeVar('T')
 
 
 class AttributeNormalizer(ABC):
-    def __init__(self, cleaner: Cleaner):
+    def __init__(self, cleaner: Cleaner, vocabulary: Vocabulary = None):
+        """
+        :param cleaner: Cleans text values
+        :param vocabulary: Interns repeated values; the shared vocabulary by default
+        """
         self.cleaner = cleaner
+        self.vocabulary = vocabulary or shared_vocabulary
 
     @abstractmethod
     def normalize(self, data: T) -> T:
@@ -27,9 +34,15 @@ class DataNormalizer(DataNormalizerInterface):
     def __init__(self, normalizers: dict[str, AttributeNormalizer]):
         self.normalizers = normalizers
 
-    def normalize(self, data: List[Hotel]) -> List[Hotel]:
+    def normalize(self, data: List[Union[Hotel, HotelRecord]]) -> List[HotelRecord]:
+        """
+        Normalize hotels into records. Validated Hotel models are converted first,
+        so fields are cleaned on plain attributes rather than through Pydantic.
+        """
+        records = []
         for hotel in data:
-            logger.log(f"Normalizing hotel {hotel.hotel_id} {hotel.source}", "info")
+            hotel = as_record(hotel)
+            logger.log("Normalizing hotel %s %s", "info", hotel.hotel_id, hotel.source)
             for field, normalizer in self.get_all_normalizers():
                 if hasattr(hotel, field):
                     try:
@@ -38,7 +51,8 @@ class DataNormalizer(DataNormalizerInterface):
                     except Exception as e:
                         raise NormalizerException(
                             f"Error normalizing field '{field}' of hotel '{hotel}'") from e
-        return data
+            records.append(hotel)
+        return records
 
     def get_all_normalizers(self):
         return self.normalizers.items()
@@ -68,7 +82,7 @@ class DescriptionNormalizer(AttributeNormalizer):
 
 
 class LocationNormalizer(AttributeNormalizer):
-    def normalize(self, data: Location) -> Location:
+    def normalize(self, data: LocationRecord) -> LocationRecord:
         """Normalize the location field."""
         try:
             if not data:
@@ -91,19 +105,19 @@ class LocationNormalizer(AttributeNormalizer):
 
 
 class AmenitiesNormalizer(AttributeNormalizer):
-    def normalize(self, data: Amenities) -> Amenities:
+    def normalize(self, data: AmenitiesRecord) -> AmenitiesRecord:
         """Normalize the amenities field."""
         try:
             if not data:
                 return data
 
             if hasattr(data, "general") and data.general:
-                data.general = [self.cleaner.clean_amenity(
-                    amenity) for amenity in data.general]
+                data.general = [self.vocabulary.intern(self.cleaner.clean_amenity(
+                    amenity)) for amenity in data.general]
 
             if hasattr(data, "room") and data.room:
-                data.room = [self.cleaner.clean_amenity(
-                    amenity) for amenity in data.room]
+                data.room = [self.vocabulary.intern(self.cleaner.clean_amenity(
+                    amenity)) for amenity in data.room]
 
             return data
         except Exception as e:
@@ -112,23 +126,19 @@ class AmenitiesNormalizer(AttributeNormalizer):
 
 
 class ImagesNormalizer(AttributeNormalizer):
-    def normalize(self, data: HotelImages) -> HotelImages:
-        """Normalize the images field."""
+    def normalize(self, data: ImagesRecord) -> ImagesRecord:
+        """
+        Normalize the images field. Links are canonicalised when images are validated;
+        captions are kept as suppliers send them, sharing one object per distinct caption.
+        """
         try:
             if not data:
                 return data
 
-            # Clean the images fields
-            if hasattr(data, "rooms") and data.rooms:
-                for image in data.rooms:
-                    if hasattr(image, "caption") and image.caption:
-                        image.caption = self.cleaner.clean_caption(
-                            image.caption)
-            if hasattr(data, "amenities") and data.amenities:
-                for image in data.amenities:
-                    if hasattr(image, "caption") and image.caption:
-                        image.caption = self.cleaner.clean_caption(
-                            image.caption)
+            for images in (data.rooms, data.site, data.amenities):
+                for image in images or ():
+                    if isinstance(image.description, str):
+                        image.description = self.vocabulary.intern(image.description)
             return data
         except Exception as e:
             raise NormalizerException(
@@ -141,7 +151,7 @@ class BookingConditionsNormalizer(AttributeNormalizer):
         try:
             if not data:
                 return data
-            return [self.cleaner.clean_text(condition) for condition in data]
+            return [self.vocabulary.intern(self.cleaner.clean_text(condition)) for condition in data]
         except Exception as e:
             raise NormalizerException(
                 f"Error normalizing booking conditions: {data}") from e
@@ -0,0 +1,245 @@
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from services.checkpoint import RefreshCheckpoint
+from services.database import BaseDB, RawHotelDB
+from services.merger import BaseDataMerger
+from services.normalizer import DataNormalizerInterface
+from suppliers.base_supplier import BaseSupplier
+from utils.exceptions import HotelServiceException
+from utils.logger import logger
+from utils.metrics import metrics
+from utils.profiler import stage as profile_stage
+
+# Shared with HotelService; in a pipelined refresh they are observed per chunk rather than per stage
+STAGE_SECONDS = metrics.histogram('refresh_stage_seconds', 'Time spent in a refresh stage per call.', ['stage'])
+STAGE_HOTELS = metrics.counter('refresh_stage_hotels', 'Hotels output by a refresh stage.', ['stage'])
+
+
+@dataclass
+class _Chunk:
+    """
+    A batch of records from one supplier, raw after fetching and HotelRecords after normalizing.
+    """
+    supplier: str
+    items: list
+    index: int = 0
+
+
+@dataclass
+class _End:
+    """
+    Marks the end of a supplier's stream. `chunks` is how many chunks it sent,
+    so the merge stage knows when every chunk has made it through the workers.
+    """
+    supplier: str
+    chunks: int
+    error: Optional[str] = None
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+_STOP = object()
+
+
+@dataclass
+class PipelineResult:
+    """
+    The outcome of a pipelined refresh.
+    """
+    fetched: Dict[str, int] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+    merged: int = 0
+    # Content hashes of each supplier's records, by hotel ID
+    fingerprints: Dict[str, Dict[str, str]] = field(default_factory=dict)
+
+
+class RefreshPipeline:
+    """
+    Streams supplier data through fetch, parse/normalize and merge stages
+    connected by bounded queues, so fetching, CPU work and publishing overlap
+    and a slow stage holds the others back instead of buffering everything.
+
+    A hotel is merged and published as soon as every supplier has either
+    delivered its record for that ID or finished its stream, which also acts
+    as the completion barrier for IDs that only some suppliers return.
+    Records are merged in supplier order, so results do not depend on which
+    supplier answered first.
+
+    With a checkpoint, fetched records and normalized chunks are saved as they
+    are produced, and a resumed run skips whatever the checkpoint already holds.
+    """
+
+    def __init__(self,
+                 suppliers: Dict[str, BaseSupplier],
+                 normalizer: DataNormalizerInterface,
+                 merger: BaseDataMerger,
+                 raw_hotel_db: RawHotelDB,
+                 hotel_db: BaseDB,
+                 fingerprint=None,
+                 checkpoint: Optional[RefreshCheckpoint] = None,
+                 chunk_size: int = 50,
+                 queue_size: int = 8,
+                 normalize_workers: int = 2):
+        self._suppliers = suppliers
+        self._order = {name: index for index, name in enumerate(suppliers)}
+        self._normalizer = normalizer
+        self._merger = merger
+        self._raw_hotel_db = raw_hotel_db
+        self._hotel_db = hotel_db
+        self._fingerprint = fingerprint
+        self._checkpoint = checkpoint
+        self._chunk_size = chunk_size
+        self._normalize_workers = normalize_workers
+        # Queue sizes are in chunks; a full queue blocks the stage feeding it
+        self._parse_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._merge_queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+
+    def run(self) -> PipelineResult:
+        result = PipelineResult()
+        threads = [threading.Thread(target=self._fetch, args=(name, supplier), name=f"fetch-{name}", daemon=True)
+                   for name, supplier in self._suppliers.items()]
+        threads += [threading.Thread(target=self._normalize, name=f"normalize-{i}", daemon=True)
+                    for i in range(self._normalize_workers)]
+        for thread in threads:
+            thread.start()
+
+        try:
+            self._merge(result)
+        finally:
+            self._stop.set()
+            for _ in range(self._normalize_workers):
+                self._put(self._parse_queue, _STOP, force=True)
+            for thread in threads:
+                thread.join()
+
+        logger.log(f"Pipelined refresh merged {result.merged} hotels from "
+                   f"{sum(result.fetched.values())} records.", "info")
+        return result
+
+    def _put(self, target: queue.Queue, item, force: bool = False) -> bool:
+        """
+        Put an item on a bounded queue, waiting while it is full unless the pipeline is stopping.
+        """
+        while force or not self._stop.is_set():
+            try:
+                target.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if force:
+                    # Shutting down: make room so the stop signal always gets through
+                    try:
+                        target.get_nowait()
+                    except queue.Empty:
+                        pass
+        return False
+
+    def _fetch(self, name: str, supplier: BaseSupplier) -> None:
+        chunks = 0
+        try:
+            items = self._checkpoint.fetch(name, supplier) if self._checkpoint else supplier.fetch_raw()
+            logger.log(f"Successfully fetched {len(items)} records from supplier '{name}'.", "info")
+            for index, start in enumerate(range(0, len(items), self._chunk_size)):
+                saved = self._checkpoint.batch(name, index) if self._checkpoint else None
+                if saved is not None:
+                    # Normalized in an earlier attempt of this run: hand it straight to the merge stage
+                    hotels, digests = saved
+                    chunk = _Chunk(name, [(hotel, digests.get(hotel.hotel_id)) for hotel in hotels], index)
+                    queued = self._put(self._merge_queue, chunk)
+                else:
+                    queued = self._put(self._parse_queue, _Chunk(name, items[start:start + self._chunk_size], index))
+                if not queued:
+                    return
+                chunks += 1
+            self._put(self._parse_queue, _End(name, chunks))
+        except Exception as e:
+            logger.log(f"Error fetching data from supplier '{name}': {e}", "error")
+            self._put(self._parse_queue, _End(name, chunks, str(e)))
+
+    def _normalize(self) -> None:
+        while True:
+            item = self._parse_queue.get()
+            if item is _STOP or self._stop.is_set():
+                return
+            if isinstance(item, _End):
+                self._put(self._merge_queue, item)
+                continue
+            try:
+                with STAGE_SECONDS.time(stage='normalize'), profile_stage('normalize'):
+                    hotels = list(self._suppliers[item.supplier].parse_all(item.items))
+                    digests = self._fingerprint(hotels) if self._fingerprint else {}
+                    hotels = self._normalizer.normalize(hotels)
+                STAGE_HOTELS.inc(len(hotels), stage='normalize')
+                if self._checkpoint:
+                    self._checkpoint.save_batch(item.supplier, item.index, hotels, digests)
+                self._put(self._merge_queue, _Chunk(item.supplier, [(hotel, digests.get(hotel.hotel_id))
+                                                                    for hotel in hotels], item.index))
+            except Exception as e:
+                logger.log(f"Error during normalization: {e}", "error")
+                self._put(self._merge_queue, _Failure(e))
+                return
+
+    def _merge(self, result: PipelineResult) -> None:
+        suppliers = set(self._suppliers)
+        finished: Set[str] = set()
+        expected_chunks: Dict[str, int] = {}
+        received_chunks: Dict[str, int] = {name: 0 for name in suppliers}
+        # Suppliers that have delivered each hotel ID still waiting to be merged
+        pending: Dict[str, Set[str]] = {}
+
+        while finished != suppliers:
+            item = self._merge_queue.get()
+            if isinstance(item, _Failure):
+                raise HotelServiceException(f"Pipelined refresh failed: {item.error}") from item.error
+
+            if isinstance(item, _End):
+                expected_chunks[item.supplier] = item.chunks
+                if item.error is not None:
+                    result.failed[item.supplier] = item.error
+            else:
+                received_chunks[item.supplier] += 1
+                ready = []
+                with profile_stage('store'):
+                    for hotel, _ in item.items:
+                        self._raw_hotel_db.update_one(hotel)
+                for hotel, digest in item.items:
+                    result.fetched[item.supplier] = result.fetched.get(item.supplier, 0) + 1
+                    if digest is not None:
+                        result.fingerprints.setdefault(item.supplier, {})[hotel.hotel_id] = digest
+                    delivered = pending.setdefault(hotel.hotel_id, set())
+                    delivered.add(item.supplier)
+                    if delivered | finished >= suppliers:
+                        ready.append(hotel.hotel_id)
+                self._publish(ready, pending, result)
+
+            newly_finished = {name for name, chunks in expected_chunks.items()
+                              if name not in finished and received_chunks[name] == chunks}
+            if newly_finished:
+                finished |= newly_finished
+                # Suppliers that just finished will not deliver anything else
+                self._publish([hotel_id for hotel_id, delivered in pending.items()
+                               if delivered | finished >= suppliers], pending, result)
+
+    def _publish(self, hotel_ids: List[str], pending: Dict[str, Set[str]], result: PipelineResult) -> None:
+        if not hotel_ids:
+            return
+        merged = []
+        with STAGE_SECONDS.time(stage='merge'), profile_stage('merge'):
+            for hotel_id in dict.fromkeys(hotel_ids):
+                pending.pop(hotel_id, None)
+                records = sorted(self._raw_hotel_db.find_all([hotel_id]),
+                                 key=lambda hotel: self._order.get(hotel.source, len(self._order)))
+                hotel = self._merger.merge(records)
+                if hotel:
+                    merged.append(hotel)
+        STAGE_HOTELS.inc(len(merged), stage='merge')
+        if merged:
+            with profile_stage('store'):
+                self._hotel_db.update_many(merged)
+            result.merged += len(merged)
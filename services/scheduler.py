@@ -0,0 +1,229 @@
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from services.catalog import CatalogRefresher, RefreshResult
+from utils.logger import logger
+
+
+@dataclass
+class RefreshJob:
+    """
+    The schedule and last outcome of one supplier's refresh.
+    """
+    supplier: str
+    interval: float
+    next_run: float
+    runs: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    last_success: Optional[float] = None
+    last_error: Optional[str] = None
+    last_result: Optional[RefreshResult] = None
+    # Moving average of the share of records that changed between fetches
+    change_ratio: Optional[float] = None
+
+
+class CadencePolicy(ABC):
+    """
+    Decides how long to wait before a supplier's next refresh after a successful one.
+    """
+
+    @abstractmethod
+    def next_interval(self, job: RefreshJob) -> float:
+        pass
+
+
+class FixedCadence(CadencePolicy):
+    """
+    Keeps every supplier on its configured interval.
+    """
+
+    def next_interval(self, job):
+        return job.interval
+
+
+class AdaptiveCadence(CadencePolicy):
+    """
+    Refreshes volatile suppliers more often and backs off for stable ones.
+    The interval shrinks when the smoothed change ratio is at or above
+    `high_change_ratio`, grows when it is at or below `low_change_ratio`,
+    and always stays within the supplier's min/max bounds.
+    """
+
+    def __init__(self,
+                 min_interval: float,
+                 max_interval: float,
+                 low_change_ratio: float = 0.01,
+                 high_change_ratio: float = 0.1,
+                 speedup: float = 0.5,
+                 backoff: float = 1.5,
+                 bounds: Optional[Dict[str, dict]] = None):
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._low = low_change_ratio
+        self._high = high_change_ratio
+        self._speedup = speedup
+        self._backoff = backoff
+        self._bounds = bounds or {}
+
+    def bounds_for(self, supplier: str) -> Tuple[float, float]:
+        bounds = self._bounds.get(supplier, {})
+        return bounds.get('min_interval', self._min_interval), bounds.get('max_interval', self._max_interval)
+
+    def next_interval(self, job):
+        interval = job.interval
+        if job.change_ratio is not None:
+            if job.change_ratio >= self._high:
+                interval *= self._speedup
+            elif job.change_ratio <= self._low:
+                interval *= self._backoff
+        min_interval, max_interval = self.bounds_for(job.supplier)
+        return min(max(interval, min_interval), max_interval)
+
+
+CADENCE_POLICIES = {
+    'fixed': FixedCadence,
+    'adaptive': AdaptiveCadence,
+}
+
+
+def create_cadence_policy(name: str, **kwargs) -> CadencePolicy:
+    if name not in CADENCE_POLICIES:
+        raise ValueError(f"Unknown cadence policy '{name}'")
+    return CADENCE_POLICIES[name](**kwargs)
+
+
+class RefreshScheduler:
+    """
+    Refreshes each supplier in the background on its own cadence.
+    Jobs run one at a time on a single thread, so the raw database only ever
+    has one writer. A failed refresh keeps the supplier's last good data and
+    is retried after `retry_interval`, backing off on repeated failures up to
+    the supplier's normal interval. After a successful refresh the cadence
+    policy sets the supplier's next interval from how much its data changed.
+    """
+
+    def __init__(self,
+                 refresher: CatalogRefresher,
+                 intervals: Dict[str, float],
+                 retry_interval: float = 60,
+                 jitter: float = 0.1,
+                 cadence: Optional[CadencePolicy] = None,
+                 smoothing: float = 0.5):
+        self._refresher = refresher
+        self._cadence = cadence or FixedCadence()
+        self._smoothing = smoothing
+        self._retry_interval = retry_interval
+        self._jitter = jitter
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        now = time.monotonic()
+        self.jobs = {
+            name: RefreshJob(name, intervals[name], now + self._spread(intervals[name]))
+            for name in refresher.suppliers
+        }
+
+    def _spread(self, interval: float) -> float:
+        """
+        Jitter an interval so suppliers with equal cadences do not refresh in lockstep.
+        """
+        return interval * (1 + random.uniform(-self._jitter, self._jitter))
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="refresh-scheduler", daemon=True)
+        self._thread.start()
+        logger.log(f"Started refresh scheduler for {len(self.jobs)} suppliers.", "info")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            job = self._next_job()
+            delay = job.next_run - time.monotonic()
+            if delay > 0:
+                # Woken early by stop(); otherwise sleep until the job is due
+                if self._stop.wait(delay):
+                    return
+                continue
+            self.run_job(job.supplier)
+
+    def _next_job(self) -> RefreshJob:
+        with self._lock:
+            return min(self.jobs.values(), key=lambda job: job.next_run)
+
+    def run_pending(self) -> int:
+        """
+        Run every job that is due now, in the calling thread. Returns the number of jobs run.
+        """
+        now = time.monotonic()
+        due = [job.supplier for job in self.jobs.values() if job.next_run <= now]
+        for supplier in due:
+            self.run_job(supplier)
+        return len(due)
+
+    def run_job(self, supplier: str) -> Optional[RefreshResult]:
+        """
+        Refresh one supplier now and schedule its next run.
+        """
+        job = self.jobs[supplier]
+        started = time.monotonic()
+        try:
+            result = self._refresher.refresh_supplier(supplier)
+        except Exception as e:
+            with self._lock:
+                job.runs += 1
+                job.failures += 1
+                job.consecutive_failures += 1
+                job.last_error = str(e)
+                retry = min(job.interval, self._retry_interval * 2 ** (job.consecutive_failures - 1))
+                job.next_run = time.monotonic() + retry
+            logger.log(f"Refresh of supplier '{supplier}' failed, keeping its last good data "
+                       f"and retrying in {retry:.0f}s: {e}", "error")
+            return None
+
+        with self._lock:
+            job.runs += 1
+            job.consecutive_failures = 0
+            job.last_error = None
+            job.last_success = time.time()
+            job.last_result = result
+            if job.change_ratio is None:
+                job.change_ratio = result.change_ratio
+            else:
+                job.change_ratio += self._smoothing * (result.change_ratio - job.change_ratio)
+            job.interval = self._cadence.next_interval(job)
+            job.next_run = time.monotonic() + self._spread(job.interval)
+        logger.log(f"Refreshed supplier '{supplier}' in {time.monotonic() - started:.2f}s, "
+                   f"next refresh in {job.interval:.0f}s.", "info")
+        return result
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    'interval': job.interval,
+                    'next_run_in': round(max(0.0, job.next_run - now), 3),
+                    'runs': job.runs,
+                    'failures': job.failures,
+                    'consecutive_failures': job.consecutive_failures,
+                    'last_success': job.last_success,
+                    'last_error': job.last_error,
+                    'last_fetched': job.last_result.fetched if job.last_result else None,
+                    'last_changed': job.last_result.changed if job.last_result else None,
+                    'change_ratio': job.change_ratio,
+                }
+                for name, job in self.jobs.items()
+            }
@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+from utils.exceptions import DBException
+
+
+class DiskHotelStore:
+    """
+    A local on-disk key-value store for serialized hotels, backed by SQLite.
+    Rows are keyed by hotel ID and keep the destination ID alongside the
+    payload so destination checks do not need to decode the hotel.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self._lock = threading.Lock()
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS hotels ('
+                'hotel_id TEXT PRIMARY KEY, '
+                'destination_id INTEGER, '
+                'data BLOB NOT NULL)')
+            self._conn.commit()
+        except sqlite3.Error as e:
+            raise DBException(f"Error opening disk store at {path}: {e}")
+
+    def put(self, hotel_id: str, destination_id: int, data: bytes) -> bool:
+        """
+        Insert or replace a hotel payload. Returns True if the ID was new.
+        """
+        with self._lock:
+            existed = self._conn.execute(
+                'SELECT 1 FROM hotels WHERE hotel_id = ?', (hotel_id,)).fetchone() is not None
+            self._conn.execute(
+                'INSERT OR REPLACE INTO hotels (hotel_id, destination_id, data) VALUES (?, ?, ?)',
+                (hotel_id, destination_id, data))
+            self._conn.commit()
+        return not existed
+
+    def put_many(self, rows: List[Tuple[str, int, bytes]]) -> int:
+        """
+        Insert or replace many payloads in one transaction. Returns the number of new IDs.
+        """
+        with self._lock:
+            before = self._count()
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO hotels (hotel_id, destination_id, data) VALUES (?, ?, ?)',
+                rows)
+            self._conn.commit()
+            return self._count() - before
+
+    def delete_many(self, hotel_ids: List[str], chunk_size: int = 500) -> int:
+        """
+        Delete several hotels in one transaction. Returns the number of rows removed.
+        """
+        removed = 0
+        with self._lock:
+            for start in range(0, len(hotel_ids), chunk_size):
+                chunk = hotel_ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                removed += self._conn.execute(
+                    f'DELETE FROM hotels WHERE hotel_id IN ({placeholders})', chunk).rowcount
+            self._conn.commit()
+        return removed
+
+    def get(self, hotel_id: str) -> Optional[Tuple[int, bytes]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT destination_id, data FROM hotels WHERE hotel_id = ?', (hotel_id,)).fetchone()
+        return row
+
+    def get_many(self, hotel_ids: List[str], chunk_size: int = 500) -> Dict[str, Tuple[int, bytes]]:
+        """
+        Read several hotels by ID, keyed by hotel ID. Unknown IDs are left out.
+        IDs are queried in chunks to stay under SQLite's bound parameter limit.
+        """
+        rows = {}
+        with self._lock:
+            for start in range(0, len(hotel_ids), chunk_size):
+                chunk = hotel_ids[start:start + chunk_size]
+                placeholders = ','.join('?' * len(chunk))
+                for hotel_id, destination_id, data in self._conn.execute(
+                        f'SELECT hotel_id, destination_id, data FROM hotels WHERE hotel_id IN ({placeholders})',
+                        chunk):
+                    rows[hotel_id] = (destination_id, data)
+        return rows
+
+    def page(self, after: Optional[str], limit: int) -> List[Tuple[str, int, bytes]]:
+        """
+        Read up to `limit` hotels in ID order, starting after the hotel ID `after`.
+        """
+        with self._lock:
+            if after is None:
+                return self._conn.execute(
+                    'SELECT hotel_id, destination_id, data FROM hotels '
+                    'ORDER BY hotel_id LIMIT ?', (limit,)).fetchall()
+            return self._conn.execute(
+                'SELECT hotel_id, destination_id, data FROM hotels '
+                'WHERE hotel_id > ? ORDER BY hotel_id LIMIT ?', (after, limit)).fetchall()
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[Tuple[str, int, bytes]]:
+        """
+        Iterate over every stored hotel in ID order without loading them all at once.
+        """
+        last_id = None
+        while True:
+            rows = self.page(last_id, batch_size)
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1][0]
+
+    def iter_ids(self, batch_size: int = 500) -> Iterator[str]:
+        """
+        Iterate over every stored hotel ID in order without reading the hotels.
+        """
+        last_id = None
+        while True:
+            with self._lock:
+                if last_id is None:
+                    rows = self._conn.execute(
+                        'SELECT hotel_id FROM hotels ORDER BY hotel_id LIMIT ?', (batch_size,)).fetchall()
+                else:
+                    rows = self._conn.execute(
+                        'SELECT hotel_id FROM hotels WHERE hotel_id > ? ORDER BY hotel_id LIMIT ?',
+                        (last_id, batch_size)).fetchall()
+            if not rows:
+                return
+            for (hotel_id,) in rows:
+                yield hotel_id
+            last_id = rows[-1][0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def _count(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM hotels').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
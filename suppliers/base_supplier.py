@@ -1,8 +1,17 @@
+import time
 import requests
 from models.hotel import Hotel
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, Iterator, List
 from utils.logger import logger
+from utils.exceptions import SupplierException
+from utils.metrics import metrics
+from utils.profiler import stage as profile_stage
+
+FETCH_SECONDS = metrics.histogram('supplier_fetch_seconds', 'Time to fetch a supplier\'s raw records.', ['supplier'])
+FETCHED_RECORDS = metrics.counter('supplier_records', 'Raw records fetched from a supplier.', ['supplier'])
+FETCH_FAILURES = metrics.counter('supplier_fetch_failures', 'Supplier fetches that raised.', ['supplier'])
+PARSE_FAILURES = metrics.counter('supplier_parse_failures', 'Supplier records that failed to parse.', ['supplier'])
 
 
 class BaseSupplier(ABC):
@@ -14,6 +23,13 @@ class BaseSupplier(ABC):
         """
         self._api_endpoint = url
 
+    @property
+    def name(self) -> str:
+        """
+        Short name of the supplier used to label its metrics, e.g. 'acme' for AcmeSupplier.
+        """
+        return type(self).__name__.removesuffix('Supplier').lower()
+
     def _endpoint(self) -> str:
         """
         Get the supplier's API endpoint.
@@ -36,40 +52,76 @@ class BaseSupplier(ABC):
         """
         Fetch and parse data from the supplier's API endpoint.
 
+        :return: A list of parsed Hotel objects, or an empty list if the supplier could not be read
+        """
+        try:
+            return self.load()
+        except SupplierException as e:
+            logger.log(e.message, "error")
+            return []
+
+    def load(self) -> List[Hotel]:
+        """
+        Fetch and parse data from the supplier's API endpoint, raising if it cannot be read.
+        Unlike fetch, this lets callers tell a failed request apart from an empty catalog.
+
         :return: A list of parsed Hotel objects
         """
+        return list(self.parse_all(self.fetch_raw()))
+
+    def fetch_raw(self) -> List[dict]:
+        """
+        Fetch the supplier's raw records without parsing them, raising if they cannot be read.
+
+        :return: A list of raw supplier records
+        """
         url = self._endpoint()
         logger.log(f"Fetching data from {url}", "info")
+        start = time.perf_counter()
+        try:
+            with profile_stage('fetch'):
+                items = self._request(url)
+        except SupplierException:
+            FETCH_FAILURES.inc(supplier=self.name)
+            raise
+        finally:
+            FETCH_SECONDS.observe(time.perf_counter() - start, supplier=self.name)
+        FETCHED_RECORDS.inc(len(items), supplier=self.name)
+        return items
 
+    def _request(self, url: str) -> List[dict]:
+        """
+        Request the endpoint and decode its JSON body, raising SupplierException on failure.
+        """
         # Attempt to fetch data
         try:
             response = requests.get(url)
         except requests.RequestException as e:
-            logger.log(f"Request to {url} failed with error: {e}", "error")
-            return []
+            raise SupplierException(f"Request to {url} failed with error: {e}")
 
         # Check HTTP response status
         if response.status_code != 200:
-            logger.log(
-                f"Failed to fetch data from {url} with status code {response.status_code}", "error")
-            return []
+            raise SupplierException(
+                f"Failed to fetch data from {url} with status code {response.status_code}")
 
         # Parse JSON response
         try:
-            json_data = response.json()
+            return response.json()
         except Exception as e:
-            logger.log(
-                f"Failed to parse JSON response from {url} with error: {e}", "error")
-            return []
+            raise SupplierException(
+                f"Failed to parse JSON response from {url} with error: {e}")
+
+    def parse_all(self, items: Iterable[dict]) -> Iterator[Hotel]:
+        """
+        Parse raw supplier records into Hotel objects, skipping records that fail to parse.
 
-        # Process each item in the response
-        hotels = []
-        for item in json_data:
+        :param items: Raw supplier records
+        :return: An iterator of parsed Hotel objects
+        """
+        for item in items:
             try:
-                hotel = self.parse(item)
-                hotels.append(hotel)
+                yield self.parse(item)
             except Exception as e:
+                PARSE_FAILURES.inc(supplier=self.name)
                 logger.log(
-                    f"Failed to parse item from {url} with error: {e}", "error")
-
-        return hotels
+                    f"Failed to parse item from {self._endpoint()} with error: {e}", "error")
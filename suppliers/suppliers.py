@@ -1,7 +1,15 @@
+import time
+from models.hotel import Hotel
 from suppliers.base_supplier import BaseSupplier
+from utils.exceptions import SupplierException
 from utils.logger import logger
+from utils.metrics import metrics
 from typing import Dict, List, Tuple, Optional
 
+FETCH_ALL_SECONDS = metrics.histogram('supplier_manager_fetch_seconds', 'Time to fetch and parse every supplier.')
+SUPPLIER_HOTELS = metrics.counter('supplier_manager_hotels', 'Hotels parsed per supplier by the supplier manager.',
+                                  ['supplier'])
+
 
 class SupplierManager:
     """
@@ -16,19 +24,23 @@ class SupplierManager:
         """
         self.suppliers = suppliers
 
-    def get_all_suppliers_data(self) -> List[dict]:
+    def get_all_suppliers_data(self, checkpoint=None) -> List[dict]:
         """
         Fetch data from all suppliers.
 
+        :param checkpoint: An optional RefreshCheckpoint; suppliers already fetched in its run are
+                           read from it, and the others are checkpointed once fetched.
         :return: A list of data collected from all suppliers.
         """
         data = []
+        start = time.perf_counter()
         for supplier_name, supplier_module in self.get_all_suppliers():
             try:
                 logger.log(
                     f"Fetching data from supplier '{supplier_name}'.", "info")
-                fetched_data = supplier_module.fetch()
+                fetched_data = self._fetch(supplier_name, supplier_module, checkpoint)
                 if fetched_data:
+                    SUPPLIER_HOTELS.inc(len(fetched_data), supplier=supplier_name)
                     data.extend(fetched_data)
                     logger.log(
                         f"Successfully fetched {len(fetched_data)} records from supplier '{supplier_name}'.", "info")
@@ -38,8 +50,19 @@ class SupplierManager:
             except Exception as e:
                 logger.log(
                     f"Error fetching data from supplier '{supplier_name}': {e}", "error")
+        FETCH_ALL_SECONDS.observe(time.perf_counter() - start)
         return data
 
+    def _fetch(self, supplier_name: str, supplier_module: BaseSupplier, checkpoint=None) -> List[Hotel]:
+        if checkpoint is None:
+            return supplier_module.fetch()
+        try:
+            items = checkpoint.fetch(supplier_name, supplier_module)
+        except SupplierException as e:
+            logger.log(e.message, "error")
+            return []
+        return list(supplier_module.parse_all(items))
+
     def get_all_suppliers(self) -> List[Tuple[str, BaseSupplier]]:
         """
         Get all suppliers as a list of (name, module) pairs.
@@ -0,0 +1,106 @@
+import pytest
+
+from benchmarks.fixtures import sample_hotel
+from services.cache import HotCache
+from services.database import HotelDB, TieredHotelDB
+
+
+def make_hotel(hotel_id: str, destination_id: int = 5432, **changes):
+    """
+    Build a sample hotel with the given ID and destination, overriding any other fields.
+    """
+    return sample_hotel(hotel_id).model_copy(update={"destination_id": destination_id, **changes})
+
+
+def open_tiered_db(path) -> TieredHotelDB:
+    """
+    Open a tiered database on a SQLite file with a small hot set, so tests exercise both tiers.
+    """
+    from services.storage import DiskHotelStore
+
+    return TieredHotelDB(DiskHotelStore(str(path)), HotCache(max_items=4))
+
+
+@pytest.fixture(params=["memory", "tiered"])
+def hotel_db(request, tmp_path):
+    """
+    An empty hotel database of each backend.
+    """
+    if request.param == "memory":
+        yield HotelDB()
+        return
+    db = open_tiered_db(tmp_path / "hotels.sqlite3")
+    yield db
+    db.close()
+
+
+class RunningServer:
+    """
+    The built-in HTTP server running an ASGI app on an event loop in a background thread.
+    """
+
+    def __init__(self, app, **kwargs):
+        import asyncio
+        import threading
+        from api.services.server import HTTPServer
+
+        self.server = HTTPServer(app, "127.0.0.1", 0, **kwargs)
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.server.start())
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def request(self, raw: bytes, timeout: float = 5.0) -> bytes:
+        """
+        Send raw request bytes on a new connection and read until the server closes it.
+        """
+        import socket
+
+        with socket.create_connection(("127.0.0.1", self.server.port), timeout=timeout) as sock:
+            sock.sendall(raw)
+            data = b""
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    return data
+                data += chunk
+
+    def get(self, target: str, headers: dict = None):
+        """
+        Send a GET request and return its status, lower-cased headers and raw body.
+        """
+        lines = [f"GET {target} HTTP/1.1", "Host: test", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        head, _, body = self.request(("\r\n".join(lines) + "\r\n\r\n").encode()).partition(b"\r\n\r\n")
+        status_line, *header_lines = head.decode("latin-1").split("\r\n")
+        parsed = dict(line.split(": ", 1) for line in header_lines)
+        return int(status_line.split(" ")[1]), {name.lower(): value for name, value in parsed.items()}, body
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+@pytest.fixture
+def serve():
+    """
+    Start servers for ASGI apps, stopping them when the test ends.
+    """
+    servers = []
+
+    def start(app, **kwargs) -> RunningServer:
+        server = RunningServer(app, **kwargs)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
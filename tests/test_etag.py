@@ -0,0 +1,96 @@
+import gzip
+import json
+
+import pytest
+
+from api import hotel_api
+from api.domain.etag import coded_etag, etag_matches, hotel_etag, list_etag
+from api.services.asgi import HotelASGIApp
+from tests.conftest import make_hotel
+
+
+@pytest.fixture
+def catalog(hotel_db):
+    hotel_db.update_many([make_hotel(f"h{i:02d}") for i in range(20)])
+    return hotel_db
+
+
+def test_etag_is_strong_and_depends_on_the_representation():
+    etag = hotel_etag("v1", "json", None)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == hotel_etag("v1", "json", None)
+    assert len({etag, hotel_etag("v2", "json", None), hotel_etag("v1", "ndjson", None),
+                hotel_etag("v1", "json", ["name"])}) == 4
+    assert list_etag(["a", "b"], "json", None) != list_etag(["b", "a"], "json", None)
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"other", "abc"', True),
+    ('*', True),
+    ('"abc-gzip"', True),
+    ('"abc-br"', True),
+    ('"other"', False),
+    ('"abcd"', False),
+    ('', False),
+    (None, False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
+
+
+def test_coded_etag_differs_from_identity():
+    assert coded_etag('"abc"', "gzip") == '"abc-gzip"'
+
+
+def test_conditional_hotel_request_returns_304_until_the_hotel_changes(catalog):
+    first = hotel_api.get_hotel(catalog, {"hotel_id": "h01"})
+    etag = first.headers["etag"]
+    assert first.status == 200
+
+    not_modified = hotel_api.get_hotel(catalog, {"hotel_id": "h01", "if_none_match": etag})
+    assert not_modified.status == 304
+    assert not_modified.headers["etag"] == etag
+
+    catalog.update_one(make_hotel("h01", name="Renamed"))
+    changed = hotel_api.get_hotel(catalog, {"hotel_id": "h01", "if_none_match": etag})
+    assert changed.status == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_conditional_listing_returns_304_until_a_member_changes(catalog):
+    etag = hotel_api.get_hotels(catalog, {"limit": 5}).headers["etag"]
+    assert hotel_api.get_hotels(catalog, {"limit": 5, "if_none_match": etag}).status == 304
+
+    # A hotel outside the page does not change it, one inside does
+    catalog.update_one(make_hotel("h10", name="Renamed"))
+    assert hotel_api.get_hotels(catalog, {"limit": 5, "if_none_match": etag}).status == 304
+    catalog.update_one(make_hotel("h02", name="Renamed"))
+    assert hotel_api.get_hotels(catalog, {"limit": 5, "if_none_match": etag}).status == 200
+
+
+def test_listing_etag_depends_on_format_and_fields(catalog):
+    etags = {hotel_api.get_hotels(catalog, params).headers["etag"]
+             for params in ({}, {"format": "ndjson"}, {"fields": ["name"]}, {"limit": 5})}
+    assert len(etags) == 4
+
+
+def test_compressed_variant_has_its_own_etag_and_revalidates(serve, catalog):
+    server = serve(HotelASGIApp(hotel_api, catalog))
+
+    status, identity, body = server.get("/hotels")
+    assert status == 200 and "content-encoding" not in identity
+
+    status, compressed, gzipped = server.get("/hotels", {"Accept-Encoding": "gzip"})
+    assert status == 200
+    assert compressed["content-encoding"] == "gzip"
+    assert compressed["etag"] == coded_etag(identity["etag"], "gzip")
+    assert compressed["vary"] == "accept-encoding"
+    assert json.loads(gzip.decompress(gzipped)) == json.loads(body)
+
+    status, headers, body = server.get("/hotels", {"Accept-Encoding": "gzip", "If-None-Match": compressed["etag"]})
+    assert (status, headers["etag"], body) == (304, compressed["etag"], b"")
+
+    status, headers, _ = server.get("/hotels", {"If-None-Match": identity["etag"]})
+    assert (status, headers["etag"]) == (304, identity["etag"])
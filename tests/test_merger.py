@@ -0,0 +1,27 @@
+from configs.config import merger_config
+from models.record import ImageRecord, ImagesRecord
+from services.merger import ImagesMerger
+from utils.bias import HotelBias
+
+
+def merge_images(*images_by_source):
+    merger = ImagesMerger(HotelBias(merger_config['bias_factors']))
+    return merger.merge([{"source": source, "data": images} for source, images in images_by_source])
+
+
+def test_spellings_of_one_image_collapse_keeping_the_only_caption():
+    merged = merge_images(
+        ("acme", ImagesRecord(rooms=[ImageRecord("https://CDN.example.com:443/rooms/1.jpg")])),
+        ("paperflies", ImagesRecord(rooms=[ImageRecord("https://cdn.example.com/rooms/./1.jpg", "double room")])),
+    )
+    assert [(image.link, image.description) for image in merged.rooms] == [
+        ("https://cdn.example.com/rooms/1.jpg", "double room")]
+
+
+def test_spellings_of_one_image_keep_the_longest_caption():
+    merged = merge_images(
+        ("acme", ImagesRecord(site=[ImageRecord("https://cdn.example.com/1.jpg", "front")])),
+        ("patagonia", ImagesRecord(site=[ImageRecord("https://cdn.example.com/1.jpg#top", "hotel front")])),
+        ("paperflies", ImagesRecord(site=[ImageRecord("https://cdn.example.com/1.jpg")])),
+    )
+    assert [image.description for image in merged.site] == ["hotel front"]
@@ -0,0 +1,97 @@
+import json
+import random
+
+import pytest
+
+from api import hotel_api
+from api.domain.hotels.cursor import decode_cursor, encode_cursor
+from main import validate_query
+from tests.conftest import make_hotel
+
+
+def crawl(db, cursor=None, **params):
+    """
+    Follow next_cursor from the given page to the last, returning the hotel IDs of every page.
+    """
+    pages = []
+    while True:
+        response = hotel_api.get_hotels(db, {**params, "cursor": cursor})
+        assert response.status == 200
+        body = json.loads(response.body)
+        assert body["count"] == len(body["hotels"])
+        pages.append([hotel["hotel_id"] for hotel in body["hotels"]])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("hotel_id", ["h1", "iJhz", "ünï cödé/?&=", ""])
+def test_cursor_round_trip(hotel_id):
+    cursor = encode_cursor(hotel_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == hotel_id
+
+
+def test_cursor_of_last_page_is_none():
+    assert encode_cursor(None) is None
+    assert decode_cursor(None) is None
+
+
+@pytest.mark.parametrize("cursor", ["zzz", "bm90IGpzb24", encode_cursor("h1")[:-3]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 25])
+def test_crawl_visits_every_hotel_once_in_id_order(hotel_db, limit):
+    hotel_ids = [f"h{i:03d}" for i in range(25)]
+    random.Random(limit).shuffle(hotel_ids)
+    hotel_db.update_many([make_hotel(hotel_id) for hotel_id in hotel_ids])
+
+    pages = crawl(hotel_db, limit=limit)
+
+    assert [hotel_id for page in pages for hotel_id in page] == sorted(hotel_ids)
+    assert all(len(page) == limit for page in pages[:-1])
+    assert len(pages) == -(-len(hotel_ids) // limit)
+
+
+def test_filtered_crawl_skips_other_destinations(hotel_db):
+    hotel_db.update_many([make_hotel(f"h{i:02d}", destination_id=1 if i % 3 else 2) for i in range(20)])
+    wanted = [f"h{i:02d}" for i in range(20) if i % 3 == 0]
+
+    pages = crawl(hotel_db, limit=2, hotel_ids=[f"h{i:02d}" for i in range(20)] + ["missing"],
+                  destination_ids=[2])
+
+    assert [hotel_id for page in pages for hotel_id in page] == wanted
+
+
+def test_crawl_resumes_after_hotels_written_behind_the_cursor(hotel_db):
+    hotel_db.update_many([make_hotel(f"h{i:02d}") for i in range(10)])
+    first = json.loads(hotel_api.get_hotels(hotel_db, {"limit": 4}).body)
+
+    hotel_db.update_many([make_hotel("h00a"), make_hotel("h99")])
+    rest = crawl(hotel_db, limit=4, cursor=first["next_cursor"])
+
+    assert [hotel["hotel_id"] for hotel in first["hotels"]] == ["h00", "h01", "h02", "h03"]
+    assert [hotel_id for page in rest for hotel_id in page] == [f"h{i:02d}" for i in range(4, 10)] + ["h99"]
+
+
+def test_total_count_is_included_on_request(hotel_db):
+    hotel_db.update_many([make_hotel(f"h{i}") for i in range(5)])
+    body = json.loads(hotel_api.get_hotels(hotel_db, {"limit": 2, "include_total": True}).body)
+    assert body["total_count"] == 5
+
+
+@pytest.mark.parametrize("options, argument", [
+    ({"limit": 0}, "--limit"),
+    ({"cursor": "zzz"}, "--cursor"),
+    ({"fields": ["name", "bogus"]}, "--fields"),
+])
+def test_cli_rejects_invalid_query_options(options, argument):
+    with pytest.raises(ValueError, match=f"argument {argument}:"):
+        validate_query(None, None, options)
+
+
+def test_cli_accepts_valid_query_options():
+    validate_query(["iJhz"], ["5432"], {"limit": 10, "cursor": encode_cursor("h1"), "fields": ["name"]})
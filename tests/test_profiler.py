@@ -0,0 +1,37 @@
+import sys
+
+import pytest
+
+from configs.config import profile_config
+from utils import profiler
+
+
+@pytest.mark.parametrize("memory", [True, False])
+def test_memory_profiling_is_enabled_per_run(tmp_path, monkeypatch, memory):
+    monkeypatch.setitem(profile_config, "memory", False)
+    profiler.enable(["merge"], output_dir=str(tmp_path), memory=memory or None)
+    with profiler.stage("merge"):
+        data = [str(i) for i in range(1000)]
+    paths = profiler.disable()
+
+    assert data
+    assert (str(tmp_path / "memory.txt") in paths) is memory
+    assert (tmp_path / "merge.prof").exists()
+
+
+def test_cli_refuses_profile_memory_without_profile(monkeypatch, capsys):
+    from main import parse_arguments
+
+    monkeypatch.setattr(sys, "argv", ["main.py", "none", "none", "--profile-memory"])
+    with pytest.raises(SystemExit):
+        parse_arguments()
+    assert "--profile-memory: requires --profile" in capsys.readouterr().err
+
+
+def test_cli_passes_profile_memory_through(monkeypatch):
+    from main import parse_arguments
+
+    monkeypatch.setattr(sys, "argv", ["main.py", "none", "none", "--profile", "all", "--profile-memory"])
+    diagnostics = parse_arguments()[-1]
+    assert diagnostics["profile"] == list(profiler.STAGES)
+    assert diagnostics["profile_memory"] is True
@@ -0,0 +1,169 @@
+import json
+
+import pytest
+
+from benchmarks.catalog_generator import CatalogSpec, generate_payloads
+from benchmarks.stub_server import StubSupplierServer
+from configs.config import checkpoint_config
+from services.catalog import (CatalogRefresher, create_catalog_refresher, create_merger, create_normalizer,
+                              create_suppliers)
+from services.checkpoint import CheckpointStore
+from services.database import HotelDB, RawHotelDB
+from tests.conftest import open_tiered_db
+
+PIPELINE = {"chunk_size": 50, "queue_size": 8, "normalize_workers": 2}
+PAYLOADS = generate_payloads(CatalogSpec(200))
+
+
+@pytest.fixture
+def suppliers():
+    """
+    A stub supplier server whose payloads tests may change between refreshes.
+    """
+    with StubSupplierServer(dict(PAYLOADS)) as server:
+        yield server
+
+
+def make_refresher(server, hotel_db, raw_hotel_db=None, pipeline=None, checkpoints=None) -> CatalogRefresher:
+    return CatalogRefresher(create_suppliers({"endpoint": server.endpoints()}), create_normalizer(),
+                            create_merger(), raw_hotel_db or RawHotelDB(), hotel_db, pipeline, checkpoints)
+
+
+def drop_records(server, name: str, count: int) -> None:
+    """
+    Stop a supplier returning its first `count` records.
+    """
+    server.payloads[name] = json.dumps(json.loads(server.payloads[name])[count:]).encode()
+
+
+def expected_ids(server) -> list:
+    """
+    The hotel IDs a refresh into an empty database yields from the current payloads.
+    """
+    db = HotelDB()
+    make_refresher(server, db).refresh_all()
+    return list(db.ids())
+
+
+@pytest.mark.parametrize("pipeline", [None, PIPELINE], ids=["staged", "pipelined"])
+def test_full_refresh_removes_dropped_hotels(suppliers, hotel_db, pipeline):
+    refresher = make_refresher(suppliers, hotel_db, pipeline=pipeline)
+    refresher.refresh_all()
+    before = hotel_db.length()
+
+    for name in suppliers.payloads:
+        drop_records(suppliers, name, 30)
+    refresher.refresh_all()
+
+    assert hotel_db.length() < before
+    assert list(hotel_db.ids()) == expected_ids(suppliers)
+    assert hotel_db.count() == hotel_db.length()
+
+
+def test_supplier_refresh_removes_dropped_hotels(suppliers, hotel_db):
+    raw_hotel_db = RawHotelDB()
+    refresher = make_refresher(suppliers, hotel_db, raw_hotel_db)
+    refresher.refresh_all()
+
+    records = json.loads(suppliers.payloads["paperflies"])
+    dropped = {record["hotel_id"] for record in records[:30]} - {record["hotel_id"] for record in records[30:]}
+    drop_records(suppliers, "paperflies", 30)
+    result = refresher.refresh_supplier("paperflies")
+
+    assert result.changed >= len(dropped)
+    assert list(hotel_db.ids()) == expected_ids(suppliers)
+    # Hotels other suppliers still list are re-merged without the dropped records
+    assert not any("paperflies" in raw_hotel_db.data.get(hotel_id, {}) for hotel_id in dropped)
+
+
+@pytest.mark.parametrize("pipeline", [None, PIPELINE], ids=["staged", "pipelined"])
+def test_restart_removes_hotels_dropped_while_stopped(suppliers, tmp_path, pipeline):
+    path = tmp_path / "hotels.sqlite3"
+    db = open_tiered_db(path)
+    make_refresher(suppliers, db, pipeline=pipeline).refresh_all()
+    before = db.length()
+    db.close()
+
+    for name in suppliers.payloads:
+        drop_records(suppliers, name, 30)
+
+    # A new process starts with no fingerprints and an empty raw database
+    db = open_tiered_db(path)
+    make_refresher(suppliers, db, pipeline=pipeline).refresh_all()
+    try:
+        assert db.length() < before
+        assert list(db.ids()) == expected_ids(suppliers)
+        assert db.count() == db.length()
+    finally:
+        db.close()
+
+
+def test_restart_keeps_hotels_while_a_supplier_returns_nothing(suppliers, tmp_path):
+    path = tmp_path / "hotels.sqlite3"
+    db = open_tiered_db(path)
+    make_refresher(suppliers, db).refresh_all()
+    before = db.length()
+    db.close()
+
+    suppliers.payloads["acme"] = b"[]"
+    drop_records(suppliers, "patagonia", 30)
+
+    db = open_tiered_db(path)
+    make_refresher(suppliers, db).refresh_all()
+    try:
+        assert db.length() == before
+    finally:
+        db.close()
+
+
+class FailingNormalizer:
+    """
+    Wraps a normalizer, counting its batches and failing on the `fail_on`th one.
+    """
+
+    def __init__(self, fail_on: int = None):
+        self._normalizer = create_normalizer()
+        self._fail_on = fail_on
+        self.calls = 0
+
+    def normalize(self, data):
+        self.calls += 1
+        if self.calls == self._fail_on:
+            raise ValueError("bad record")
+        return self._normalizer.normalize(data)
+
+
+def encoded_catalog(db) -> bytes:
+    return b"\n".join(db.encoded(hotel) for hotel in db.find_all(None, None))
+
+
+@pytest.mark.parametrize("pipeline", [None, PIPELINE], ids=["staged", "pipelined"])
+def test_failed_refresh_is_resumed_from_its_checkpoint(suppliers, tmp_path, pipeline):
+    checkpoints = CheckpointStore(str(tmp_path / "runs"))
+    failing = FailingNormalizer(fail_on=4)
+    refresher = CatalogRefresher(create_suppliers({"endpoint": suppliers.endpoints()}), failing, create_merger(),
+                                 RawHotelDB(), HotelDB(), pipeline, checkpoints, checkpoint_batch_size=50)
+    with pytest.raises(Exception):
+        refresher.refresh_all()
+    fetches = suppliers.requests
+
+    db = HotelDB()
+    normalizer = FailingNormalizer()
+    CatalogRefresher(create_suppliers({"endpoint": suppliers.endpoints()}), normalizer, create_merger(),
+                     RawHotelDB(), db, pipeline, checkpoints, checkpoint_batch_size=50).refresh_all()
+
+    # Suppliers are read from the checkpoint and batches normalized before the failure are not redone
+    assert suppliers.requests == fetches
+    total = FailingNormalizer()
+    expected = HotelDB()
+    CatalogRefresher(create_suppliers({"endpoint": suppliers.endpoints()}), total, create_merger(),
+                     RawHotelDB(), expected, pipeline, CheckpointStore(str(tmp_path / "fresh")),
+                     checkpoint_batch_size=50).refresh_all()
+    assert normalizer.calls < total.calls
+    assert encoded_catalog(db) == encoded_catalog(expected)
+
+
+def test_only_the_server_checkpoints_refreshes(monkeypatch, tmp_path):
+    monkeypatch.setitem(checkpoint_config, "root", str(tmp_path / "runs"))
+    assert create_catalog_refresher(RawHotelDB(), HotelDB())._checkpoints is None
+    assert create_catalog_refresher(RawHotelDB(), HotelDB(), checkpoint=True)._checkpoints is not None
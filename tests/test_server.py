@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from api import hotel_api
+from api.services.asgi import HotelASGIApp
+from configs.config import server_config
+from tests.conftest import make_hotel
+
+
+@pytest.fixture
+def server(serve, hotel_db):
+    hotel_db.update_many([make_hotel(f"h{i:03d}") for i in range(50)])
+    return serve(HotelASGIApp(hotel_api, hotel_db), max_body_size=1024)
+
+
+def test_serves_hotel_listing(server):
+    status, headers, body = server.get("/hotels?limit=10")
+    assert status == 200
+    assert len(json.loads(body)["hotels"]) == 10
+
+
+@pytest.mark.parametrize("content_length", [b"abc", b"-1", b"1e3"])
+def test_malformed_content_length_is_answered_with_400(server, content_length):
+    response = server.request(b"GET /hotels HTTP/1.1\r\nContent-Length: " + content_length + b"\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 400 ")
+
+
+def test_oversized_body_is_refused_with_413_without_reading_it(server):
+    response = server.request(b"GET /hotels HTTP/1.1\r\nContent-Length: 1000000000\r\n\r\n")
+    assert response.startswith(b"HTTP/1.1 413 ")
+    assert b"connection: close" in response
+
+
+def test_body_within_the_limit_is_accepted(server):
+    response = server.request(b"GET /hotels?limit=1 HTTP/1.1\r\nConnection: close\r\nContent-Length: 5\r\n\r\nhello")
+    assert response.startswith(b"HTTP/1.1 200 ")
+
+
+def test_ndjson_listing_is_streamed_in_full(server):
+    status, headers, body = server.get("/hotels?format=ndjson")
+    assert status == 200
+    assert headers["transfer-encoding"] == "chunked"
+    # One chunk-size line and one hotel line per chunk, ending with the empty chunk
+    assert body.endswith(b"0\r\n\r\n")
+    assert body.count(b'"hotel_id"') == 50
+
+
+def fail_encoding_after(monkeypatch, hotel_db, count):
+    encoded = hotel_db.encoded
+    calls = []
+
+    def failing(hotel, field_set=None):
+        calls.append(hotel.hotel_id)
+        if len(calls) > count:
+            raise RuntimeError("disk gone")
+        return encoded(hotel, field_set)
+
+    monkeypatch.setattr(hotel_db, "encoded", failing)
+
+
+def test_stream_failing_after_headers_drops_the_connection(server, hotel_db, monkeypatch):
+    # One hotel per batch, so the response has started when encoding fails
+    monkeypatch.setitem(server_config, "stream_chunk_size", 1)
+    fail_encoding_after(monkeypatch, hotel_db, 10)
+    status, headers, body = server.get("/hotels?format=ndjson")
+    assert status == 200
+    assert body.count(b'"hotel_id"') == 10
+    assert not body.endswith(b"0\r\n\r\n")
+
+
+def test_stream_failing_before_headers_is_answered_with_500(server, hotel_db, monkeypatch):
+    fail_encoding_after(monkeypatch, hotel_db, 0)
+    status, headers, body = server.get("/hotels?format=ndjson")
+    assert status == 500
+
+
+def test_admission_slot_is_held_until_the_body_is_sent(hotel_db, monkeypatch):
+    import asyncio
+    from api.services.admission import AdmissionController
+
+    monkeypatch.setitem(server_config, "stream_chunk_size", 1)
+    hotel_db.update_many([make_hotel(f"h{i:03d}") for i in range(5)])
+    admission = AdmissionController({"max_concurrency": 1, "max_queue": 0, "queue_timeout": 1.0})
+    app = HotelASGIApp(hotel_api, hotel_db, admission=admission)
+    active = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            active.append(admission.limiter("/hotels").stats()["active"])
+
+    scope = {"type": "http", "method": "GET", "path": "/hotels", "query_string": b"format=ndjson", "headers": []}
+    asyncio.run(app(scope, receive, send))
+    assert len(active) > 1
+    assert all(count == 1 for count in active)
+    assert admission.limiter("/hotels").stats()["active"] == 0
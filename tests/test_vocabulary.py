@@ -0,0 +1,28 @@
+import json
+
+from models.hotel import Hotel
+from services.catalog import create_normalizer
+from tests.conftest import make_hotel
+from utils.vocabulary import Vocabulary
+
+
+def test_interned_values_share_one_object_until_cleared():
+    vocabulary = Vocabulary()
+    first = vocabulary.intern("".join(["pool", "side"]))
+    assert vocabulary.intern("".join(["pool", "side"])) is first
+    assert "poolside" in vocabulary and len(vocabulary) == 1
+
+    vocabulary.clear()
+    assert "poolside" not in vocabulary and len(vocabulary) == 0
+    assert vocabulary.intern("poolside") == first
+
+
+def test_normalized_hotels_share_repeated_values():
+    # Parsed separately, so equal values start out as different objects, as they do from suppliers
+    first, second = create_normalizer().normalize(
+        [Hotel.model_validate(json.loads(make_hotel(hotel_id).model_dump_json())) for hotel_id in ("h1", "h2")])
+
+    for a, b in [(first.amenities.general[0], second.amenities.general[0]),
+                 (first.booking_conditions[0], second.booking_conditions[0]),
+                 (first.images.rooms[0].description, second.images.rooms[0].description)]:
+        assert a == b and a is b
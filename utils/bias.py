@@ -79,10 +79,10 @@ class HotelBias(Bias):
         valid_scores = [score for score in scores if score is not None]
 
         if not valid_scores:
-            logger.log(f"No bias scores found for {id}.", "info")
+            logger.log("No bias scores found for %s.", "info", id)
             return None
         
-        logger.log(f"Aggregated bias scores for {id}: {valid_scores}", "info")
+        logger.log("Aggregated bias scores for %s: %s", "info", id, valid_scores)
 
         return sum(valid_scores) / len(valid_scores)
 
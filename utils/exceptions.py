@@ -28,4 +28,25 @@ class BiasException(Exception):
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
-    
\ No newline at end of file
+    
+class OverloadException(Exception):
+    def __init__(self, message, status=503, retry_after=1):
+        self.message = message
+        self.status = status
+        self.retry_after = retry_after
+        super().__init__(self.message)
+
+class SupplierException(Exception):
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+class CheckpointException(Exception):
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+class ProfilerException(Exception):
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
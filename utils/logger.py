@@ -1,10 +1,129 @@
+import atexit
+import json
 import logging
+import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
+from typing import Optional
 from configs.config import logger_config
 
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+    'critical': logging.CRITICAL,
+}
+
+
+class _DeferredFileHandler(logging.FileHandler):
+    """
+    A file handler that creates its directory and file on the first record it writes,
+    so importing the logger has no filesystem side effects.
+    """
+
+    def __init__(self, filename):
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        directory = os.path.dirname(self.baseFilename)
+        if not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        return super()._open()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as one JSON object per line, with any structured fields passed to `Logger.log`.
+    """
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'message': record.getMessage(),
+            'thread': record.threadName,
+            'source': f"{record.module}:{record.lineno}",
+        }
+        fields = getattr(record, 'fields', None)
+        if fields:
+            entry.update(fields)
+        suppressed = getattr(record, 'suppressed', 0)
+        if suppressed:
+            entry['suppressed'] = suppressed
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class RateLimiter:
+    """
+    Rate-limits records at or below `max_level` per call site with a token bucket,
+    so per-hotel chatter cannot dominate a refresh. Warnings and errors always pass.
+    Checked before a record is built, so dropped records cost only the bucket update.
+    """
+
+    def __init__(self, rate: float, burst: int, max_level: int = logging.INFO):
+        self.max_level = max_level
+        self._rate = rate
+        self._burst = burst
+        self._lock = threading.Lock()
+        # Call site -> [tokens, last refill time, records dropped since the last one let through]
+        self._buckets = {}
+
+    def acquire(self, key) -> Optional[int]:
+        """
+        Take a token for a call site. Returns None if the record should be dropped,
+        otherwise the number of records dropped from that call site since the last one let through.
+        """
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self._burst, now, 0]
+            else:
+                bucket[0] = min(self._burst, bucket[0] + (now - bucket[1]) * self._rate)
+                bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return None
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+            return suppressed
+
+
+class _BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to the writer thread. Only the message is resolved on the calling
+    thread, so arguments cannot change before they are written; timestamps,
+    JSON encoding and file I/O happen on the writer thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
 class Logger:
+    """
+    Application logger. `log` checks the level before doing any work and accepts
+    printf-style arguments that are only formatted for records that will be written,
+    plus keyword fields that are added to the structured output:
+
+        logger.log("Merged hotel %s", "info", hotel_id, sources=3)
+
+    Records pass through a queue to a background thread that writes them to the
+    log file and, optionally, the console.
+    """
+
     def __init__(self, log_dir, log_level):
         self.log_dir = log_dir
         self.log_level = log_level
@@ -14,45 +133,69 @@ class Logger:
             '%(asctime)s - %(levelname)s - %(message)s')
         self.console_handler = logging.StreamHandler(sys.stdout)
         self.console_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.console_handler)
         self.file_handler = None
         self.create_log_file()
 
+        self._queue = queue.SimpleQueue()
+        self.queue_handler = _BackgroundQueueHandler(self._queue)
+        rate_limit = logger_config['rate_limit']
+        self._rate_limiter = RateLimiter(rate_limit['rate'], rate_limit['burst']) if rate_limit['enabled'] else None
+        self.logger.addHandler(self.queue_handler)
+        self._listener = logging.handlers.QueueListener(
+            self._queue, self.file_handler, self.console_handler, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.close)
+
     def create_log_file(self):
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
         log_file = os.path.join(
             self.log_dir, datetime.now().strftime('%Y-%m-%d_%H-%M-%S.log'))
-        self.file_handler = logging.FileHandler(log_file)
-        self.file_handler.setFormatter(self.formatter)
-        self.logger.addHandler(self.file_handler)
-
-    def log(self, message, level='info'):
-        if level == 'info':
-            self.logger.info(message)
-        elif level == 'warning':
-            self.logger.warning(message)
-        elif level == 'error':
-            self.logger.error(message)
-        elif level == 'critical':
-            self.logger.critical(message)
+        # The directory and file are created when the first record is written
+        self.file_handler = _DeferredFileHandler(log_file)
+        if logger_config['format'] == 'json':
+            self.file_handler.setFormatter(JsonFormatter())
         else:
-            self.logger.debug(message)
+            self.file_handler.setFormatter(self.formatter)
+
+    def is_enabled(self, level='info') -> bool:
+        """
+        Check whether records at `level` are written, before building an expensive message.
+        """
+        return self.logger.isEnabledFor(LEVELS.get(level, logging.DEBUG))
+
+    def log(self, message, level='info', *args, **fields):
+        levelno = LEVELS.get(level, logging.DEBUG)
+        if not self.logger.isEnabledFor(levelno):
+            return
+        extra = {'fields': fields} if fields else None
+        if self._rate_limiter is not None and levelno <= self._rate_limiter.max_level:
+            caller = sys._getframe(1)
+            suppressed = self._rate_limiter.acquire((caller.f_code, caller.f_lineno))
+            if suppressed is None:
+                return
+            if suppressed:
+                extra = {'fields': fields, 'suppressed': suppressed}
+        # stacklevel points the record at the caller rather than this method
+        self.logger.log(levelno, message, *args, extra=extra, stacklevel=2)
 
     def enable_console_log(self):
         """Enable console logging."""
-        if not any(isinstance(h, logging.StreamHandler) for h in self.logger.handlers):
-            self.logger.addHandler(self.console_handler)
+        self.console_handler.setLevel(logging.NOTSET)
 
     def disable_console_log(self):
         """Disable console logging."""
-        if self.console_handler in self.logger.handlers:
-            self.logger.removeHandler(self.console_handler)
+        self.console_handler.setLevel(logging.CRITICAL + 1)
 
     def close(self):
+        """
+        Write out queued records and release the log file. Safe to call more than once.
+        """
+        if self._listener is None:
+            return
         self.disable_console_log()
+        self.logger.removeHandler(self.queue_handler)
+        self._listener.stop()
+        self._listener = None
         if self.file_handler:
-            self.logger.removeHandler(self.file_handler)
             self.file_handler.close()
 
 logger = Logger(logger_config['log_dir'], logger_config['log_level'])
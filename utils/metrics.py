@@ -0,0 +1,267 @@
+import json
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from configs.config import metrics_config
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric(ABC):
+    """
+    A named metric with optional labels. Each combination of label values is
+    its own series, created on first use and kept in a dict keyed by the values.
+    """
+    kind = 'untyped'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if len(labels) != len(self.labels):
+            raise ValueError(f"Metric '{self.name}' expects labels {self.labels}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        """
+        Yield (name suffix, formatted labels, value) for every series.
+        """
+        pass
+
+    @abstractmethod
+    def to_dict(self) -> dict:
+        """
+        Get the metric and its series as a JSON-compatible dictionary.
+        """
+        pass
+
+
+class Counter(Metric):
+    """
+    A value that only goes up, such as a number of records or failures.
+    """
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._series.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            series = list(self._series.items())
+        for key, value in series:
+            yield '_total', _format_labels(self.labels, key), value
+
+    def to_dict(self):
+        with self._lock:
+            return [{'labels': dict(zip(self.labels, key)), 'value': value} for key, value in self._series.items()]
+
+
+class Gauge(Metric):
+    """
+    A value that goes up and down, such as a database size. A gauge can also read
+    its value from a function when metrics are collected, which costs nothing in between.
+    """
+    kind = 'gauge'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set_function(self, function: Callable[[], float], **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = function
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        function = self._functions.get(key)
+        return function() if function is not None else self._series.get(key, 0)
+
+    def _collect(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            series = dict(self._series)
+            functions = dict(self._functions)
+        for key, function in functions.items():
+            try:
+                series[key] = function()
+            except Exception:
+                # A failing reader should not break the export of every other metric
+                continue
+        return list(series.items())
+
+    def samples(self):
+        for key, value in self._collect():
+            yield '', _format_labels(self.labels, key), value
+
+    def to_dict(self):
+        return [{'labels': dict(zip(self.labels, key)), 'value': value} for key, value in self._collect()]
+
+
+class Histogram(Metric):
+    """
+    Counts observations, such as latencies, into cumulative buckets and tracks their sum.
+    """
+    kind = 'histogram'
+
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (),
+                 buckets: Optional[Sequence[float]] = None):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets or metrics_config['buckets']))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts plus one for values above the last bucket, then count and sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0, 0.0]
+            series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Observe the duration of a block in seconds, including blocks that raise.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _collect(self):
+        with self._lock:
+            return [(key, list(series[0]), series[1], series[2]) for key, series in self._series.items()]
+
+    def samples(self):
+        for key, counts, count, total in self._collect():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield '_bucket', _format_labels(self.labels, key, f'le="{_format_value(bound)}"'), cumulative
+            yield '_count', _format_labels(self.labels, key), count
+            yield '_sum', _format_labels(self.labels, key), total
+
+    def to_dict(self):
+        result = []
+        for key, counts, count, total in self._collect():
+            cumulative, buckets = 0, {}
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                buckets[_format_value(bound)] = cumulative
+            result.append({'labels': dict(zip(self.labels, key)), 'count': count, 'sum': total, 'buckets': buckets})
+        return result
+
+
+class MetricsRegistry:
+    """
+    Holds the process's metrics by name. Asking for a metric that exists returns
+    it, so modules can declare the metrics they record at import time.
+    """
+
+    def __init__(self, prefix: str = ''):
+        self._prefix = prefix
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get_or_create(self, cls, name: str, description: str, labels: Sequence[str], **kwargs) -> Metric:
+        name = self._prefix + name
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description, labels, **kwargs)
+            elif not isinstance(metric, cls) or metric.labels != tuple(labels):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind} "
+                                 f"with labels {metric.labels}")
+            return metric
+
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, description, labels)
+
+    def gauge(self, name: str, description: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, description, labels)
+
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        return self._get_or_create(Histogram, name, description, labels, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(self._prefix + name)
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            name = metric.name + '_total' if metric.kind == 'counter' else metric.name
+            lines.append(f'# HELP {name} {metric.description}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for suffix, labels, value in metric.samples():
+                lines.append(f'{metric.name}{suffix}{labels} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        return {
+            metric.name: {'type': metric.kind, 'description': metric.description, 'series': metric.to_dict()}
+            for metric in metrics
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), default=str)
+
+    def dump(self, path: str) -> None:
+        """
+        Write every metric to a file, as JSON if the path ends in '.json' and as Prometheus text otherwise.
+        """
+        with open(path, 'w') as f:
+            f.write(self.to_json() if path.endswith('.json') else self.to_prometheus())
+
+
+metrics = MetricsRegistry(metrics_config['prefix'])
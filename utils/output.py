@@ -18,3 +18,34 @@ def pretty_hotels_output(data):
         return result
     except Exception as e:
         raise Exception(f'Error when converting hotels to json: {e}')
+
+
+INDENT = b"    "
+
+
+def prettify_fragment(fragment: bytes) -> bytes:
+    """
+    Re-encode a compact fragment with indentation, for debugging output only.
+    """
+    return json.dumps(json.loads(fragment), indent = 4).encode()
+
+
+def nest_fragment(fragment: bytes, level: int) -> bytes:
+    """
+    Indent a serialized fragment so it can be embedded `level` levels deep.
+    JSON strings never contain raw newlines, so this is a plain byte replace.
+    """
+    if level == 0:
+        return fragment
+    return fragment.replace(b"\n", b"\n" + INDENT * level)
+
+
+def join_fragments(fragments: list, level: int = 0) -> bytes:
+    """
+    Concatenate serialized fragments into a JSON array, matching json.dumps(..., indent=4).
+    """
+    if not fragments:
+        return b"[]"
+    inner = INDENT * (level + 1)
+    items = (b",\n" + inner).join(nest_fragment(fragment, level + 1) for fragment in fragments)
+    return b"[\n" + inner + items + b"\n" + INDENT * level + b"]"
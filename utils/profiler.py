@@ -0,0 +1,318 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter as Tally
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from configs.config import profile_config
+from utils.exceptions import ProfilerException
+from utils.logger import logger
+
+# cProfile, pstats and tracemalloc are imported when profiling starts, so instrumented modules do not load them
+
+STAGES = ('fetch', 'normalize', 'merge', 'store', 'query')
+
+# Returned by `stage` while profiling is off, so instrumented code pays for one global lookup and an empty `with`
+_DISABLED = nullcontext()
+
+
+def parse_stages(value: str) -> List[str]:
+    """
+    Parse a comma-separated list of stage names, or 'all' for every stage.
+    Raises ValueError for unknown names, so it can be used as an argparse type.
+    """
+    stages = [stage.strip() for stage in value.split(',') if stage.strip()]
+    if stages == ['all']:
+        return list(STAGES)
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown or not stages:
+        raise ValueError(f"Unknown profile stages {unknown or value!r}, expected 'all' or some of {STAGES}")
+    return stages
+
+
+def _frame_label(code, root: str) -> str:
+    filename = code.co_filename
+    if filename.startswith(root):
+        filename = os.path.relpath(filename, root)
+    # Semicolons separate frames in the collapsed format
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(';', ':')
+
+
+class StageProfiler:
+    """
+    Profiles the selected stages of refreshes and queries. Every run of a stage
+    is profiled with cProfile on the thread that runs it and the results are
+    added up per stage. A sampling thread records the stacks of threads inside
+    a stage for flame graphs. With memory profiling, the traced memory each run
+    adds is summed per stage, and tracemalloc snapshots taken around the first
+    run of each stage show where it allocated memory.
+
+    A stage entered while another profiled stage is running on the same thread
+    is counted as part of the outer one. From Python 3.12 only one cProfile
+    profiler can be active in the process, so runs that start while another is
+    active are timed and sampled but left out of the cProfile statistics.
+    Allocations are process-wide, so in a pipelined refresh they include those
+    of stages running on other threads.
+    """
+
+    def __init__(self,
+                 stages: Iterable[str],
+                 output_dir: str,
+                 interval: float = 0.001,
+                 memory: bool = False,
+                 memory_frames: int = 1,
+                 top: int = 30):
+        self.stages = frozenset(stages)
+        self.output_dir = output_dir
+        self._interval = interval
+        self._memory = memory
+        self._memory_frames = memory_frames
+        self._top = top
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats: Dict[str, 'pstats.Stats'] = {}
+        self._runs: Tally = Tally()
+        self._seconds: Tally = Tally()
+        # Runs left out of the cProfile statistics because another profiler was active
+        self._unprofiled: Tally = Tally()
+        # Stage -> collapsed stack -> samples
+        self._samples: Dict[str, Tally] = {stage: Tally() for stage in self.stages}
+        # Stage -> net traced bytes added over all its runs
+        self._memory_net: Tally = Tally()
+        # Stage -> (snapshot before, snapshot after) its first run, compared when the results are written
+        self._snapshots: Dict[str, Optional[tuple]] = {}
+        # Thread ID -> stage it is running
+        self._active: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._started_tracemalloc = False
+
+    def start(self) -> None:
+        import tracemalloc
+
+        if self._memory and not tracemalloc.is_tracing():
+            tracemalloc.start(self._memory_frames)
+            self._started_tracemalloc = True
+        self._sampler = threading.Thread(target=self._sample, name='profile-sampler', daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> None:
+        import tracemalloc
+
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Profile one run of a stage on the current thread.
+        """
+        import cProfile
+        import tracemalloc
+
+        if getattr(self._local, 'stage', None) is not None:
+            yield
+            return
+
+        thread_id = threading.get_ident()
+        profile = cProfile.Profile()
+        tracing = self._memory and tracemalloc.is_tracing()
+        snapshot = None
+        traced = 0
+        start = time.perf_counter()
+        try:
+            self._local.stage = name
+            with self._lock:
+                self._active[thread_id] = name
+                # Only the first run of a stage is snapshotted; the others are measured by traced memory
+                first = tracing and name not in self._snapshots
+                if first:
+                    self._snapshots[name] = None
+            if first:
+                snapshot = tracemalloc.take_snapshot()
+            traced = tracemalloc.get_traced_memory()[0] if tracing else 0
+            start = time.perf_counter()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is active in the process (Python 3.12+)
+                profile = None
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            elapsed = time.perf_counter() - start
+            added = 0
+            if tracing and tracemalloc.is_tracing():
+                added = tracemalloc.get_traced_memory()[0] - traced
+                if snapshot is not None:
+                    self._snapshots[name] = (snapshot, tracemalloc.take_snapshot())
+            with self._lock:
+                self._memory_net[name] += added
+                self._active.pop(thread_id, None)
+            self._local.stage = None
+            self._record(name, profile, elapsed)
+
+    def _record(self, name, profile, elapsed) -> None:
+        import pstats
+
+        with self._lock:
+            self._runs[name] += 1
+            self._seconds[name] += elapsed
+            if profile is None:
+                self._unprofiled[name] += 1
+            elif name in self._stats:
+                self._stats[name].add(profile)
+            else:
+                self._stats[name] = pstats.Stats(profile)
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        root = os.getcwd()
+        labels = {}
+        while not self._stop.wait(self._interval):
+            with self._lock:
+                active = dict(self._active)
+            if not active:
+                continue
+            frames = sys._current_frames()
+            for thread_id, stage in active.items():
+                frame = frames.get(thread_id)
+                if frame is None or thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    label = labels.get(frame.f_code)
+                    if label is None:
+                        label = labels[frame.f_code] = _frame_label(frame.f_code, root)
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.reverse()
+                with self._lock:
+                    self._samples[stage][';'.join(stack)] += 1
+
+    def write(self) -> List[str]:
+        """
+        Write the profiles collected so far and return the paths written.
+        For each stage that ran: `<stage>.prof` for pstats or snakeviz, `<stage>.txt` with the
+        functions taking the most cumulative time, and `<stage>.collapsed` for flamegraph.pl or
+        speedscope. With memory profiling, `memory.txt` lists each stage's net traced memory and
+        the allocation sites of its first run by source line.
+        """
+        import io
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = []
+        with self._lock:
+            stats = dict(self._stats)
+            samples = {stage: dict(tally) for stage, tally in self._samples.items()}
+            snapshots = dict(self._snapshots)
+            runs, seconds = dict(self._runs), dict(self._seconds)
+            unprofiled, memory_net = dict(self._unprofiled), dict(self._memory_net)
+
+        for stage in runs:
+            text = io.StringIO()
+            text.write(f"{stage}: {runs[stage]} runs, {seconds[stage]:.3f}s\n")
+            if unprofiled.get(stage):
+                text.write(f"{unprofiled[stage]} runs left out while another profiler was active\n")
+            stage_stats = stats.get(stage)
+            if stage_stats is not None:
+                prof_path = os.path.join(self.output_dir, f'{stage}.prof')
+                stage_stats.dump_stats(prof_path)
+                paths.append(prof_path)
+                stage_stats.stream = text
+                stage_stats.sort_stats('cumulative').print_stats(self._top)
+            text_path = os.path.join(self.output_dir, f'{stage}.txt')
+            with open(text_path, 'w') as f:
+                f.write(text.getvalue())
+            paths.append(text_path)
+
+            collapsed_path = os.path.join(self.output_dir, f'{stage}.collapsed')
+            with open(collapsed_path, 'w') as f:
+                for stack, count in sorted(samples[stage].items()):
+                    f.write(f'{stack} {count}\n')
+            paths.append(collapsed_path)
+
+        if self._memory and runs:
+            memory_path = os.path.join(self.output_dir, 'memory.txt')
+            with open(memory_path, 'w') as f:
+                for stage in runs:
+                    f.write(f"{stage}: {memory_net.get(stage, 0) / 1024:.1f} KiB net over {runs[stage]} runs\n")
+                    if snapshots.get(stage):
+                        f.write("  Allocation sites of its first run:\n")
+                        for difference in self._compare(*snapshots[stage]):
+                            f.write(f"  {difference.size_diff / 1024:>10.1f} KiB {difference.count_diff:>8} blocks"
+                                    f"  {difference.traceback[0]}\n")
+                    f.write('\n')
+            paths.append(memory_path)
+        return paths
+
+    def _compare(self, before, after) -> list:
+        """
+        Get the largest net allocations between two snapshots by source line.
+        """
+        import cProfile
+        import pstats
+        import tracemalloc
+
+        # Leave out what profiling itself allocates
+        filters = [tracemalloc.Filter(False, path)
+                   for path in (__file__, tracemalloc.__file__, pstats.__file__, cProfile.__file__)]
+        differences = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        differences = [difference for difference in differences if difference.size_diff or difference.count_diff]
+        return sorted(differences, key=lambda difference: abs(difference.size_diff), reverse=True)[:self._top]
+
+
+_profiler: Optional[StageProfiler] = None
+
+
+def stage(name: str):
+    """
+    Context manager around one run of a stage. Does nothing unless profiling is enabled for that stage.
+    """
+    profiler = _profiler
+    if profiler is None or name not in profiler.stages:
+        return _DISABLED
+    return profiler.stage(name)
+
+
+def enable(stages: Iterable[str], output_dir: Optional[str] = None, memory: Optional[bool] = None) -> StageProfiler:
+    """
+    Start profiling the given stages, writing into a new timestamped directory under `profile_config['output_dir']`.
+    Allocations are traced if `memory` is set, or by default if `profile_config['memory']` is.
+    """
+    global _profiler
+    if _profiler is not None:
+        raise ProfilerException("Profiling is already enabled")
+    if output_dir is None:
+        output_dir = os.path.join(profile_config['output_dir'], datetime.now().strftime('%Y-%m-%d_%H-%M-%S'))
+    profiler = StageProfiler(stages, output_dir,
+                             interval=profile_config['interval'],
+                             memory=profile_config['memory'] if memory is None else memory,
+                             memory_frames=profile_config['memory_frames'],
+                             top=profile_config['top'])
+    profiler.start()
+    _profiler = profiler
+    return profiler
+
+
+def disable() -> List[str]:
+    """
+    Stop profiling and write the results. Returns the paths written.
+    """
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return []
+    profiler.stop()
+    paths = profiler.write()
+    logger.log("Wrote %s profile files to %s.", "info", len(paths), profiler.output_dir)
+    return paths
@@ -0,0 +1,45 @@
+import re
+from functools import lru_cache
+
+from pydantic import HttpUrl, TypeAdapter, ValidationError
+
+from configs.config import url_config
+
+_HTTP_URL = TypeAdapter(HttpUrl)
+_PERCENT_ESCAPE = re.compile(r'%[0-9a-fA-F]{2}')
+
+
+def _canonicalize(url) -> str:
+    """
+    Spell a parsed URL one way. The parser already lowercases the scheme and host, drops
+    default ports and resolves dot segments; on top of that the fragment, which never
+    reaches the server, and an empty query are dropped and percent-escapes are uppercased.
+    """
+    text = str(url).split('#', 1)[0]
+    if text.endswith('?'):
+        text = text[:-1]
+    return _PERCENT_ESCAPE.sub(lambda match: match.group().upper(), text)
+
+
+def _validate(value) -> str:
+    try:
+        return _canonicalize(_HTTP_URL.validate_python(value))
+    except ValidationError as e:
+        # Validators report failures as ValueError, so the enclosing model reports the field
+        raise ValueError(e.errors()[0]['msg']) from None
+
+
+@lru_cache(maxsize=url_config['cache_size'])
+def _canonical_str(value: str) -> str:
+    return _validate(value)
+
+
+def canonical_url(value) -> str:
+    """
+    Validate an HTTP(S) URL and return its canonical spelling. Results are cached by
+    the raw string, so a URL seen before costs a dict lookup instead of a parse.
+    Raises ValueError for values that are not valid URLs.
+    """
+    if isinstance(value, str):
+        return _canonical_str(value)
+    return _validate(value)
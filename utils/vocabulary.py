@@ -0,0 +1,52 @@
+import threading
+from typing import Dict
+
+from utils.metrics import metrics
+
+
+class Vocabulary:
+    """
+    An interning table for the values hotels repeat across records, such as
+    amenities, booking conditions and image captions. Each distinct value is
+    kept once, so records share one string object per value. Equal interned
+    values are the same object, so comparing them, as the mergers do when
+    deduplicating, stops at an identity check.
+
+    Terms are kept until the table is cleared, which full refreshes do before
+    they normalize, so it grows with the distinct values seen since the last
+    full refresh rather than with the number of hotels. Lookups take no lock;
+    adding a term or clearing the table does.
+    """
+
+    def __init__(self):
+        # Each term by itself, swapped for an empty table when cleared
+        self._terms: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def intern(self, value: str) -> str:
+        """
+        Get the shared object equal to a value, adding the value if it is new.
+        """
+        term = self._terms.get(value)
+        if term is None:
+            with self._lock:
+                term = self._terms.setdefault(value, value)
+        return term
+
+    def clear(self) -> None:
+        """
+        Drop every term. Values interned before stay usable but are no longer shared with new ones.
+        """
+        with self._lock:
+            self._terms = {}
+
+    def __contains__(self, value: str) -> bool:
+        return value in self._terms
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+
+vocabulary = Vocabulary()
+
+metrics.gauge('vocabulary_terms', 'Distinct values in the shared vocabulary.').set_function(vocabulary.__len__)